@@ -0,0 +1,96 @@
+"""Compares the page load time and memory usage of headless Firefox with the full and the lean profile.
+
+Usage: python -m benchmarks.browser [--url URL] [--loads N]
+
+Every profile starts a new headless Firefox which loads the given page (the public ilias login
+page by default) several times. The load time is read from the Navigation Timing API of the page,
+the memory usage is the resident set size of all Firefox processes after the last load (Linux only).
+"""
+
+import os
+import statistics
+import tempfile
+import time
+
+import click
+
+from kit_dl import cli
+from kit_dl.core import BaseScraper
+
+
+def process_tree_rss(pid):
+    """Returns the summed up resident set size in bytes of the given process and its descendants,
+    or None if it cannot be determined on this platform.
+    """
+    if not os.path.isdir("/proc"):
+        return None
+    children = {}
+    rss = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open("/proc/{}/status".format(entry)) as file:
+                status = dict(line.split(":", 1) for line in file if ":" in line)
+        except OSError:
+            continue
+        children.setdefault(int(status["PPid"]), []).append(int(entry))
+        rss[int(entry)] = int(status.get("VmRSS", "0 kB").split()[0]) * 1024
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        total += rss.get(current, 0)
+        pending.extend(children.get(current, []))
+    return total
+
+
+def measure(url, lean, loads):
+    """Starts Firefox with the full or lean profile and returns the page load times and its memory usage."""
+    from selenium import webdriver
+
+    with tempfile.TemporaryDirectory() as download_dir:
+        start = time.perf_counter()
+        driver = webdriver.Firefox(
+            firefox_profile=cli.create_profile(download_dir, lean),
+            executable_path=cli.gecko_path,
+            options=cli.get_options(),
+        )
+        startup = time.perf_counter() - start
+        try:
+            times = []
+            for _ in range(loads):
+                driver.get(url)
+                times.append(
+                    driver.execute_script(
+                        "var t = performance.timing; return (t.loadEventEnd - t.navigationStart) / 1000;"
+                    )
+                )
+            return startup, times, process_tree_rss(driver.service.process.pid)
+        finally:
+            driver.quit()
+
+
+@click.command()
+@click.option("--url", default=BaseScraper.main_page, help="The page to load (default: ilias login page).")
+@click.option("--loads", "-n", type=click.IntRange(min=1), default=5, help="Number of page loads per profile.")
+def main(url, loads):
+    """Loads the given page with the full and the lean profile and prints the results."""
+    header = "{:<8} {:>9} {:>11} {:>11} {:>9}".format("profile", "startup", "load (med)", "load (max)", "RSS")
+    click.echo(header)
+    click.echo("-" * len(header))
+    for name, lean in [("full", False), ("lean", True)]:
+        startup, times, rss = measure(url, lean, loads)
+        click.echo(
+            "{:<8} {:>8.3f}s {:>10.3f}s {:>10.3f}s {:>9}".format(
+                name,
+                startup,
+                statistics.median(times),
+                max(times),
+                "n/a" if rss is None else "{} MiB".format(rss // (1024 * 1024)),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
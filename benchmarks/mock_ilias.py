@@ -0,0 +1,227 @@
+import email.utils
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+import uuid
+
+USER_NAME = "benchmark"
+PASSWORD = "benchmark"
+SESSION_COOKIE = "PHPSESSID"
+
+
+class MockIlias:
+    """A local stand-in for ilias serving generated courses, assignment folders and PDFs.
+
+    The pages only contain what kit-dl relies on: the login button (id f807), the login form
+    (name and password inputs) followed by a SAML form, the dashboard with a link to each course
+    and the container links (il_ContainerItemTitle) of the course pages and assignment folders.
+    Every request is delayed by the given latency, PDFs additionally by file_latency.
+
+        with MockIlias(courses=50, sheets=30) as server:
+            scraper.main_page = server.main_page
+
+    :param courses: The number of courses, named "Kurs 01", "Kurs 02" and so on.
+    :param sheets: The number of assignments in the "Übungen" folder of each course.
+    :param pdf_size: The size of each PDF in bytes.
+    """
+
+    def __init__(self, courses=3, sheets=10, pdf_size=64 * 1024, latency=0.0, file_latency=0.0):
+        self.courses = courses
+        self.sheets = sheets
+        self.pdf_size = pdf_size
+        self.latency = latency
+        self.file_latency = file_latency
+        self.sessions = set()
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.server = None
+        self.thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.stop()
+
+    def start(self):
+        handler = type("Handler", (MockIliasHandler,), {"ilias": self})
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:{}".format(self.server.server_address[1])
+
+    @property
+    def main_page(self):
+        return self.url + "/login.php"
+
+    def course_name(self, course_num):
+        return "Kurs {:02d}".format(course_num)
+
+    def course_config(self):
+        """Returns the config.yml entries of all courses, keyed by their short name."""
+        return {
+            "k{:02d}".format(num): {
+                "name": self.course_name(num),
+                "path": "k{:02d}".format(num),
+                "assignment": {"link_format": "Blatt$$", "link_name": "Übungen"},
+            }
+            for num in range(1, self.courses + 1)
+        }
+
+    def pdf(self, course_num, sheet_num):
+        header = "%PDF-1.4 Kurs {} Blatt {}\n".format(course_num, sheet_num).encode("ascii")
+        return header + b"0" * max(0, self.pdf_size - len(header))
+
+
+class MockIliasHandler(BaseHTTPRequestHandler):
+    """Handles the requests of a MockIlias instance. Course pages have the ref_id
+    1000 * course, their assignment folders 1000 * course + 1.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Otherwise every response would be delayed by delayed ACKs of the client.
+    disable_nagle_algorithm = True
+    ilias = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.handle_request()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.handle_request(parse_qs(self.rfile.read(length).decode("utf-8")))
+
+    def handle_request(self, data=None):
+        with self.ilias.lock:
+            self.ilias.requests += 1
+        if self.ilias.latency:
+            time.sleep(self.ilias.latency)
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path == "/login.php":
+            self.send_html('<a id="f807" href="/shib_login.php">KIT-Account</a>')
+        elif url.path == "/shib_login.php":
+            self.send_login_form()
+        elif url.path == "/idp" and data is not None:
+            self.login(data)
+        elif url.path == "/saml" and data is not None:
+            self.finish_login()
+        elif not self.logged_in():
+            self.redirect("/login.php")
+        elif url.path == "/ilias.php" and "ref_id" in query:
+            self.send_container(int(query["ref_id"][0]))
+        elif url.path == "/ilias.php":
+            self.send_dashboard()
+        elif url.path == "/goto.php" and "target" in query:
+            self.send_pdf(query["target"][0])
+        else:
+            self.send_error(404)
+
+    def send_login_form(self, failed=False):
+        self.send_html(
+            '{}<form method="post" action="/idp"><input id="name" name="j_username">'
+            '<input id="password" name="j_password" type="password">'
+            '<button id="sbmt" name="_eventId_proceed">Login</button></form>'.format(
+                "Login fehlgeschlagen" if failed else ""
+            )
+        )
+
+    def login(self, data):
+        if data.get("j_username") != [USER_NAME] or data.get("j_password") != [PASSWORD]:
+            self.send_login_form(failed=True)
+            return
+        self.send_html(
+            '<form method="post" action="/saml"><input type="hidden" name="SAMLResponse" value="{}">'
+            '<button type="submit">Continue</button></form>'
+            # Submitted automatically by browsers, the same as on the real login page.
+            "<script>document.forms[0].submit()</script>".format(uuid.uuid4().hex)
+        )
+
+    def finish_login(self):
+        session = uuid.uuid4().hex
+        with self.ilias.lock:
+            self.ilias.sessions.add(session)
+        self.redirect(
+            "/ilias.php?baseClass=ilDashboardGUI",
+            {"Set-Cookie": "{}={}; Path=/".format(SESSION_COOKIE, session)},
+        )
+
+    def logged_in(self):
+        cookies = self.headers.get("Cookie", "")
+        for cookie in cookies.split(";"):
+            name, _, value = cookie.strip().partition("=")
+            if name == SESSION_COOKIE and value in self.ilias.sessions:
+                return True
+        return False
+
+    def send_dashboard(self):
+        self.send_links({self.ilias.course_name(num): num * 1000 for num in range(1, self.ilias.courses + 1)})
+
+    def send_container(self, ref_id):
+        course_num, folder = divmod(ref_id, 1000)
+        if not 1 <= course_num <= self.ilias.courses or folder > 1:
+            self.send_error(404)
+        elif folder == 0:
+            self.send_links({"Skript": ref_id + 2, "Übungen": ref_id + 1})
+        else:
+            links = {"Blatt{:02d}".format(num): num for num in range(1, self.ilias.sheets + 1)}
+            self.send_links(links, lambda num: "/goto.php?target=file_{}_{}_download".format(course_num, num))
+
+    def send_links(self, links, href=lambda ref_id: "/ilias.php?ref_id={}".format(ref_id)):
+        self.send_html(
+            "".join(
+                '<div class="il_ContainerListItem"><a class="il_ContainerItemTitle" href="{}">{}</a></div>'.format(
+                    href(ref_id), name
+                )
+                for name, ref_id in links.items()
+            )
+        )
+
+    def send_pdf(self, target):
+        parts = target.split("_")
+        if len(parts) != 4 or not (parts[1].isdigit() and parts[2].isdigit()):
+            self.send_error(404)
+            return
+        course_num, sheet_num = int(parts[1]), int(parts[2])
+        if not 1 <= course_num <= self.ilias.courses or not 1 <= sheet_num <= self.ilias.sheets:
+            self.send_error(404)
+            return
+        if self.ilias.file_latency:
+            time.sleep(self.ilias.file_latency)
+        self.send_body(
+            self.ilias.pdf(course_num, sheet_num),
+            "application/pdf",
+            {
+                "Content-Disposition": 'attachment; filename="Blatt{:02d}.pdf"'.format(sheet_num),
+                "ETag": '"{}-{}"'.format(course_num, sheet_num),
+                "Last-Modified": email.utils.formatdate(0, usegmt=True),
+            },
+        )
+
+    def send_html(self, body):
+        self.send_body("<html><body>{}</body></html>".format(body).encode("utf-8"), "text/html; charset=utf-8")
+
+    def redirect(self, location, headers=None):
+        self.send_body(b"", "text/html", dict(headers or {}, Location=location), status=302)
+
+    def send_body(self, body, content_type, headers=None, status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
@@ -0,0 +1,260 @@
+"""Measures the performance of kit-dl against a local MockIlias server.
+
+Usage: python -m benchmarks.run [--scenario small|scale] [--engine http|selenium] [--latency SECONDS]
+
+Every benchmark starts a fresh server and an empty root_path and reports its wall time together
+with the time spent in the phases login, navigation, download, move and scan. If multiple courses
+are updated at the same time, the phase times are summed up over all threads.
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+
+import click
+from click.testing import CliRunner
+from ruamel.yaml import YAML
+
+from benchmarks.mock_ilias import MockIlias, PASSWORD, USER_NAME
+from kit_dl import cli
+from kit_dl.cache import UrlCache
+from kit_dl.client import HttpScraper
+from kit_dl.core import BaseScraper, Scraper
+from kit_dl.dao import Dao
+from kit_dl.manifest import Manifest
+
+# The scraper methods measured for each phase, none of them calls another one.
+PHASES = {
+    "login": ["login"],
+    "navigation": ["open_folder", "list_external_links"],
+    "download": ["save", "perform_download_on_site"],
+    "move": ["move_and_rename"],
+    "scan": ["get_local_assignments"],
+}
+SCENARIOS = {"small": {"courses": 3, "sheets": 10}, "scale": {"courses": 50, "sheets": 30}}
+
+
+class PhaseTimer:
+    """Measures the time spent in the methods of each phase by temporarily replacing
+    them on the scraper classes, which also covers the scrapers created by the cli.
+    """
+
+    classes = [BaseScraper, HttpScraper, Scraper]
+
+    def __init__(self):
+        self.totals = {phase: 0.0 for phase in PHASES}
+        self.calls = {phase: 0 for phase in PHASES}
+        self.lock = threading.Lock()
+        self.patched = []
+
+    def __enter__(self):
+        for phase, methods in PHASES.items():
+            for cls in self.classes:
+                for name in methods:
+                    if name in cls.__dict__:
+                        self.patched.append((cls, name, cls.__dict__[name]))
+                        setattr(cls, name, self.timed(phase, cls.__dict__[name]))
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        for cls, name, method in self.patched:
+            setattr(cls, name, method)
+        self.patched = []
+
+    def timed(self, phase, method):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                with self.lock:
+                    self.totals[phase] += time.perf_counter() - start
+                    self.calls[phase] += 1
+
+        return wrapper
+
+
+class Benchmark:
+    """Sets up the user.yml and config.yml files, caches and root_path used by kit-dl
+    for the courses of the given server in a temporary directory.
+    """
+
+    def __init__(self, server, engine):
+        self.server = server
+        self.engine = engine
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root_path = os.path.join(self.temp_dir.name, "root")
+        self.app_dir = os.path.join(self.temp_dir.name, "app")
+        self.courses = server.course_config()
+        for course in self.courses.values():
+            os.makedirs(os.path.join(self.root_path, course["path"]))
+        yaml = YAML(typ="rt")
+        self.dao = Dao(
+            cli.gecko_path,
+            os.path.join(self.app_dir, "user.yml"),
+            os.path.join(self.app_dir, "config.yml"),
+            yaml,
+        )
+        self.dao.create_user(
+            {
+                "user_name": USER_NAME,
+                "password": PASSWORD,
+                "destination": {"root_path": self.root_path, "rename_format": "Blatt$$"},
+            }
+        )
+        with open(self.dao.config_yml_path, "w", encoding="utf-8") as file:
+            yaml.dump(self.courses, file)
+        self.dao.load_data()
+
+    def __enter__(self):
+        """Points the cli to the temporary files and the scrapers to the server."""
+        self.saved = {
+            name: getattr(cli, name)
+            for name in [
+                "dao",
+                "user_yml_path",
+                "config_yml_path",
+                "session_path",
+                "url_cache",
+                "manifest",
+                "cache_dir",
+                "profiles_dir",
+                "daemon_socket_path",
+            ]
+        }
+        cli.dao = self.dao
+        cli.user_yml_path = self.dao.user_yml_path
+        cli.config_yml_path = self.dao.config_yml_path
+        cli.session_path = os.path.join(self.app_dir, "session.json")
+        # Never use the caches or the running daemon of the user.
+        cli.cache_dir = os.path.join(self.app_dir, "cache")
+        cli.profiles_dir = os.path.join(cli.cache_dir, "firefox")
+        cli.daemon_socket_path = os.path.join(self.app_dir, "daemon.sock")
+        cli.url_cache = UrlCache(os.path.join(self.app_dir, "urls.json"))
+        cli.manifest = Manifest(os.path.join(self.app_dir, "manifest.sqlite"))
+        self.main_page = BaseScraper.main_page
+        BaseScraper.main_page = self.server.main_page
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        cli.manifest.close()
+        for name, value in self.saved.items():
+            setattr(cli, name, value)
+        BaseScraper.main_page = self.main_page
+        self.temp_dir.cleanup()
+
+    def create_scraper(self):
+        return cli.create_scraper(self.engine, True, False)
+
+    def download_default(self):
+        """Downloads every assignment of the first course one after another."""
+        course = self.courses["k01"]
+        scraper = self.create_scraper()
+        try:
+            for num in range(1, self.server.sheets + 1):
+                scraper.download_default(course, num, True, None)
+        finally:
+            scraper.close()
+
+    def update_directory(self):
+        """Updates all courses one after another using a single scraper."""
+        scraper = self.create_scraper()
+        try:
+            for name, course in self.courses.items():
+                scraper.update_directory(course, name)
+        finally:
+            scraper.close()
+
+    def cli_update(self, *args):
+        """Runs 'kit-dl update' with the given arguments."""
+        result = CliRunner().invoke(cli.cli, ["update", "--engine", self.engine] + list(args))
+        if result.exception is not None:
+            raise result.exception
+
+    def downloaded_files(self):
+        return sum(
+            len(os.listdir(os.path.join(self.root_path, course["path"]))) for course in self.courses.values()
+        )
+
+
+def run_benchmark(name, server_args, engine, action, args=(), repeat=False):
+    """Runs the given Benchmark method against a new server and returns a dict of the measured times.
+
+    :param repeat: Whether to run the method once before measuring, e.g. to measure an update
+            which does not find any new assignments.
+    """
+    with MockIlias(**server_args) as server, Benchmark(server, engine) as benchmark:
+        run = getattr(benchmark, action)
+        with contextlib.redirect_stdout(io.StringIO()):
+            if repeat:
+                run(*args)
+                server.requests = 0
+            with PhaseTimer() as timer:
+                start = time.perf_counter()
+                run(*args)
+                total = time.perf_counter() - start
+        return {
+            "name": name,
+            "total": total,
+            "phases": timer.totals,
+            "calls": timer.calls,
+            "requests": server.requests,
+            "files": benchmark.downloaded_files(),
+        }
+
+
+def print_results(results):
+    header = "{:<28} {:>9} {:>9} {:>6}".format("benchmark", "total", "requests", "files") + "".join(
+        " {:>11}".format(phase) for phase in PHASES
+    )
+    click.echo(header)
+    click.echo("-" * len(header))
+    for result in results:
+        click.echo(
+            "{:<28} {:>8.3f}s {:>9} {:>6}".format(
+                result["name"], result["total"], result["requests"], result["files"]
+            )
+            + "".join(" {:>10.3f}s".format(result["phases"][phase]) for phase in PHASES)
+        )
+
+
+@click.command()
+@click.option(
+    "--scenario",
+    "-s",
+    type=click.Choice(sorted(SCENARIOS)),
+    default="small",
+    help="Number of courses and sheets.",
+)
+@click.option("--engine", "-e", type=click.Choice(["http", "selenium"]), default="http")
+@click.option("--latency", "-l", type=float, default=0.0, help="Delay of every request in seconds.")
+@click.option("--file-latency", type=float, default=0.0, help="Additional delay of every PDF in seconds.")
+@click.option("--pdf-size", type=int, default=64 * 1024, help="Size of every PDF in bytes.")
+@click.option(
+    "--jobs", "-j", type=int, default=4, help="Number of jobs used by the 'update --jobs' benchmark."
+)
+def main(scenario, engine, latency, file_latency, pdf_size, jobs):
+    """Runs all benchmarks of the given scenario and prints the results."""
+    server_args = dict(SCENARIOS[scenario], latency=latency, file_latency=file_latency, pdf_size=pdf_size)
+    results = [
+        run_benchmark("download_default", server_args, engine, "download_default"),
+        run_benchmark("update_directory", server_args, engine, "update_directory"),
+        run_benchmark("cli update", server_args, engine, "cli_update"),
+        run_benchmark("cli update (up to date)", server_args, engine, "cli_update", repeat=True),
+    ]
+    if engine == "http":
+        name = "cli update --jobs {}".format(jobs)
+        results.append(run_benchmark(name, server_args, engine, "cli_update", ["--jobs", str(jobs)]))
+    click.echo(
+        "Scenario {}: {courses} courses x {sheets} sheets, {} engine\n".format(
+            scenario, engine, **SCENARIOS[scenario]
+        )
+    )
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
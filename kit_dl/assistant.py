@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 import getpass
 import os
 
@@ -5,8 +6,12 @@ from colorama import Fore, Style
 from colorama import init
 import click
 
+from kit_dl.misc.catalog import CourseIndex
 import kit_dl.misc.utils as utils
 
+# Number of directories scanned at the same time during the auto-detection of course folders.
+SCAN_WORKERS = 8
+
 
 class Assistant:
     def __init__(self, yaml, dao):
@@ -14,6 +19,7 @@ class Assistant:
         init()
         self.yaml = yaml
         self.dao = dao
+        self.index = None
 
     def echo(self, text, is_prompt=False):
         """Forwards the given text to click.echo() and optionally applies a different style to the text."""
@@ -172,29 +178,91 @@ class Assistant:
                 self.dao.dump_config()
         return download_dir
 
-    def detected_assignment_folders(self, root_path):
-        course_folders = next(os.walk(root_path))[1]
-        assignment_folders = []
-        for folder_name in course_folders:
-            sub_folders = next(os.walk(os.path.join(root_path, folder_name)))[1]
+    def course_index(self):
+        """Returns the index of all courses in the config.yml file, which is built once."""
+        if self.index is None:
+            self.index = CourseIndex(self.dao.config_data)
+        return self.index
+
+    def detected_assignment_folders(self, root_path, depth=None):
+        """Searches the directories below the root path for folders of the courses in the config.yml file.
+
+        The directories of each level are scanned at the same time. Folders matching a course
+        (see search_for_assignments_folder) are not searched any further. Folders matching several
+        courses and courses matching several folders (e.g. in different semester folders) are reported
+        and left out, so that the user chooses their folders manually.
+
+        :param depth: The number of levels below the root path which may contain course folders
+                (e.g. 2 for semester folders containing the course folders), the detection_depth
+                attribute in the user.yml file or 2 by default.
+        """
+        if depth is None:
+            depth = self.dao.user_data.get("detection_depth", 2) if self.dao.user_data else 2
+        index = self.course_index()
+        course_folders = []
+        level = [""]
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+            for _ in range(depth):
+                next_level = []
+                paths = [os.path.join(root_path, folder) for folder in level]
+                for folder, sub_folders in zip(level, executor.map(self.list_directories, paths)):
+                    for sub_folder in sub_folders:
+                        folder_name = os.path.join(folder, sub_folder)
+                        if index.matches(sub_folder):
+                            course_folders.append(folder_name)
+                        else:
+                            next_level.append(folder_name)
+                level = next_level
+            paths = [os.path.join(root_path, folder) for folder in course_folders]
+            listings = list(executor.map(self.list_directories, paths))
+        folders_by_course = {}
+        for folder_name, sub_folders in zip(course_folders, listings):
+            course_keys = index.matches(os.path.basename(folder_name))
+            if len(course_keys) > 1:
+                self.echo(
+                    "'{}' matches several courses ({}), choose its course manually.".format(
+                        utils.reformat(folder_name), ", ".join(key.upper() for key in course_keys)
+                    )
+                )
+                continue
             result = self.search_for_assignments_folder(folder_name, sub_folders)
-            if result:
-                assignment_folders.append(result)
+            folders_by_course.setdefault(result["course_key"], []).append(result)
+        assignment_folders = []
+        for course_key, results in folders_by_course.items():
+            if len(results) > 1:
+                self.echo(
+                    "Several folders match {} ({}), choose one manually.".format(
+                        course_key.upper(),
+                        ", ".join(utils.reformat(result["folder_name"]) for result in results),
+                    )
+                )
+            else:
+                assignment_folders.append(results[0])
         return assignment_folders
 
-    def search_for_assignments_folder(self, folder_name, sub_folders):
-        """Searches for a possible folder containing the assignments based on the folder name."""
-        for course_key in self.dao.config_data:
-            # Folder has been found.
-            if course_key == folder_name.lower() or self.are_similar(
-                folder_name, course_key, self.dao.config_data[course_key]["name"]
-            ):
-                sub_folder_name = self.found_assignments_sub_folder(folder_name, sub_folders)
-                return (
-                    {"course_key": course_key, "folder_name": sub_folder_name}
-                    if sub_folder_name
-                    else {"course_key": course_key, "folder_name": folder_name}
+    def list_directories(self, path):
+        """Returns the sorted names of all (not hidden) directories in the given directory."""
+        try:
+            with os.scandir(path) as entries:
+                return sorted(
+                    entry.name for entry in entries if entry.is_dir() and not entry.name.startswith(".")
                 )
+        except OSError:
+            return []
+
+    def search_for_assignments_folder(self, folder_name, sub_folders):
+        """Searches for a possible folder containing the assignments based on the folder name
+        (the last part of it if it is a path relative to the root path).
+        """
+        course_key = self.course_index().match(os.path.basename(folder_name))
+        # Folder has been found.
+        if course_key is not None:
+            sub_folder_name = self.found_assignments_sub_folder(folder_name, sub_folders)
+            return (
+                {"course_key": course_key, "folder_name": sub_folder_name}
+                if sub_folder_name
+                else {"course_key": course_key, "folder_name": folder_name}
+            )
 
     def found_assignments_sub_folder(self, course_folder_name, sub_folders):
         for sub_folder in sub_folders:
@@ -202,20 +270,3 @@ class Assistant:
             # Check whether the name of the sub-folder is either one of the above names.
             if any(x in sub_folder.lower() for x in name_list):
                 return os.path.join(course_folder_name, sub_folder)
-
-    def are_similar(self, folder_name, course_key, course_name):
-        """Checks whether a given folder name is similar to the full name of a config.yml course
-                or is equal to the course key (e.g. la)."""
-        if (
-            folder_name.lower() == course_key
-            or folder_name.startswith(course_name)
-            or course_name.startswith(folder_name)
-        ):
-            return True
-        course_suffixes = {"I": 1, "II": 2, "III": 3}
-        for suffix in course_suffixes:
-            if folder_name.endswith(suffix) or course_name.endswith(suffix):
-                return (
-                    folder_name.replace(suffix, str(course_suffixes[suffix])) == course_name
-                    or course_name.replace(suffix, str(course_suffixes[suffix])) == folder_name
-                )
@@ -0,0 +1,104 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+class JsonCache:
+    """Stores a single json document in the app directory of kit-dl.
+
+    The file is only readable and writable by the current user since cached data
+    may contain session cookies.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def read(self):
+        """Returns the cached document or None if the file does not exist or is invalid."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def write(self, data):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # The temporary file is only accessible by the current user and unique for each writer.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+        with open(fd, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class SessionCache(JsonCache):
+    """Persists the cookies of an authenticated ilias session between runs.
+
+    Cookies are stored as a list of dicts with the keys name, value, domain, path and secure
+    which can be used by both the selenium and the HTTP engine. A stored session
+    expires after max_age seconds or if it belongs to a different user.
+    """
+
+    def __init__(self, path, max_age=4 * 60 * 60):
+        super().__init__(path)
+        self.max_age = max_age
+
+    def load(self, user_name):
+        """Returns the stored session as a dict with the keys home and cookies
+        or None if no valid session has been stored for the given user.
+        """
+        data = self.read()
+        if not data or data.get("user_name") != user_name or data.get("expires", 0) < time.time():
+            return None
+        return data
+
+    def save(self, user_name, home, cookies):
+        """Stores the cookies and the url of the home page reached after logging in."""
+        self.write(
+            {"user_name": user_name, "expires": time.time() + self.max_age, "home": home, "cookies": cookies}
+        )
+
+
+class UrlCache(JsonCache):
+    """Remembers the urls of the assignment folders on ilias, so that later runs can open them
+    directly instead of navigating from the home page through the course page.
+
+    The urls are stored for each course using its name, link_name and optional path from the
+    config.yml file as the key, which means that changing the config entry invalidates them as well.
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.urls = None
+        self.lock = threading.Lock()
+
+    def key(self, course, optional_path=None):
+        names = [course["name"], course["assignment"]["link_name"], optional_path]
+        return "/".join(name for name in names if name)
+
+    def load(self):
+        if self.urls is None:
+            self.urls = self.read() or {}
+        return self.urls
+
+    def get(self, course, optional_path=None):
+        with self.lock:
+            return self.load().get(self.key(course, optional_path))
+
+    def put(self, course, optional_path, url):
+        with self.lock:
+            if self.load().get(self.key(course, optional_path)) != url:
+                self.urls[self.key(course, optional_path)] = url
+                self.write(self.urls)
+
+    def remove(self, course, optional_path=None):
+        with self.lock:
+            if self.load().pop(self.key(course, optional_path), None) is not None:
+                self.write(self.urls)
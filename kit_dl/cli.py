@@ -1,29 +1,74 @@
+import contextlib
 import os
-from pathlib import Path
 import re
 import sys
+import time
 
 import click
-from ruamel.yaml import YAML
-from selenium import webdriver
-from selenium.webdriver.firefox.options import Options
-import tkinter as tk
 
-from kit_dl import core
-from kit_dl.assistant import Assistant
 from kit_dl.dao import Dao
+from kit_dl.misc import profiling
 import kit_dl.misc.utils as utils
 
+# Selenium, requests, tkinter and ruamel.yaml are only imported by the commands using them,
+# which keeps 'kit-dl --help' and shell completion fast.
+
 gecko_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), "geckodriver.exe")
 user_yml_path = os.path.join(click.get_app_dir("kit_dl"), "user.yml")
-config_yml_path = os.path.join(Path(__file__).parents[0], "config.yml")
-
-yaml = YAML(typ="rt")
-yaml.indent(mapping=2, sequence=4, offset=2)
-yaml.compact(seq_seq=False, seq_map=False)
+session_path = os.path.join(click.get_app_dir("kit_dl"), "session.json")
+urls_path = os.path.join(click.get_app_dir("kit_dl"), "urls.json")
+manifest_path = os.path.join(click.get_app_dir("kit_dl"), "manifest.sqlite")
+config_yml_path = os.path.join(os.path.dirname(__file__), "config.yml")
+cache_dir = os.path.join(click.get_app_dir("kit_dl"), "cache")
+profiles_dir = os.path.join(cache_dir, "firefox")
+daemon_socket_path = os.path.join(click.get_app_dir("kit_dl"), "daemon.sock")
 
 # Create data access object and load data on startup.
-dao = Dao(gecko_path, user_yml_path, config_yml_path, yaml)
+dao = Dao(gecko_path, user_yml_path, config_yml_path, cache_dir=cache_dir)
+# Shared by all scrapers, created by get_url_cache and get_manifest when needed.
+url_cache = None
+manifest = None
+
+
+def get_url_cache():
+    global url_cache
+    if url_cache is None:
+        from kit_dl.cache import UrlCache
+
+        url_cache = UrlCache(urls_path)
+    return url_cache
+
+
+def get_manifest():
+    global manifest
+    if manifest is None:
+        from kit_dl.manifest import Manifest
+
+        manifest = Manifest(manifest_path)
+    return manifest
+
+
+class CourseName(click.ParamType):
+    """Accepts the name of a course in the config.yml file.
+
+    Unlike click.Choice, the config.yml file is only loaded once a course name is actually
+    validated or completed instead of whenever kit-dl is started.
+    """
+
+    name = "course"
+
+    def convert(self, value, param, ctx):
+        courses = get_config_data()
+        if value in courses:
+            return value
+        self.fail(
+            "{!r} is not one of {}.".format(value, ", ".join(repr(course) for course in courses)), param, ctx
+        )
+
+    def shell_complete(self, ctx, param, incomplete):
+        from click.shell_completion import CompletionItem
+
+        return [CompletionItem(course) for course in get_config_data() if course.startswith(incomplete)]
 
 
 def print_info(ctx, param, value):
@@ -31,7 +76,7 @@ def print_info(ctx, param, value):
     if not value or ctx.resilient_parsing:
         return
 
-    dao.load_data(suppress_access_errors=True)
+    dao.load_data(suppress_access_errors=True, compiled=True)
     click.echo("Current user: {}".format(dao.user_data["user_name"]))
     click.echo("Root path: {}\n".format(dao.user_data["destination"]["root_path"]))
     added_courses = dao.added_courses()
@@ -72,7 +117,10 @@ def cli(ctx):
         if setup_incorrectly("user.yml", user_yml_path) or setup_incorrectly("config.yml", config_yml_path):
             sys.exit(1)
         else:
-            dao.load_data(suppress_access_errors=True)
+            start = time.perf_counter()
+            dao.load_data(suppress_access_errors=True, compiled=True)
+            # Added to the trace if the subcommand is profiled.
+            ctx.meta["kit_dl.load_data"] = (start, time.perf_counter() - start)
 
 
 def setup_incorrectly(file_name, path):
@@ -90,10 +138,14 @@ def setup_incorrectly(file_name, path):
 def setup(config, user):
     """Start the command line based setup assistant or change previous settings."""
 
+    import tkinter as tk
+
+    from kit_dl.assistant import Assistant
+
     root = tk.Tk()
     root.withdraw()
     root.wm_attributes("-topmost", True)
-    assistant = Assistant(yaml, dao)
+    assistant = Assistant(dao.yaml, dao)
     # Setup user.yml if either the --user option has been provided or no options at all.
     if user or user == config:
         if not assistant.setup_user():
@@ -109,14 +161,14 @@ def setup(config, user):
 
 def get_config_data():
     if dao.config_data is None:
-        if dao.try_load_file(config_yml_path) is None:
+        if not os.path.isfile(config_yml_path):
             return []
-        dao.load_data(suppress_access_errors=True)
+        dao.load_data(suppress_access_errors=True, compiled=True)
     return dao.config_data
 
 
 @cli.command()
-@click.argument("course_names", nargs=-1, required=True, type=click.Choice(get_config_data()))
+@click.argument("course_names", nargs=-1, required=True, type=CourseName())
 @click.argument("assignment_num")
 @click.option(
     "--move/--keep",
@@ -129,23 +181,77 @@ def get_config_data():
 @click.option(
     "--headless/--show", "-hl/-s", default=True, help="Start the browser in headless mode (no visible UI)."
 )
+@click.option(
+    "--engine",
+    "-e",
+    type=click.Choice(["http", "selenium"]),
+    default="http",
+    help="Download using plain HTTP requests (default) or by controlling Firefox with selenium.",
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of Firefox instances downloading at the same time (selenium engine only, default: 1).",
+)
 @click.option(
     "--verbose", "-v", is_flag=True, help="Print additional information during the download process."
 )
-def get(course_names, assignment_num, move, all, headless, verbose):
+@click.option(
+    "--profile",
+    "-p",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write a trace (Chrome trace event format) to the given file and print the time spent in each phase.",
+)
+@click.option(
+    "--force",
+    "-f",
+    is_flag=True,
+    help="Download assignments again which are already in their course directory.",
+)
+@click.option(
+    "--dry-run",
+    "-n",
+    is_flag=True,
+    help="Print which courses would be downloaded from where without accessing the network.",
+)
+def get(course_names, assignment_num, move, all, headless, engine, workers, verbose, profile, force, dry_run):
     """Download one or more assignments from the specified course(s) and move them into the correct folders."""
     assignments = get_assignments(assignment_num)
     if assignments is None:
         print("Assignment number must be an integer or in the correct format!")
         return
 
-    scraper = create_scraper(headless, verbose)
-    try:
-        for name in courses_to_iterate(course_names, all):
-            course = dao.config_data[name]
-            scraper.get(course, name, assignments, move)
-    finally:
-        scraper.driver.quit()
+    courses = [(name, dao.config_data[name]) for name in courses_to_iterate(course_names, all)]
+    plan = create_planner().plan_get(courses, assignments, move, force)
+    if not start_plan(plan, dry_run):
+        return
+    courses, assignments = plan.active(), plan.assignments()
+    if plan.needs_ilias() and workers == 1 and not profile:
+        job = dict(command="get", courses=[name for name, _ in courses], assignments=assignments, move=move)
+        if run_in_daemon(job, engine, headless, verbose):
+            return
+
+    with profiled(profile):
+        if engine == "selenium" and workers > 1 and plan.needs_ilias():
+            create_pool(headless, verbose, workers).get(courses, assignments, move)
+            return
+
+        scraper = create_planned_scraper(plan, engine, headless, verbose)
+        try:
+            get_courses(scraper, courses, assignments, move)
+        finally:
+            scraper.close()
+
+
+def get_courses(scraper, courses, assignments, move):
+    """Downloads the given assignments of each course.
+
+    :param assignments: The assignment numbers to download, or a dict of them by course name.
+    """
+    for name, course in courses:
+        scraper.get(course, name, assignments[name] if isinstance(assignments, dict) else assignments, move)
 
 
 def get_assignments(input):
@@ -163,23 +269,264 @@ def get_assignments(input):
 
 
 @cli.command()
-@click.argument("course_names", nargs=-1, required=False, type=click.Choice(get_config_data()))
+@click.argument("course_names", nargs=-1, required=False, type=CourseName())
 @click.option("--all", "-a", is_flag=True, help="Update assignment directories for all specified courses.")
 @click.option(
     "--headless/--show", "-hl/-s", default=True, help="Start the browser in headless mode (no visible UI)."
 )
+@click.option(
+    "--engine",
+    "-e",
+    type=click.Choice(["http", "selenium"]),
+    default="http",
+    help="Download using plain HTTP requests (default) or by controlling Firefox with selenium.",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Update up to this many courses at the same time (http engine only, default: 1).",
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of Firefox instances downloading at the same time (selenium engine only, default: 1).",
+)
 @click.option(
     "--verbose", "-v", is_flag=True, help="Print additional information during the download process."
 )
-def update(course_names, all, headless, verbose):
+@click.option(
+    "--profile",
+    "-p",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write a trace (Chrome trace event format) to the given file and print the time spent in each phase.",
+)
+@click.option(
+    "--dry-run",
+    "-n",
+    is_flag=True,
+    help="Print which courses would be downloaded from where without accessing the network.",
+)
+def update(course_names, all, headless, engine, jobs, workers, verbose, profile, dry_run):
     """Update one or more courses by downloading the latest assignments."""
-    scraper = create_scraper(headless, verbose)
-    try:
-        for name in courses_to_iterate(course_names, all):
-            course = dao.config_data[name]
+    courses = [(name, dao.config_data[name]) for name in courses_to_iterate(course_names, all)]
+    plan = create_planner().plan_update(courses)
+    if not start_plan(plan, dry_run):
+        return
+    courses = plan.active()
+    if plan.needs_ilias() and workers == 1 and not profile:
+        job = dict(command="update", courses=[name for name, _ in courses], jobs=jobs)
+        if run_in_daemon(job, engine, headless, verbose):
+            return
+
+    with profiled(profile):
+        if engine == "selenium" and workers > 1 and plan.needs_ilias():
+            create_pool(headless, verbose, workers).update(courses)
+            return
+
+        scraper = create_planned_scraper(plan, engine, headless, verbose, pool_size=jobs)
+        try:
+            update_courses(scraper, courses, engine, jobs)
+        finally:
+            scraper.close()
+
+
+def update_courses(scraper, courses, engine, jobs):
+    if jobs > 1 and engine == "http":
+        from kit_dl.parallel import ConcurrentUpdater
+
+        ConcurrentUpdater(scraper, jobs).update(courses)
+    else:
+        for name, course in courses:
             scraper.update_directory(course, name)
+
+
+@cli.command(name="refresh")
+@click.argument("course_names", nargs=-1, required=False, type=CourseName())
+@click.option("--all", "-a", is_flag=True, help="Refresh the assignments of all specified courses.")
+@click.option(
+    "--verbose", "-v", is_flag=True, help="Print additional information during the download process."
+)
+def refresh_command(course_names, all, verbose):
+    """Download assignments again which have been changed online since they have been downloaded."""
+    courses = [(name, dao.config_data[name]) for name in courses_to_iterate(course_names, all)]
+    from kit_dl.refresh import Refresher
+
+    scraper = create_http_scraper(verbose)
+    try:
+        Refresher(scraper, get_manifest()).refresh(courses)
     finally:
-        scraper.driver.quit()
+        scraper.close()
+
+
+@cli.command()
+@click.argument("course_names", nargs=-1, required=False, type=CourseName())
+@click.option("--all", "-a", is_flag=True, help="Watch all specified courses.")
+@click.option(
+    "--interval",
+    type=click.IntRange(min=1),
+    default=5,
+    help="Minutes between two checks of a course which has just changed (default: 5).",
+)
+@click.option(
+    "--max-interval",
+    type=click.IntRange(min=1),
+    default=360,
+    help="Maximum minutes between two checks of a course which has not changed for a while (default: 360).",
+)
+@click.option(
+    "--headless/--show", "-hl/-s", default=True, help="Start the browser in headless mode (no visible UI)."
+)
+@click.option(
+    "--engine",
+    "-e",
+    type=click.Choice(["http", "selenium"]),
+    default="http",
+    help="Download using plain HTTP requests (default) or by controlling Firefox with selenium.",
+)
+@click.option(
+    "--verbose", "-v", is_flag=True, help="Print additional information during the download process."
+)
+def watch(course_names, all, interval, max_interval, headless, engine, verbose):
+    """Keep checking one or more courses for new assignments and download them when they are available."""
+    from kit_dl.watch import Watcher
+
+    courses = [(name, dao.config_data[name]) for name in courses_to_iterate(course_names, all)]
+    watcher = Watcher(
+        lambda: create_scraper(engine, headless, verbose), courses, interval * 60, max_interval * 60, verbose
+    )
+    click.echo("Watching {}, stop with Ctrl+C.".format(", ".join(name.upper() for name, _ in courses)))
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+
+
+@cli.command(name="daemon")
+@click.option("--stop", is_flag=True, help="Stop the running daemon.")
+@click.option(
+    "--engine",
+    "-e",
+    type=click.Choice(["http", "selenium"]),
+    default="http",
+    help="Log in using this engine on startup, the other one is started by the first command using it.",
+)
+@click.option(
+    "--headless/--show", "-hl/-s", default=True, help="Start the browser in headless mode (no visible UI)."
+)
+@click.option(
+    "--idle-timeout",
+    type=click.IntRange(min=1),
+    default=60,
+    help="Stop after this many minutes without any command (default: 60).",
+)
+def daemon_command(stop, engine, headless, idle_timeout):
+    """Stay logged in and run the get and update commands in the background, which makes them start faster."""
+    from kit_dl.daemon import Daemon, DaemonClient, is_supported
+
+    if stop:
+        if DaemonClient(daemon_socket_path).submit({"command": "stop"}) is None:
+            click.echo("The kit-dl daemon is not running.")
+        return
+    if not is_supported():
+        click.echo("The kit-dl daemon is not supported on this platform.")
+        sys.exit(1)
+
+    daemon = Daemon(daemon_socket_path, create_scraper, execute_job, idle_timeout=idle_timeout * 60)
+    click.echo("Logging in...")
+    if not daemon.warm_up(engine, headless):
+        click.echo("Login failed, retrying with the first command.")
+    click.echo("The kit-dl daemon is running, stop it with 'kit-dl daemon --stop' or Ctrl+C.")
+    try:
+        daemon.serve()
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        click.echo(str(e))
+        sys.exit(1)
+
+
+def run_in_daemon(job, engine, headless, verbose):
+    """Sends the given get or update job to the daemon if it is running and prints its output.
+
+    :returns: False if the daemon is not running and the job has to be executed by this process.
+    """
+    if not os.path.exists(daemon_socket_path):
+        return False
+    from kit_dl.daemon import DaemonClient
+
+    job.update(engine=engine, headless=headless, verbose=verbose)
+    succeeded = DaemonClient(daemon_socket_path).submit(job)
+    if succeeded is None:
+        return False
+    if not succeeded:
+        sys.exit(1)
+    return True
+
+
+def execute_job(job, scraper):
+    """Executes a get or update job sent to the daemon using one of its logged in scrapers."""
+    # The files may have been changed since the last job.
+    dao.load_data(suppress_access_errors=True, compiled=True)
+    courses = [(name, dao.config_data[name]) for name in job["courses"]]
+    if job["command"] == "get":
+        get_courses(scraper, courses, job["assignments"], job["move"])
+    elif job["command"] == "update":
+        update_courses(scraper, courses, job["engine"], job["jobs"])
+    else:
+        raise ValueError("Unknown command {!r}.".format(job["command"]))
+
+
+@contextlib.contextmanager
+def profiled(trace_path):
+    """Profiles the enclosed block if a trace path has been specified, writes the trace
+    and prints a summary of the time spent in each phase afterwards.
+    """
+    if not trace_path:
+        yield
+        return
+    start, duration = click.get_current_context().meta.get("kit_dl.load_data", (time.perf_counter(), 0.0))
+    profiler = profiling.start(origin=start)
+    profiler.add("Dao.load_data", "config", start, duration)
+    try:
+        yield
+    finally:
+        profiling.stop()
+        profiler.write_trace(trace_path)
+        click.echo("\n" + profiler.summary())
+        click.echo("Trace written to {}".format(trace_path))
+
+
+def create_planner():
+    from kit_dl.core import BaseScraper
+    from kit_dl.plan import Planner
+
+    return Planner(BaseScraper(dao, False, manifest=get_manifest()))
+
+
+def start_plan(plan, dry_run):
+    """Prints the whole plan for a dry run, otherwise only the courses without anything to do.
+
+    :returns: Whether anything has to be downloaded, which is never the case for a dry run.
+    """
+    if dry_run:
+        print(plan.describe())
+        return False
+    for course in plan.skipped():
+        print(course.describe())
+    return bool(plan.backends)
+
+
+def create_planned_scraper(plan, engine, headless, verbose, pool_size=1):
+    """Creates the scraper for the given engine if the plan contains ilias courses. Courses on external
+    pages are always downloaded using HTTP requests, so Firefox is not started if there are only those.
+    """
+    if not plan.needs_ilias():
+        engine = "http"
+    return create_scraper(engine, headless, verbose, pool_size)
 
 
 def courses_to_iterate(course_names, all):
@@ -188,19 +535,95 @@ def courses_to_iterate(course_names, all):
     return dao.config_data if all else course_names
 
 
-def create_scraper(headless, verbose):
-    driver = webdriver.Firefox(
-        firefox_profile=create_profile(),
-        executable_path=gecko_path,
-        options=get_options() if headless else None,
+def create_pool(headless, verbose, workers):
+    """Creates a pool of selenium Scrapers, each of them downloading to a separate directory."""
+    from kit_dl.pool import DriverPool
+
+    return DriverPool(
+        dao,
+        verbose,
+        lambda download_dir: create_scraper("selenium", headless, verbose, download_dir=download_dir),
+        workers,
+        get_manifest(),
     )
-    return core.Scraper(driver, dao, verbose)
 
 
-def get_options():
-    """Creates Firefox options for running kit-dl in headless mode."""
+@profiling.timed("startup")
+def create_scraper(engine, headless, verbose, pool_size=1, download_dir=None):
+    """Creates the scraper for the given engine, either a browserless HttpScraper or
+    a selenium Scraper controlling Firefox.
+    """
+    if engine == "http":
+        return create_http_scraper(verbose, pool_size)
+    from selenium import webdriver
+
+    # The lean profile can be disabled in case a page cannot be navigated without the blocked resources.
+    lean = headless and dao.user_data.get("lean_profile", True)
+    if not dao.user_data.get("profile_cache", True):
+        driver = webdriver.Firefox(
+            firefox_profile=create_profile(download_dir, lean),
+            executable_path=gecko_path,
+            options=get_options() if headless else None,
+        )
+        return create_selenium_scraper(driver, verbose)
+
+    from kit_dl.misc.firefox import ProfileCache
+
+    profiles = ProfileCache(profiles_dir, get_preferences(None, lean))
+    profile_dir = profiles.checkout({"browser.download.dir": download_dir} if download_dir else None)
+    options = get_options(headless)
+    options.add_argument("-profile")
+    options.add_argument(profile_dir)
+    try:
+        driver = webdriver.Firefox(executable_path=gecko_path, options=options)
+    except Exception:
+        profiles.checkin(profile_dir, keep=False)
+        raise
+    scraper = create_selenium_scraper(driver, verbose)
+    scraper.on_close = lambda: profiles.checkin(profile_dir)
+    return scraper
+
+
+def create_selenium_scraper(driver, verbose):
+    from kit_dl.cache import SessionCache
+    from kit_dl.core import Scraper
+    from kit_dl.external import ExternalFetcher
+
+    scraper = Scraper(driver, dao, verbose, SessionCache(session_path), get_url_cache(), get_manifest())
+    # Courses on external pages are downloaded without the browser.
+    scraper.external_fetcher = ExternalFetcher(create_session())
+    return scraper
+
+
+def create_http_scraper(verbose, pool_size=1):
+    from kit_dl.cache import SessionCache
+    from kit_dl.client import HttpScraper
+    from kit_dl.external import ExternalFetcher
+
+    session = create_session(pool_size)
+    scraper = HttpScraper(session, dao, verbose, SessionCache(session_path), get_url_cache(), get_manifest())
+    scraper.external_fetcher = ExternalFetcher(session)
+    return scraper
+
+
+def create_session(pool_size=1):
+    import requests
+
+    session = requests.Session()
+    session.headers["User-Agent"] = "kit-dl"
+    # Keep one connection per concurrently updated course (or downloaded assignment) alive.
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(pool_size, 10))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_options(headless=True):
+    """Creates Firefox options for running kit-dl (in headless mode by default)."""
+    from selenium.webdriver.firefox.options import Options
+
     options = Options()
-    options.headless = True
+    options.headless = headless
     return options
 
 
@@ -216,31 +639,54 @@ def is_sequence(value):
     return re.search(r"^\d+(?:,\d+)*$", value)
 
 
-def create_profile():
-    """Create a Firefox profile required for navigating on a webpage.
-
-    Set the preferences allowing PDFs to be downloaded immediately as well as
-    navigating between tabs using keyboard shortcuts.
+def create_profile(download_dir=None, lean=False):
+    """Create a Firefox profile required for navigating on a webpage (see get_preferences).
+    Only used if the profile_cache setting in the user.yml file is disabled, see ProfileCache.
 
     :returns: The Firefox profile.
     """
+    from selenium import webdriver
+
     profile = webdriver.FirefoxProfile()
-    # Set download location
-    profile.set_preference("browser.download.folderList", 2)
-    profile.set_preference("browser.download.dir", dao.user_data["destination"]["root_path"])
-    # Close download window immediately
-    profile.set_preference("browser.download.manager.showWhenStarting", False)
-    profile.set_preference("browser.download.manager.closeWhenDone", True)
-    # Download PDF files without asking the user
-    profile.set_preference("pdfjs.disabled", True)
-    profile.set_preference("plugin.disable_full_page_plugin_for_types", "application/pdf")
-    profile.set_preference("browser.helperApps.neverAsk.saveToDisk", "application/pdf")
-    # Don't switch between recently visited tabs
-    profile.set_preference("browser.ctrlTab.recentlyUsedOrder", False)
-    # Move directly to newly opened tab
-    profile.set_preference("browser.tabs.loadInBackground", False)
+    for name, value in get_preferences(download_dir, lean).items():
+        profile.set_preference(name, value)
     return profile
 
 
+def get_preferences(download_dir=None, lean=False):
+    """Returns the Firefox preferences required for navigating on a webpage.
+
+    Set the preferences allowing PDFs to be downloaded immediately as well as
+    navigating between tabs using keyboard shortcuts.
+
+    :param download_dir: The download location, the root_path in the user.yml file by default.
+    :param lean: Whether to block images, fonts and media and disable the background services
+            of Firefox (see LEAN_PREFERENCES), which makes pages load faster and use less memory.
+
+    :returns: A dict of the names and values of the preferences.
+    """
+    preferences = {
+        # Set download location
+        "browser.download.folderList": 2,
+        "browser.download.dir": download_dir or dao.user_data["destination"]["root_path"],
+        # Close download window immediately
+        "browser.download.manager.showWhenStarting": False,
+        "browser.download.manager.closeWhenDone": True,
+        # Download PDF files without asking the user
+        "pdfjs.disabled": True,
+        "plugin.disable_full_page_plugin_for_types": "application/pdf",
+        "browser.helperApps.neverAsk.saveToDisk": "application/pdf",
+        # Don't switch between recently visited tabs
+        "browser.ctrlTab.recentlyUsedOrder": False,
+        # Move directly to newly opened tab
+        "browser.tabs.loadInBackground": False,
+    }
+    if lean:
+        from kit_dl.misc.firefox import LEAN_PREFERENCES
+
+        preferences.update(LEAN_PREFERENCES)
+    return preferences
+
+
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,218 @@
+import os
+
+from kit_dl.core import BaseScraper, NotFoundException
+from kit_dl.misc import profiling
+from kit_dl.misc.page import Page
+from kit_dl.misc.streaming import ResumableDownload
+
+
+class HttpScraper(BaseScraper):
+    """Implements all webpage related commands using a plain HTTP session instead of a browser.
+
+    Navigates on ilias by parsing the HTML of each page and following the links
+    with the il_ContainerItemTitle class, the same ones the selenium Scraper clicks on.
+    Downloaded PDFs are streamed to the root_path specified in the user.yml file.
+    """
+
+    link_class = "il_ContainerItemTitle"
+
+    def __init__(self, session, dao, verbose, session_cache=None, url_cache=None, manifest=None, timeout=10):
+        super().__init__(dao, verbose, session_cache, url_cache, manifest)
+        self.session = session
+        self.timeout = timeout
+        self.home_page = None
+
+    def close(self):
+        self.session.close()
+
+    def on_ilias_page(self):
+        """Checks whether the user has already been logged in during this session."""
+        return self.home_page is not None
+
+    def fetch(self, url, data=None):
+        """Requests the given url (using POST if data has been specified) and parses the response."""
+        if data is None:
+            response = self.session.get(url, timeout=self.timeout)
+        else:
+            response = self.session.post(url, data=data, timeout=self.timeout)
+        response.raise_for_status()
+        return Page(response.text, response.url)
+
+    def submit(self, page, form, data):
+        if form.method == "post":
+            return self.fetch(page.form_action(form), data)
+        response = self.session.get(page.form_action(form), params=data, timeout=self.timeout)
+        response.raise_for_status()
+        return Page(response.text, response.url)
+
+    def activate(self, page, element_id):
+        """Follows a link or submits the form of a button with the given id, same as clicking on it."""
+        element = page.elements.get(element_id)
+        if element is None:
+            raise NotFoundException("Element with id '{}' not found on {}".format(element_id, page.url))
+        if element["tag"] == "a":
+            return self.fetch(page.resolve(element["href"]))
+        form = element["form"]
+        data = form.values()
+        if "name" in element:
+            data[element["name"]] = element.get("value", "")
+        return self.submit(page, form, data)
+
+    def complete_redirects(self, page):
+        """Submits the forms which are usually sent automatically using JavaScript
+        after logging in via Shibboleth (containing SAMLResponse or RelayState inputs).
+        """
+        for _ in range(5):
+            forms = [
+                form for form in page.forms if form.has_field("SAMLResponse") or form.has_field("RelayState")
+            ]
+            if not forms:
+                break
+            page = self.submit(page, forms[0], forms[0].values())
+        return page
+
+    def to_home(self):
+        """Opens the ilias home page and logs the user in with the login
+        credentials specified in the user.yml file.
+        """
+        page = self.fetch(self.main_page)
+        # Click on login button.
+        page = self.activate(page, "f807")
+        # Fill in login credentials and login.
+        form = page.form_of("password")
+        if form is None:
+            raise NotFoundException("Login form not found on {}".format(page.url))
+        user_field = page.elements.get("name")
+        if user_field is None or user_field["form"] is not form:
+            raise NotFoundException("Login form fields not found on {}".format(page.url))
+        data = form.values()
+        data[user_field.get("name", "name")] = self.dao.user_data["user_name"]
+        data[page.elements["password"].get("name", "password")] = self.dao.user_data["password"]
+        # The identity provider may check which button has been pressed (e.g. _eventId_proceed).
+        button = form.submit_button()
+        if button is not None and "name" in button:
+            data[button["name"]] = button.get("value", "")
+        page = self.complete_redirects(self.submit(page, form, data))
+        if "Login fehlgeschlagen" in page.html or page.form_of("password") is not None:
+            return False
+        self.home_page = page
+        return True
+
+    def restore_session(self, home, cookies):
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie["domain"],
+                path=cookie["path"],
+                secure=cookie["secure"],
+            )
+        page = self.fetch(home)
+        if not self.is_home_page(page.url) or page.form_of("password") is not None:
+            self.session.cookies.clear()
+            return False
+        self.home_page = page
+        return True
+
+    def current_session(self):
+        cookies = [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "secure": cookie.secure,
+            }
+            for cookie in self.session.cookies
+        ]
+        return self.home_page.url, cookies
+
+    def follow(self, page, name):
+        """Follows the ilias link with the given text on the specified page.
+
+        :raises NotFoundException: If the page does not contain a link with the given name.
+        """
+        url = page.link(name, self.link_class)
+        if url is None:
+            raise NotFoundException("Link '{}' not found on {}".format(name, page.url))
+        return self.fetch(url)
+
+    @profiling.timed("download")
+    def save(self, url, file_name):
+        """Streams the file at the given url to the download directory using the given file name
+        (without extension). Interrupted downloads are resumed, see ResumableDownload.
+        """
+        dst = os.path.join(self.get_download_dir(), file_name + ".pdf")
+        download = ResumableDownload(self.session, url, dst, self.timeout)
+        download.run()
+        self.finish_download(download)
+        return dst
+
+    @profiling.timed("navigation")
+    def open_folder(self, course, optional_path):
+        """Returns the assignments folder page of the given course (and the optional path).
+
+        Loads the url of the folder directly if it has been cached during a previous run.
+        Otherwise, or if the cached url redirects to a different page, navigates to the
+        folder starting from the home page (or from the assignments folder for an optional path)
+        and caches its url.
+        """
+        url = self.url_cache.get(course, optional_path) if self.url_cache else None
+        if url:
+            page = self.fetch(url)
+            if page.url == url:
+                return page
+            self.url_cache.remove(course, optional_path)
+        if optional_path:
+            page = self.follow(self.folder_page(course, None), optional_path)
+        else:
+            page = self.follow(self.home_page, course["name"])
+            page = self.follow(page, course["assignment"]["link_name"])
+        if self.url_cache:
+            self.url_cache.put(course, optional_path, page.url)
+        return page
+
+    def list_folder(self, course):
+        """Returns the names of all items in the assignments folder of the given course.
+        The folder is always fetched again and kept for the following download (see folder_page).
+        """
+        page = self.folders[(course["name"], None)] = self.open_folder(course, None)
+        return list(page.links_of_class(self.link_class))
+
+    @profiling.timed("navigation")
+    def list_external_links(self, course):
+        return [text for text, _, _ in self.fetch(course["link"]).links]
+
+    def download(self, course, assignment_num):
+        """Downloads the specified assignment of the given class from ilias.
+
+        Resolves the same links as the selenium Scraper: the course on the home page,
+        the assignments folder, the optional path and finally the assignment itself.
+        """
+        link_format = course["assignment"]["link_format"]
+        assignment = self.get_assignment_to_download(assignment_num, link_format)
+        optional_path = self.get_optional_path(assignment_num, link_format)
+
+        page = self.folder_page(course, optional_path)
+        url = page.link(assignment, self.link_class)
+        if url is None:
+            raise NotFoundException("Assignment '{}' not found on {}".format(assignment, page.url))
+        self.save(url, self.get_file_name(assignment, course, assignment_num))
+        return assignment
+
+    def download_from(self, course, assignment_num):
+        """Provides the ability to download an assignment from a different source than ilias.
+
+        Looks for a link with the formatted assignment:link_format attribute as its text
+        on the page specified as the link attribute of the given course.
+        """
+        with profiling.span("fetch " + course["link"], "navigation"):
+            page = self.fetch(course["link"])
+        format = course["assignment"]["link_format"]
+        assignment = self.format_assignment_name(format, assignment_num)
+
+        url = page.link(assignment)
+        if url is None:
+            raise NotFoundException("Assignment '{}' not found on {}".format(assignment, page.url))
+        self.save(url, self.get_file_name(assignment, course, assignment_num))
+        return assignment
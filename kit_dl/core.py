@@ -1,113 +1,111 @@
+import contextlib
+import copy
 import os
-import re
 import shutil
+import sys
+import threading
 import time
 
 from selenium.common.exceptions import NoSuchElementException
 from selenium.common.exceptions import TimeoutException
-from selenium.webdriver import ActionChains
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 
-from kit_dl.misc import logger
-from kit_dl.misc.logger import ProgressLogger, SilentProgressLogger
+from kit_dl.misc import logger, profiling
+from kit_dl.misc.downloads import DownloadWatcher
+from kit_dl.misc.formats import compile_format, detect_format
+from kit_dl.misc.logger import ConcurrentProgressLogger, ProgressLogger, SilentProgressLogger
+from kit_dl.misc.page import Page
+from kit_dl.misc.utils import NullContext
 
 
-class Scraper:
-    """Implements all webpage related commands such as downloading and moving assignments.
-        Constructs a new Scraper and a WebDriverWait object with a default
-        maximum waiting time of 10 seconds.
+class BaseScraper:
+    """Implements all engine independent commands such as formatting, detecting and moving assignments.
+
+    Subclasses navigate on the actual webpages by implementing on_ilias_page, to_home,
+    download, download_from and close. In order to use a session cache they also need to
+    implement restore_session and current_session.
     """
 
-    def __init__(self, driver, dao, verbose):
-        self.driver = driver
-        self.wait = WebDriverWait(self.driver, 10)
-        self.main_page = "https://ilias.studium.kit.edu/login.php"
+    main_page = "https://ilias.studium.kit.edu/login.php"
+    # Subdirectory of a course directory its assignments are downloaded to before they are renamed,
+    # see staging.
+    staging_name = ".kit-dl-staging"
+    # The staging directories currently used by the scrapers of this process, never swept.
+    active_staging_dirs = set()
+    staging_lock = threading.Lock()
+
+    def __init__(self, dao, verbose, session_cache=None, url_cache=None, manifest=None):
         self.dao = dao
         self.verbose = verbose
-
-    def on_ilias_page(self):
-        """Checks whether the selenium webdriver is currently on any webpage."""
-        try:
-            return self.driver.current_url.startswith("https://ilias.studium.kit.edu")
-        except Exception:
-            return False
-
-    def to_home(self):
-        """Opens the ilias home page and logs the user in with the login
-            credentials specified in the user.yml file.
+        self.session_cache = session_cache
+        self.url_cache = url_cache
+        self.manifest = manifest
+        # The url of the latest download, set by the subclasses if known.
+        self.source_url = None
+        # The HTTP validators (ETag, Last-Modified) of the latest download, set with the source_url if known.
+        self.source_validators = None
+        # Set when updating multiple courses at the same time (see kit_dl.parallel).
+        self.concurrent = False
+        self.download_dir = None
+        # Set while downloading the assignments of a course into its staging directory (see staging),
+        # the staging directory is only created once the first assignment is downloaded.
+        self.staging_course = None
+        self.staging_dir = None
+        # Appended to the staging_name if several scrapers download the same course at the same time.
+        self.staging_suffix = ""
+        # Downloads the assignments of courses on external pages if set, see kit_dl.external.
+        self.external_fetcher = None
+        # The parsed folder pages of the current download by course name and optional path, see folder_page.
+        self.folders = {}
+
+    def clone(self):
+        """Returns a copy of this scraper sharing its session (and browser), but not the state
+        of its current download, so that both can download different courses at the same time.
         """
-        self.driver.get(self.main_page)
-        # Click on login button.
-        self.driver.find_element_by_id("f807").click()
-        # Fill in login credentials and login.
-        self.driver.find_element_by_id("name").send_keys(self.dao.user_data["user_name"])
-        self.driver.find_element_by_id("password").send_keys(self.dao.user_data["password"], Keys.ENTER)
-        time.sleep(1)
-        return "Login fehlgeschlagen" not in self.driver.page_source
-
-    def path_of(self, name):
-        """Retrieves the xpath of the link with the specified name on the current webpage.
-        Assumes that all assignment and folder HTML elements have the same format.
-        """
-        return "//a[text()='{}' and @class='il_ContainerItemTitle']".format(name)
-
-    def click_link(self, name, new_tab=False):
-        """Clicks on the link with the given text on ilias (either in a new tab or the current one).
-
-        :raises TimeoutException: If the link with the given name could not be found
-                after a certain amount of time.
-        """
-
-        link = self.wait.until(EC.element_to_be_clickable((By.XPATH, self.path_of(name))))
-        if new_tab:
-            actions = ActionChains(self.driver)
-            # Presses CTRL + left mouse click to open the link in a new tab.
-            actions.key_down(Keys.CONTROL).click(link).key_up(Keys.CONTROL).perform()
-        else:
-            self.driver.execute_script("arguments[0].click();", link)
-
-    def switch_to_last_tab(self):
-        """Switches to the current last tab in Firefox."""
-        # Wait until the site has loaded.
-        tabs_before = len(self.driver.window_handles)
-        while len(self.driver.window_handles) == tabs_before:
-            time.sleep(0.1)
-        # Switch to the new tab.
-        self.driver.switch_to.window(self.driver.window_handles[-1])
+        scraper = copy.copy(self)
+        scraper.source_url = None
+        scraper.source_validators = None
+        scraper.staging_course = None
+        scraper.staging_dir = None
+        scraper.folders = {}
+        return scraper
+
+    def close(self):
+        """Releases the resources (e.g. the browser) used by this scraper."""
+        pass
+
+    def is_alive(self):
+        """Checks whether this scraper can still be used, e.g. whether its browser is still running."""
+        return True
 
-    def download(self, course, assignment_num):
-        """Downloads the specified assignment of the given class from ilias.
+    def is_home_page(self, url):
+        """Checks whether the given url belongs to ilias and does not redirect to the login page."""
+        return url.startswith(self.main_page.rsplit("/", 1)[0]) and "login.php" not in url
 
-        Retrieves the assignment name by replacing the format attribute of the given course
-        as specified in the config.yml file with the specified assignment number
-        and append leading zeroes if necessary.
-
-        The format attribute may contain an optional previous path name separated by
-        a single '/', which will be moved to before downloading the assignment.
+    @profiling.timed("login")
+    def login(self):
+        """Resumes the session stored in the session cache or logs the user in from scratch
+        if there is no stored session or it has become stale.
         """
-        link_format = course["assignment"]["link_format"]
-        assignment = self.get_assignment_to_download(assignment_num, link_format)
-        optional_path = self.get_optional_path(assignment_num, link_format)
-        self.perform_download_on_site(course, optional_path, assignment)
-        return assignment
+        if self.resume_session():
+            return True
+        if not self.to_home():
+            return False
+        if self.session_cache is not None:
+            home, cookies = self.current_session()
+            self.session_cache.save(self.dao.user_data["user_name"], home, cookies)
+        return True
 
-    def perform_download_on_site(self, course, optional_path, assignment):
-        # Open the course page in a new tab (and switch to it as specified in firefox preferences).
-        self.click_link(course["name"], True)
-        self.switch_to_last_tab()
-        # Click on the assignments folder.
-        self.click_link(course["assignment"]["link_name"])
-        if optional_path:
-            self.click_link(optional_path)
-        # Download the assigment.
-        self.click_link(assignment)
-        time.sleep(1)
-        # Close this tab.
-        self.driver.close()
-        self.driver.switch_to.window(self.driver.window_handles[0])
+    def resume_session(self):
+        """Restores the cookies of a stored session and checks them by opening the stored home page once."""
+        if self.session_cache is None:
+            return False
+        session = self.session_cache.load(self.dao.user_data["user_name"])
+        if session is None:
+            return False
+        if self.restore_session(session["home"], session["cookies"]):
+            return True
+        self.session_cache.clear()
+        return False
 
     def get_assignment_to_download(self, assignment_num, format):
         values = format.split("/")
@@ -125,31 +123,24 @@ class Scraper:
         Appends leading zeroes if the amount of consecutive $-signs is higher than
         the assignment number.
         """
-        num_digits = name.count("$")
-        return name.replace("$" * num_digits, str(assignment_num).zfill(num_digits))
+        return compile_format(name)(assignment_num)
 
-    def download_from(self, course, assignment_num):
-        """Provides the ability to download an assignment from a different source than ilias.
+    def get_file_name(self, assignment, course, assignment_num):
+        """Returns the name of the downloaded assignment PDF without its extension.
 
-        The external link must be specified as the link attribute in the config.yml file of the given course.
-        Uses the assignment:format attribute in the config.yml file to determine the name of the link
-        of the assignment to download.
+        Assumes that the name of the PDF is the same as the link of the assignment. If
+        the file name is different, this must be specified as the file_format attribute of the
+        given course in the config.yml file.
         """
-        self.driver.get(course["link"])
-        format = course["assignment"]["link_format"]
-        assignment = self.format_assignment_name(format, assignment_num)
-
-        self.driver.find_element_by_link_text(assignment).click()
-        time.sleep(1)
+        if "file_format" in course["assignment"]:
+            return self.format_assignment_name(course["assignment"]["file_format"], assignment_num)
         return assignment
 
+    @profiling.timed("move")
     def move_and_rename(self, assignment, course, assignment_num, rename_format):
         """Moves and renames a downloaded assignment PDF to the specified destination folder.
 
-        Assumes that the name of the PDF is the same as the link of the assignment. If
-        the file name is different, this must be specified as the file_format attribute of the
-        given course in the config.yml file. The format_assignment_name method will then be used
-        to retrieve the correct file name.
+        The name of the downloaded PDF is retrieved using the get_file_name method.
 
         The file will be copied to the folder specified by the path attribute of the course
         in the config.yml file relative to the root_path as specified in the user.yml file.
@@ -159,19 +150,121 @@ class Scraper:
         """
         if not rename_format:
             rename_format = self.dao.user_data["destination"]["rename_format"]
-        file_name = assignment
-        if "file_format" in course["assignment"]:
-            file_name = self.format_assignment_name(course["assignment"]["file_format"], assignment_num)
+        file_name = self.get_file_name(assignment, course, assignment_num)
 
-        src = os.path.join(self.dao.user_data["destination"]["root_path"], file_name + ".pdf")
-        dst_folder = os.path.join(self.dao.user_data["destination"]["root_path"], course["path"])
+        src = os.path.join(self.get_download_dir(), file_name + ".pdf")
+        dst_folder = self.get_course_dir(course)
         dst_file = os.path.join(
             dst_folder, self.format_assignment_name(rename_format, assignment_num) + ".pdf"
         )
 
         msg = "\nMoving to {}".format(dst_folder)
         with logger.strict(msg, self.verbose):
-            shutil.move(src, dst_file)
+            if self.staging_dir:
+                # Both are on the same filesystem, the file is never copied.
+                os.replace(src, dst_file)
+            else:
+                shutil.move(src, dst_file)
+        return dst_file
+
+    def get_download_dir(self):
+        """Returns the directory assignments are downloaded to before they are moved, which is
+        the staging directory of the current course if set (see staging), otherwise the
+        download_dir or the root_path specified in the user.yml file.
+        """
+        if self.staging_course is not None and self.staging_dir is None:
+            self.create_staging_dir()
+        if self.staging_dir:
+            return self.staging_dir
+        return self.download_dir if self.download_dir else self.dao.user_data["destination"]["root_path"]
+
+    @contextlib.contextmanager
+    def staging(self, course):
+        """Downloads the assignments of the given course to a staging directory inside
+        its course directory while the block is executed.
+
+        Since the staging directory is on the same filesystem as the course directory, moving a
+        downloaded assignment is an atomic rename instead of a copy. It is only created once an
+        assignment is downloaded and removed afterwards, unless it contains incomplete downloads
+        which the next run resumes (see ResumableDownload). Stale staging directories of previous
+        runs are removed first. Each change refreshes the modification time of the course directory
+        stored in the manifest. Falls back to the default download directory if the engine cannot
+        change its download directory (see use_download_dir).
+        """
+        self.sweep_staging_dirs(course)
+        self.staging_course = course
+        try:
+            yield
+        finally:
+            self.staging_course = None
+            staging_dir, self.staging_dir = self.staging_dir, None
+            if staging_dir:
+                self.use_download_dir(self.get_download_dir())
+                self.release_staging_dir(course, staging_dir)
+
+    def create_staging_dir(self):
+        course = self.staging_course
+        staging_dir = os.path.join(self.get_course_dir(course), self.staging_name + self.staging_suffix)
+        with BaseScraper.staging_lock:
+            BaseScraper.active_staging_dirs.add(staging_dir)
+        os.makedirs(staging_dir, exist_ok=True)
+        if self.use_download_dir(staging_dir):
+            self.staging_dir = staging_dir
+        else:
+            self.release_staging_dir(course, staging_dir)
+            # Do not try again for each assignment.
+            self.staging_course = None
+
+    def release_staging_dir(self, course, staging_dir):
+        with BaseScraper.staging_lock:
+            BaseScraper.active_staging_dirs.discard(staging_dir)
+        self.remove_stale_staging_dir(staging_dir)
+        if self.manifest is not None:
+            self.manifest.touch(course["name"], self.get_course_dir(course))
+
+    def sweep_staging_dirs(self, course):
+        """Removes the staging directories left in the directory of the given course by previous
+        runs (e.g. if kit-dl has been killed) which do not contain resumable downloads.
+        """
+        course_dir = self.get_course_dir(course)
+        try:
+            names = os.listdir(course_dir)
+        except OSError:
+            return
+        removed = False
+        for name in names:
+            path = os.path.join(course_dir, name)
+            if not name.startswith(self.staging_name) or not os.path.isdir(path):
+                continue
+            with BaseScraper.staging_lock:
+                if path in BaseScraper.active_staging_dirs:
+                    continue
+            removed = self.remove_stale_staging_dir(path) or removed
+        if removed and self.manifest is not None:
+            self.manifest.touch(course["name"], course_dir)
+
+    def remove_stale_staging_dir(self, staging_dir):
+        """Removes the given staging directory unless it contains a resumable download, a .part file
+        next to its .part.json file (see ResumableDownload), and returns whether it has been removed.
+        """
+        try:
+            names = set(os.listdir(staging_dir))
+        except OSError:
+            return False
+        if any(name.endswith(".part") and name + ".json" in names for name in names):
+            return False
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        return True
+
+    def use_download_dir(self, directory):
+        """Makes the engine download to the given directory and returns whether it could be changed."""
+        return True
+
+    def get_download_timeout(self):
+        """Returns the maximum number of seconds to wait for a single download to finish
+        which can be changed using the download_timeout attribute in the user.yml file.
+        """
+        return self.dao.user_data.get("download_timeout", 30)
 
     def download_default(self, course, assignment_num, move, rename_format=None):
         assignment = None
@@ -179,42 +272,141 @@ class Scraper:
             assignment = self.download_from(course, assignment_num)
         else:
             if not self.on_ilias_page():
-                if not self.to_home():
+                if not self.login():
                     return False
             assignment = self.download(course, assignment_num)
+        self.store_download(assignment, course, assignment_num, move, rename_format)
+        return True
+
+    def finish_download(self, download):
+        """Keeps the source of a finished ResumableDownload for store_download and prints its size
+        and transfer rate in verbose mode (unless courses are updated at the same time).
+        """
+        self.source_url = download.url
+        self.source_validators = (download.etag, download.last_modified)
+        if self.verbose and not self.concurrent:
+            print(
+                "\nDownloaded {} KiB at {:.1f} KiB/s".format(
+                    download.size // 1024, download.bytes_per_second() / 1024
+                )
+            )
+
+    def store_download(self, assignment, course, assignment_num, move, rename_format=None):
+        """Moves a downloaded assignment to its course directory if requested and records it."""
         if move:
             if not rename_format:
                 rename_format = self.dao.user_data["destination"]["rename_format"]
-            self.move_and_rename(assignment, course, assignment_num, rename_format)
-        return True
+            dst_file = self.move_and_rename(assignment, course, assignment_num, rename_format)
+            if self.manifest is not None:
+                etag, last_modified = self.source_validators or (None, None)
+                self.manifest.record(
+                    course["name"], assignment_num, self.source_url, dst_file, etag, last_modified
+                )
+
+    def download_all(self, course, assignment_nums, move, rename_format, logger):
+        """Downloads the given assignments of a course one after another, or at the same time
+        using the external fetcher if the course is hosted on an external page (see ExternalFetcher).
 
-    def update_directory(self, course, course_name):
-        """Downloads the latest assignments for the given course."""
-        course_dir = os.path.join(self.dao.user_data["destination"]["root_path"], course["path"])
-        assignment_files = next(os.walk(course_dir))[2]
-        rename_format = self.find_rename_format(course)
-        latest_assignment = self.get_latest_assignment(assignment_files, rename_format)
+        :raises LoginException: If the user could not be logged in.
+        """
+        if "link" in course and self.external_fetcher is not None:
+            self.external_fetcher.download(self, course, assignment_nums, move, rename_format, logger)
+            return
+        try:
+            for _, nums in self.group_by_folder(course, assignment_nums):
+                for num in nums:
+                    logger.update(num)
+                    if not self.download_default(course, num, move, rename_format):
+                        raise LoginException(LOGIN_FAILED_MSG)
+        finally:
+            self.folders.clear()
+
+    def group_by_folder(self, course, assignment_nums):
+        """Groups the given assignments by the folder they are downloaded from, which is the optional
+        path of their link_format (or None), keeping the order of the first assignment of each folder.
+        Returns a list of (optional_path, assignment_nums) tuples.
+        """
+        if "link" in course:
+            return [(None, list(assignment_nums))]
+        groups = {}
+        for num in assignment_nums:
+            optional_path = self.get_optional_path(num, course["assignment"]["link_format"])
+            groups.setdefault(optional_path, []).append(num)
+        return list(groups.items())
+
+    def folder_page(self, course, optional_path):
+        """Returns the parsed assignments folder of the given course (or the optional path inside of it).
+
+        Each folder is only opened once (see open_folder) until the current download_all has finished,
+        so all assignments of a folder and all of its optional paths are resolved from the same page.
+        """
+        key = (course["name"], optional_path)
+        if key not in self.folders:
+            self.folders[key] = self.open_folder(course, optional_path)
+        return self.folders[key]
+
+    @profiling.timed_course
+    def update_directory(self, course, course_name, available_assignments=None):
+        """Downloads all assignments of the given course which are available online
+        but missing in its directory.
+
+        :param available_assignments: The numbers of the assignments available online if they
+                are already known (see list_assignments), otherwise they are listed first.
+        """
+        rename_format, present_assignments = self.get_local_assignments(course)
         if self.verbose:
             print(
-                self.get_on_start_update_msg(course_name, latest_assignment, rename_format),
+                self.get_on_start_update_msg(course_name, max(present_assignments, default=0), rename_format),
                 flush=False,
                 end="\n",
             )
-        self.perform_update(course, course_name, latest_assignment, rename_format)
+        self.perform_update(course, course_name, present_assignments, rename_format, available_assignments)
+
+    def list_links(self, course):
+        """Returns the names of all links in the assignments folder of the given course on ilias
+        or on the external page of the course.
+
+        :raises LoginException: If the user could not be logged in.
+        """
+        if "link" in course:
+            if self.external_fetcher is not None:
+                return self.external_fetcher.list_links(self, course)
+            return self.list_external_links(course)
+        if not self.on_ilias_page() and not self.login():
+            raise LoginException(LOGIN_FAILED_MSG)
+        return self.list_folder(course)
+
+    def list_assignments(self, course, names=None):
+        """Returns the numbers of all assignments of the given course which are available online.
+
+        Reads the assignments folder on ilias (or the external page of the course) only once and
+        matches the name of each link against the link_format attribute of the course. If the format
+        contains an optional path, the names of the sub-folders are matched instead.
 
+        :param names: The names of the links in the folder if they have already been listed (see list_links).
+        """
+        if names is None:
+            names = self.list_links(course)
+        format = course["assignment"]["link_format"].split("/")[0]
+        nums = (self.parse_assignment_num(format, name) for name in names)
+        return {num for num in nums if num is not None}
+
+    def parse_assignment_num(self, format, name):
+        """Returns the assignment number of the given name if it matches the format, otherwise None."""
+        return compile_format(format).parse(name)
+
+    @profiling.timed_course
     def get(self, course, course_name, assignment_nums, move):
-        rename_format = self.find_rename_format(course)
+        rename_format, _ = self.get_local_assignments(course)
+        staging = self.staging(course) if move else NullContext()
         try:
-            with self.get_specific_logger(course_name, rename_format) as logger:
-                for num in assignment_nums:
-                    logger.update(num)
-                    if not self.download_default(course, num, move, rename_format):
-                        raise LoginException(
-                            "Login failed! Use 'kit-dl setup --user' and update username and password."
-                        )
-        except (IOError, OSError):
-            print("Invalid destination path for this assignment!")
-        except (TimeoutException, NoSuchElementException, LoginException) as e:
+            with staging, self.get_specific_logger(course_name, rename_format) as logger:
+                self.download_all(course, assignment_nums, move, rename_format, logger)
+        except TimeoutError as e:
+            print("\n{}".format(e))
+        except (IOError, OSError) as e:
+            print(io_error_msg(e))
+        except (TimeoutException, NoSuchElementException, NotFoundException, LoginException) as e:
             if str(e).endswith("Message: "):
                 print(str(e).replace("Message: ", "Error: "))
 
@@ -227,68 +419,333 @@ class Scraper:
             return "No assignments found in {} directory, starting at 1.".format(course_name.upper())
 
     def get_specific_logger(self, course_name, rename_format):
+        if self.concurrent:
+            return ConcurrentProgressLogger(course_name.upper())
         return (
             ProgressLogger(course_name.upper(), rename_format)
             if self.verbose
             else SilentProgressLogger(course_name.upper())
         )
 
-    def perform_update(self, course, course_name, latest_assignment, rename_format):
+    def perform_update(
+        self, course, course_name, present_assignments, rename_format, available_assignments=None
+    ):
         try:
-            with self.get_specific_logger(course_name, rename_format) as logger:
-                while True:
-                    logger.update(latest_assignment + 1)
-                    if not self.download_default(course, latest_assignment + 1, True, rename_format):
-                        raise LoginException(
-                            "Login failed! Use 'kit-dl setup --user' and update username and password."
-                        )
-                    latest_assignment += 1
-        except (IOError, OSError):
-            print("Invalid destination path for this assignment!")
-        except (TimeoutException, NoSuchElementException, LoginException) as e:
+            with self.staging(course), self.get_specific_logger(course_name, rename_format) as logger:
+                if available_assignments is None:
+                    available_assignments = self.list_assignments(course)
+                missing_assignments = sorted(available_assignments - present_assignments)
+                self.download_all(course, missing_assignments, True, rename_format, logger)
+        except TimeoutError as e:
+            print("\n{}".format(e))
+        except (IOError, OSError) as e:
+            print(io_error_msg(e))
+        except (TimeoutException, NoSuchElementException, NotFoundException, LoginException) as e:
             if str(e).endswith("Message: "):
                 print(str(e).replace("Message: ", "Error: "))
 
     def get_latest_assignment(self, assignment_files, rename_format):
         """Finds the latest assignment in a list of assignment PDFs."""
-        current_assignment = 0
+        return max(self.get_present_assignments(assignment_files, rename_format), default=0)
+
+    def get_present_assignments(self, assignment_files, rename_format):
+        """Returns the numbers of all assignments in a list of assignment PDFs matching the rename format."""
+        return compile_format(rename_format).scan(self.remove_extension(name) for name in assignment_files)
+
+    def get_course_dir(self, course):
+        return os.path.join(self.dao.user_data["destination"]["root_path"], course["path"])
+
+    def get_assignment_files(self, course):
+        """Returns the names of all files in the directory of the given course."""
+        return next(os.walk(self.get_course_dir(course)))[2]
+
+    @profiling.timed("scan")
+    def get_local_assignments(self, course):
+        """Returns the rename format and the numbers of all assignments in the directory of the given course.
+
+        Uses the manifest if available, which only scans the directory again if it has been modified.
+        """
+        if self.manifest is None:
+            rename_format, files = self.scan_course_directory(course)
+            return rename_format, set(files)
+        return self.manifest.local_assignments(
+            course["name"], self.get_course_dir(course), lambda: self.scan_course_directory(course)
+        )
+
+    def scan_course_directory(self, course):
+        """Detects the rename format of the given course and returns it together with a dict
+        of all assignment numbers and the names of the corresponding files.
+        """
+        assignment_files = self.get_assignment_files(course)
+        rename_format = (
+            self.detect_format(assignment_files) or self.dao.user_data["destination"]["rename_format"]
+        )
+        format = compile_format(rename_format)
+        files = {}
         for assignment in assignment_files:
-            diff = [
-                asgmt_char
-                for i, (asgmt_char, frmt_char) in enumerate(
-                    zip(self.remove_extension(assignment), rename_format)
-                )
-                if asgmt_char != frmt_char
-            ]
-            num = self.assignment_num_from_diff("".join(diff))
-            if num and num > current_assignment:
-                current_assignment = num
-        return current_assignment
-
-    def assignment_num_from_diff(self, diff):
-        result = diff.replace("-", "").strip()
-        if result.startswith("0"):
-            result = result.replace("0", "")
-        if re.search(r"^\d+$", result):
-            return int(result)
-
-    def find_rename_format(self, course):
-        course_dir = os.path.join(self.dao.user_data["destination"]["root_path"], course["path"])
-        assignment_files = next(os.walk(course_dir))[2]
-        detected_format = self.detect_format(assignment_files)
-        return detected_format if detected_format else self.dao.user_data["destination"]["rename_format"]
+            num = format.parse(self.remove_extension(assignment))
+            if num is not None:
+                files.setdefault(num, assignment)
+        return rename_format, files
 
     def detect_format(self, assignment_files):
-        for assignment in assignment_files:
-            assignment = self.remove_extension(assignment)
-            # If the file name ends with at least one digit replace them with $-signs to get the format.
-            num_digits = sum(char.isdigit() for char in assignment)
-            if num_digits > 0:
-                return re.sub(r"\d+$", "$" * num_digits, assignment)
+        """Returns the format matching most of the given files, see formats.detect_format."""
+        return detect_format([self.remove_extension(assignment) for assignment in assignment_files])
 
     def remove_extension(self, file_name):
         return file_name[:-4]
 
 
+class Scraper(BaseScraper):
+    """Implements all webpage related commands using a selenium webdriver.
+        Constructs a new Scraper and a WebDriverWait object with a default
+        maximum waiting time of 10 seconds.
+
+    Instead of looking up each link with a separate webdriver command, the HTML of a page
+    is fetched once and parsed locally (see kit_dl.misc.page). All links are then resolved
+    from the parsed page and loaded by their url in the same tab.
+    """
+
+    link_class = "il_ContainerItemTitle"
+
+    def __init__(self, driver, dao, verbose, session_cache=None, url_cache=None, manifest=None):
+        super().__init__(dao, verbose, session_cache, url_cache, manifest)
+        # Importing the webdriver takes longer than all other modules, it is only needed by this engine.
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        self.driver = driver
+        self.wait = WebDriverWait(self.driver, 10)
+        # The parsed home page, the browser navigates away from it when opening a folder.
+        self.home_page = None
+        # Called once the browser has quit, e.g. to release its profile (see ProfileCache).
+        self.on_close = None
+
+    def close(self):
+        self.driver.quit()
+        if self.on_close is not None:
+            self.on_close()
+
+    def is_alive(self):
+        """Checks whether Firefox and geckodriver are still responding."""
+        try:
+            self.driver.window_handles
+            return True
+        except Exception:
+            return False
+
+    def use_download_dir(self, directory):
+        """Changes the download directory preference of the running Firefox (see cli.create_profile),
+        which can only be accessed from its chrome context.
+        """
+        try:
+            with self.driver.context(self.driver.CONTEXT_CHROME):
+                self.driver.execute_script(
+                    "Services.prefs.setStringPref('browser.download.dir', arguments[0]);", directory
+                )
+            return True
+        except Exception:
+            return False
+
+    def on_ilias_page(self):
+        """Checks whether the selenium webdriver is currently on any webpage."""
+        try:
+            return self.driver.current_url.startswith(self.main_page.rsplit("/", 1)[0])
+        except Exception:
+            return False
+
+    def page(self):
+        """Parses the HTML of the current page at once."""
+        return Page(self.driver.page_source, self.driver.current_url)
+
+    def load(self, url):
+        """Loads the given url in the current tab and returns the parsed page once it has been loaded."""
+        self.driver.get(url)
+        return self.page()
+
+    @profiling.timed("login")
+    def to_home(self):
+        """Opens the ilias home page and logs the user in with the login
+            credentials specified in the user.yml file.
+        """
+        page = self.load(self.main_page)
+        # Click on login button.
+        button = page.elements.get("f807")
+        if button is not None and button["tag"] == "a" and button.get("href"):
+            self.driver.get(page.resolve(button["href"]))
+        else:
+            self.driver.find_element_by_id("f807").click()
+        # Fill in login credentials and login, using the default button of the form like pressing enter would.
+        self.driver.execute_script(
+            "var name = document.getElementById('name'), password = document.getElementById('password');"
+            "name.value = arguments[0]; password.value = arguments[1];"
+            "var button = password.form.querySelector('button:not([type]), [type=submit], [type=image]');"
+            "if (button) { button.click(); } else { password.form.submit(); }",
+            self.dao.user_data["user_name"],
+            self.dao.user_data["password"],
+        )
+        with profiling.span("sleep", "sleep"):
+            time.sleep(1)
+        page = self.page()
+        if "Login fehlgeschlagen" in page.html:
+            return False
+        self.home_page = page
+        return True
+
+    @profiling.timed("login")
+    def restore_session(self, home, cookies):
+        # Cookies can only be added for the domain of the current page.
+        self.driver.get(self.main_page)
+        for cookie in cookies:
+            if self.main_page.split("/")[2].endswith(cookie["domain"].lstrip(".")):
+                self.driver.add_cookie(
+                    {"name": cookie["name"], "value": cookie["value"], "path": cookie["path"]}
+                )
+        page = self.load(home)
+        if not self.is_home_page(page.url):
+            return False
+        self.home_page = page
+        return True
+
+    def current_session(self):
+        cookies = [
+            {
+                "name": cookie["name"],
+                "value": cookie["value"],
+                "domain": cookie.get("domain", ""),
+                "path": cookie.get("path", "/"),
+                "secure": cookie.get("secure", False),
+            }
+            for cookie in self.driver.get_cookies()
+        ]
+        return self.driver.current_url, cookies
+
+    @profiling.timed("navigation")
+    def find_link(self, page, name):
+        """Returns the url of the ilias link with the given name on the parsed page.
+
+        If the page does not contain the link, e.g. since it had not been loaded completely
+        when it was parsed, it is loaded again and parsed until it contains the link.
+
+        :raises TimeoutException: If the link with the given name could not be found
+                after a certain amount of time.
+        """
+        url = page.link(name, self.link_class)
+        if url is None:
+            self.driver.get(page.url)
+            url = self.wait.until(lambda driver: self.page().link(name, self.link_class))
+        return url
+
+    def download(self, course, assignment_num):
+        """Downloads the specified assignment of the given class from ilias.
+
+        Retrieves the assignment name by replacing the format attribute of the given course
+        as specified in the config.yml file with the specified assignment number
+        and append leading zeroes if necessary.
+
+        The format attribute may contain an optional previous path name separated by
+        a single '/', which will be moved to before downloading the assignment.
+        """
+        link_format = course["assignment"]["link_format"]
+        assignment = self.get_assignment_to_download(assignment_num, link_format)
+        optional_path = self.get_optional_path(assignment_num, link_format)
+        file_name = self.get_file_name(assignment, course, assignment_num)
+        self.perform_download_on_site(course, optional_path, assignment, file_name)
+        return assignment
+
+    def perform_download_on_site(self, course, optional_path, assignment, file_name):
+        page = self.folder_page(course, optional_path)
+        url = self.find_link(page, assignment)
+        self.start_download(url, file_name)
+
+    def start_download(self, url, file_name):
+        """Downloads the file at the given url (without leaving the current page) and waits until
+        it has been saved with the given name (without extension).
+        """
+        with DownloadWatcher(self.get_download_dir(), file_name + ".pdf") as watcher:
+            self.driver.execute_script("window.location.assign(arguments[0]);", url)
+            self.source_url = url
+            self.source_validators = None
+            with profiling.span("wait for download", "download"):
+                watcher.wait(self.get_download_timeout())
+
+    @profiling.timed("navigation")
+    def open_folder(self, course, optional_path):
+        """Opens the assignments folder of the given course (and the optional path) and returns
+        the parsed page.
+
+        Loads the url of the folder directly if it has been cached during a previous run.
+        Otherwise, or if the cached url redirects to a different page, navigates to the
+        folder starting from the home page (or from the parsed assignments folder for an
+        optional path) and caches its url.
+        """
+        url = self.url_cache.get(course, optional_path) if self.url_cache else None
+        if url:
+            page = self.load(url)
+            if page.url == url:
+                return page
+            self.url_cache.remove(course, optional_path)
+        if optional_path:
+            page = self.load(self.find_link(self.folder_page(course, None), optional_path))
+        else:
+            if self.home_page is None:
+                self.home_page = self.page()
+            page = self.load(self.find_link(self.home_page, course["name"]))
+            # Open the assignments folder.
+            page = self.load(self.find_link(page, course["assignment"]["link_name"]))
+        if self.url_cache:
+            self.url_cache.put(course, optional_path, page.url)
+        return page
+
+    def list_folder(self, course):
+        """Returns the names of all items in the assignments folder of the given course.
+        The folder is always opened again and kept for the following download (see folder_page).
+        """
+        page = self.folders[(course["name"], None)] = self.open_folder(course, None)
+        return list(page.links_of_class(self.link_class))
+
+    @profiling.timed("navigation")
+    def list_external_links(self, course):
+        return [text for text, _, _ in self.load(course["link"]).links]
+
+    def download_from(self, course, assignment_num):
+        """Provides the ability to download an assignment from a different source than ilias.
+
+        The external link must be specified as the link attribute in the config.yml file of the given course.
+        Uses the assignment:format attribute in the config.yml file to determine the name of the link
+        of the assignment to download.
+
+        :raises NotFoundException: If the external page does not contain a link with the assignment name.
+        """
+        page = self.load(course["link"])
+        format = course["assignment"]["link_format"]
+        assignment = self.format_assignment_name(format, assignment_num)
+        url = page.link(assignment)
+        if url is None:
+            raise NotFoundException("Assignment '{}' not found on {}".format(assignment, page.url))
+        self.start_download(url, self.get_file_name(assignment, course, assignment_num))
+        return assignment
+
+
+LOGIN_FAILED_MSG = "Login failed! Use 'kit-dl setup --user' and update username and password."
+
+
+def io_error_msg(error):
+    """Returns the message of an IOError raised while downloading, which is either a network error
+    of requests (e.g. a refused connection or an HTTP error status including its url) or caused
+    by the destination path.
+    """
+    # requests is only imported by the http engine, its errors cannot occur otherwise.
+    requests = sys.modules.get("requests")
+    if requests is not None and isinstance(error, requests.RequestException):
+        return "Network error: {}".format(error)
+    return "Invalid destination path for this assignment!"
+
+
 class LoginException(Exception):
     pass
+
+
+class NotFoundException(Exception):
+    """Raised if a link could not be found on a parsed webpage."""
+
+    pass
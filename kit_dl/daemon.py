@@ -0,0 +1,204 @@
+import contextlib
+import io
+import json
+import os
+import socket
+import sys
+import time
+
+
+def is_supported():
+    return hasattr(socket, "AF_UNIX")
+
+
+class SocketWriter:
+    """Sends everything written to it to the client as output messages, used as sys.stdout
+    while a job is running so that the progress of the loggers is shown by the client.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.closed = False
+
+    def write(self, text):
+        if text and not self.closed:
+            self.send({"output": text})
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def send(self, message):
+        try:
+            self.connection.sendall((json.dumps(message) + "\n").encode("utf-8"))
+        except OSError:
+            # The client has gone away (e.g. Ctrl+C), finish the job anyway.
+            self.closed = True
+
+
+class Daemon:
+    """Keeps scrapers logged in between kit-dl commands, which are sent as jobs over a Unix socket.
+
+    Jobs are executed one after another. Each job is a dict containing at least the command,
+    engine, headless and verbose keys, it is passed to execute together with a (warm) scraper
+    for its engine. Scrapers which have not been used for refresh_after seconds are replaced
+    since their session has probably expired. The daemon stops after idle_timeout seconds
+    without any job or when it receives the stop command.
+
+    :param create_scraper: Function creating a scraper for the given engine, headless and verbose arguments.
+    :param execute: Function executing a job using the given scraper.
+    """
+
+    def __init__(self, socket_path, create_scraper, execute, idle_timeout=60 * 60, refresh_after=30 * 60):
+        self.socket_path = socket_path
+        self.create_scraper = create_scraper
+        self.execute = execute
+        self.idle_timeout = idle_timeout
+        self.refresh_after = refresh_after
+        # Scrapers and the time they have been used last, by engine and headless.
+        self.scrapers = {}
+
+    def serve(self):
+        """Accepts jobs until the daemon is stopped or has been idle for too long."""
+        server = self.bind()
+        try:
+            server.settimeout(self.idle_timeout)
+            running = True
+            while running:
+                try:
+                    connection, _ = server.accept()
+                except socket.timeout:
+                    break
+                with connection:
+                    running = self.handle(connection)
+        finally:
+            server.close()
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.socket_path)
+            for scraper, _ in self.scrapers.values():
+                scraper.close()
+
+    def bind(self):
+        """Creates the socket which is only accessible by the current user.
+
+        :raises RuntimeError: If another daemon is already listening on the socket.
+        """
+        if os.path.exists(self.socket_path):
+            if DaemonClient(self.socket_path).is_running():
+                raise RuntimeError("The kit-dl daemon is already running.")
+            os.remove(self.socket_path)
+        os.makedirs(os.path.dirname(self.socket_path), exist_ok=True)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o177)
+        try:
+            server.bind(self.socket_path)
+        finally:
+            os.umask(umask)
+        server.listen()
+        return server
+
+    def warm_up(self, engine, headless):
+        """Starts a scraper for the given engine and logs it in before the first job arrives."""
+        scraper = self.scraper({"engine": engine, "headless": headless, "verbose": False})
+        return scraper.login()
+
+    def handle(self, connection):
+        """Executes the job sent over the given connection and returns whether to keep running."""
+        writer = SocketWriter(connection)
+        with connection.makefile("r", encoding="utf-8") as file:
+            line = file.readline()
+        try:
+            job = json.loads(line)
+        except ValueError:
+            writer.send({"error": "Invalid job."})
+            return True
+        if job.get("command") == "ping":
+            writer.send({"done": True})
+            return True
+        if job.get("command") == "stop":
+            writer.send({"output": "Stopping the kit-dl daemon.\n"})
+            writer.send({"done": True})
+            return False
+        key = (job["engine"], job["headless"])
+        try:
+            scraper = self.scraper(job)
+            with contextlib.redirect_stdout(writer):
+                self.execute(job, scraper)
+            self.scrapers[key] = (scraper, time.monotonic())
+            writer.send({"done": True})
+        except Exception as e:
+            # The scraper may be broken, start a new one for the next job.
+            scraper, _ = self.scrapers.pop(key, (None, None))
+            if scraper is not None:
+                with contextlib.suppress(Exception):
+                    scraper.close()
+            writer.send({"error": "{}: {}".format(type(e).__name__, e)})
+        return True
+
+    def scraper(self, job):
+        """Returns the warm scraper for the engine of the given job or creates a new one."""
+        key = (job["engine"], job["headless"])
+        scraper, last_used = self.scrapers.pop(key, (None, None))
+        if scraper is not None and (
+            time.monotonic() - last_used > self.refresh_after or not scraper.is_alive()
+        ):
+            with contextlib.suppress(Exception):
+                scraper.close()
+            scraper = None
+        if scraper is None:
+            scraper = self.create_scraper(job["engine"], job["headless"], job["verbose"])
+        scraper.verbose = job["verbose"]
+        self.scrapers[key] = (scraper, time.monotonic())
+        return scraper
+
+
+class DaemonClient:
+    """Sends jobs to a running Daemon and prints the output it streams back."""
+
+    def __init__(self, socket_path, timeout=1.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def connect(self):
+        """Returns a connection to the daemon or None if it is not running."""
+        if not is_supported() or not os.path.exists(self.socket_path):
+            return None
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(self.timeout)
+        try:
+            connection.connect(self.socket_path)
+        except OSError:
+            connection.close()
+            return None
+        # Jobs may take a while, only connecting is limited by the timeout.
+        connection.settimeout(None)
+        return connection
+
+    def is_running(self):
+        return self.submit({"command": "ping"}, io.StringIO()) is not None
+
+    def submit(self, job, output=None):
+        """Sends the given job to the daemon and writes its output to the given stream.
+
+        :param output: The stream to write to, sys.stdout by default.
+        :returns: None if the daemon is not running, otherwise whether the job succeeded.
+        """
+        connection = self.connect()
+        if connection is None:
+            return None
+        if output is None:
+            output = sys.stdout
+        with connection:
+            connection.sendall((json.dumps(job) + "\n").encode("utf-8"))
+            with connection.makefile("r", encoding="utf-8") as file:
+                for line in file:
+                    message = json.loads(line)
+                    if "output" in message:
+                        output.write(message["output"])
+                        output.flush()
+                    if "error" in message:
+                        output.write("\nkit-dl daemon: {}\n".format(message["error"]))
+                        return False
+                    if message.get("done"):
+                        return True
+        return False
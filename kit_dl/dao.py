@@ -1,27 +1,82 @@
+import functools
+import marshal
 import os
 
 import click
-from ruamel.yaml.comments import CommentedMap
 
+from kit_dl.misc import profiling
+
+
+def create_yaml():
+    """Creates the round-trip yaml parser used for the user.yml and config.yml files."""
+    # Imported when needed since ruamel.yaml takes a while to load.
+    from ruamel.yaml import YAML
+
+    yaml = YAML(typ="rt")
+    yaml.indent(mapping=2, sequence=4, offset=2)
+    yaml.compact(seq_seq=False, seq_map=False)
+    return yaml
+
+
+@functools.lru_cache(maxsize=None)
+def unsafe_commented_map():
+    """Returns the UnsafeCommentedMap class, which is only defined once ruamel.yaml is needed."""
+    from ruamel.yaml.comments import CommentedMap
+
+    class UnsafeCommentedMap(CommentedMap):
+        def __getitem__(self, key):
+            if key in self:
+                return CommentedMap.__getitem__(self, key)
+            else:
+                click.echo("Key {} not found!".format(key))
+
+    return UnsafeCommentedMap
+
+
+class UnsafeDict(dict):
+    """Same as UnsafeCommentedMap for the plain dicts of compiled snapshots."""
 
-class UnsafeCommentedMap(CommentedMap):
     def __getitem__(self, key):
         if key in self:
-            return CommentedMap.__getitem__(self, key)
+            return dict.__getitem__(self, key)
         else:
             click.echo("Key {} not found!".format(key))
 
 
+def to_plain(value):
+    """Converts the maps, sequences and scalars of the round-trip yaml parser to plain python objects."""
+    if isinstance(value, dict):
+        return {to_plain(key): to_plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_plain(item) for item in value]
+    if value is None or isinstance(value, bool):
+        return value
+    for plain_type in (str, int, float):
+        if isinstance(value, plain_type):
+            return plain_type(value)
+    return value
+
+
 class Dao:
-    def __init__(self, gecko_path, user_yml_path, config_yml_path, yaml):
+    def __init__(self, gecko_path, user_yml_path, config_yml_path, yaml=None, cache_dir=None):
         self.gecko_path = gecko_path
         self.user_yml_path = user_yml_path
         self.config_yml_path = config_yml_path
         self.user_data = None
         self.root_path = None
         self.config_data = None
-        self.yaml = yaml
+        self._yaml = yaml
+        # Directory of the compiled snapshots, see load_compiled.
+        self.cache_dir = cache_dir
+
+    @property
+    def yaml(self):
+        """The yaml parser given to the constructor or the default one created on first use."""
+        if self._yaml is None:
+            self._yaml = create_yaml()
+        return self._yaml
 
+    @profiling.timed("config")
     def try_load_file(self, path, error_msg=None):
         """Tries to load the specified yaml file.
         If the path is incorrect, reraises the exception and prints the specified error messsage.
@@ -39,20 +94,82 @@ class Dao:
             if error_msg:
                 click.echo(error_msg)
 
-    def load_data(self, suppress_access_errors=False):
-        """Loads the user.yml and config.yml files."""
-        self.user_data = self.try_load_file(
+    def load_data(self, suppress_access_errors=False, compiled=False):
+        """Loads the user.yml and config.yml files.
+
+        :param compiled: Whether to load the compiled snapshots of the files (see load_compiled),
+                which is faster but loses comments. Must not be used if the data is dumped again.
+        """
+        load = self.load_compiled if compiled and self.cache_dir else self.try_load_file
+        self.user_data = load(
             self.user_yml_path,
             error_msg="Error, cannot find user.yml. \n" "Use 'kit-dl setup' before downloading assignments.",
         )
-        self.config_data = self.try_load_file(self.config_yml_path, error_msg="Error, cannot find config.yml.")
+        self.config_data = load(self.config_yml_path, error_msg="Error, cannot find config.yml.")
 
         # Caution! Only use when program logic does not depend on possible null state of attributes!
         # (e.g. for logging)
         # May be hard to find sources for unexpected behaviour or can hide bugs!
         if suppress_access_errors:
-            self.user_data = UnsafeCommentedMap(self.user_data) if self.user_data else []
-            self.config_data = UnsafeCommentedMap(self.config_data) if self.config_data else []
+            unsafe_map = UnsafeDict if load == self.load_compiled else unsafe_commented_map()
+            self.user_data = unsafe_map(self.user_data) if self.user_data else []
+            self.config_data = unsafe_map(self.config_data) if self.config_data else []
+
+    @profiling.timed("config")
+    def load_compiled(self, path, error_msg=None):
+        """Loads the specified yaml file from its compiled snapshot in the cache directory.
+
+        A snapshot is a marshal dump of the content of the file as plain dicts and lists. It is only
+        used as long as the size and modification time of the file did not change, otherwise the file
+        is parsed again using try_load_file and a new snapshot is created.
+
+        :returns: The content of the file as plain dicts and lists.
+        :rtype: dict
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return self.try_load_file(path, error_msg)
+        key = [os.path.abspath(path), stat.st_mtime_ns, stat.st_size]
+        snapshot_path = self.snapshot_path(path)
+        try:
+            with open(snapshot_path, "rb") as file:
+                snapshot = marshal.load(file)
+            if snapshot["key"] == key:
+                return snapshot["data"]
+        except (OSError, EOFError, ValueError, TypeError, KeyError):
+            pass
+        data = self.try_load_file(path, error_msg)
+        if data is not None:
+            data = to_plain(data)
+            self.write_snapshot(snapshot_path, {"key": key, "data": data})
+        return data
+
+    def snapshot_path(self, path):
+        return os.path.join(self.cache_dir, os.path.basename(path) + ".marshal")
+
+    def write_snapshot(self, snapshot_path, snapshot):
+        import tempfile
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with open(fd, "wb") as file:
+                marshal.dump(snapshot, file)
+            os.replace(tmp_path, snapshot_path)
+        except (OSError, ValueError):
+            # Containing values which cannot be compiled, parse the file next time as well.
+            os.remove(tmp_path)
+
+    def remove_snapshot(self, path):
+        if self.cache_dir:
+            try:
+                os.remove(self.snapshot_path(path))
+            except OSError:
+                pass
 
     def load_user(self):
         self.user_data = self.try_load_file(
@@ -67,6 +184,7 @@ class Dao:
         os.makedirs(os.path.dirname(self.user_yml_path), exist_ok=True)
         with open(self.user_yml_path, "w", encoding="utf-8") as user_path:
             self.yaml.dump(data, user_path)
+        self.remove_snapshot(self.user_yml_path)
 
     def dump_config(self):
         """Dumps the specified course path into the config.yml file for a given course.
@@ -76,9 +194,12 @@ class Dao:
         :param course_path: The absolute path of the course directory.
         :type course_path: str
         """
+        from ruamel.yaml.comments import CommentedMap
+
         # Open config.yml in read binary mode.
         with open(self.config_yml_path, "w", encoding="utf-8") as cfg_path:
             self.yaml.dump(CommentedMap(self.config_data), cfg_path)
+        self.remove_snapshot(self.config_yml_path)
 
     def added_courses(self):
         result = []
@@ -0,0 +1,108 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+from urllib.parse import urlparse
+
+from kit_dl.core import NotFoundException
+from kit_dl.misc import profiling
+from kit_dl.misc.page import Page
+from kit_dl.misc.streaming import ResumableDownload
+
+
+class ExternalFetcher:
+    """Downloads the assignments of courses hosted on an external page (courses with a link
+    attribute in the config.yml file) using plain HTTP requests, independent of the engine.
+
+    The external page is fetched only once per update: the links matching the link_format of the
+    course are extracted and the assignments are then downloaded at the same time by a thread pool
+    sharing the connections of the given requests session.
+
+    Since multiple courses may be downloaded at the same time (see kit_dl.parallel), the requests
+    of all courses in flight to the same host are limited to max_per_host.
+
+    :param session: The requests session, its connection pool should hold at least workers connections.
+    :param workers: The number of assignments of a course downloaded at the same time.
+    :param max_per_host: The number of requests sent to the same host at the same time.
+    """
+
+    def __init__(self, session, workers=4, timeout=10, max_per_host=4):
+        self.session = session
+        self.workers = workers
+        self.timeout = timeout
+        self.max_per_host = max_per_host
+        self.host_semaphores = {}
+        self.lock = threading.Lock()
+        # The assignment links of the most recently listed external pages, by url.
+        self.indexes = {}
+
+    def host_semaphore(self, url):
+        """Returns the semaphore limiting the requests sent to the host of the given url."""
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.host_semaphores:
+                self.host_semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self.host_semaphores[host]
+
+    @profiling.timed("navigation")
+    def fetch_index(self, scraper, course):
+        """Returns the urls of all links on the external page of the given course whose text
+        matches its link_format, by assignment number.
+        """
+        with self.host_semaphore(course["link"]):
+            response = self.session.get(course["link"], timeout=self.timeout)
+        response.raise_for_status()
+        page = Page(response.text, response.url)
+        format = course["assignment"]["link_format"]
+        index = {}
+        for text, url, _ in page.links:
+            num = scraper.parse_assignment_num(format, text)
+            if num is not None:
+                index.setdefault(num, (text, url))
+        return index
+
+    def list_links(self, scraper, course):
+        """Returns the texts of all assignment links on the external page of the given course.
+        The links are kept for the following download of the course.
+        """
+        index = self.fetch_index(scraper, course)
+        self.indexes[course["link"]] = index
+        return [text for text, _ in index.values()]
+
+    def download(self, scraper, course, assignment_nums, move, rename_format, logger):
+        """Downloads the given assignments of an external course at the same time and moves them
+        (one after another, in order) to the course directory.
+
+        :raises NotFoundException: If one of the assignments is not linked on the external page,
+                after all assignments before it have been downloaded.
+        """
+        index = self.indexes.pop(course["link"], None) or self.fetch_index(scraper, course)
+        nums = []
+        for num in assignment_nums:
+            if num not in index:
+                break
+            nums.append(num)
+        download_dir = scraper.get_download_dir()
+
+        def fetch(num):
+            text, url = index[num]
+            dst = os.path.join(download_dir, scraper.get_file_name(text, course, num) + ".pdf")
+            download = ResumableDownload(self.session, url, dst, self.timeout)
+            with self.host_semaphore(url), profiling.span("ExternalFetcher.fetch", "download"):
+                download.run()
+            return download
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for num, download in zip(nums, executor.map(fetch, nums)):
+                logger.update(num)
+                scraper.finish_download(download)
+                scraper.store_download(index[num][0], course, num, move, rename_format)
+        if len(nums) < len(assignment_nums):
+            # The loggers expect the failed assignment to be the latest update.
+            missing = assignment_nums[len(nums)]
+            logger.update(missing)
+            raise NotFoundException(
+                "Assignment '{}' not found on {}".format(
+                    scraper.format_assignment_name(course["assignment"]["link_format"], missing),
+                    course["link"],
+                )
+            )
@@ -0,0 +1,205 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assignments (
+    course TEXT NOT NULL,
+    num INTEGER NOT NULL,
+    url TEXT,
+    path TEXT NOT NULL,
+    size INTEGER,
+    sha256 TEXT,
+    downloaded REAL,
+    etag TEXT,
+    last_modified TEXT,
+    PRIMARY KEY (course, num)
+);
+CREATE TABLE IF NOT EXISTS directories (
+    course TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    rename_format TEXT NOT NULL
+);
+"""
+# Columns added after the first release of the manifest, see Manifest.migrate.
+MIGRATIONS = [
+    "ALTER TABLE assignments ADD COLUMN etag TEXT",
+    "ALTER TABLE assignments ADD COLUMN last_modified TEXT",
+]
+
+
+def file_hash(path):
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(64 * 1024), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+class Manifest:
+    """Records all downloaded assignments of each course in a SQLite database.
+
+    Besides the assignments (source url, number, destination path, size, hash and timestamp),
+    the modification time of each course directory is stored. As long as a directory has not been
+    modified, the assignments in it are retrieved from the database instead of listing the directory.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = None
+        self.lock = threading.RLock()
+
+    def connect(self):
+        if self.connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            self.connection.executescript(SCHEMA)
+            self.migrate(self.connection)
+        return self.connection
+
+    def migrate(self, db):
+        """Adds the columns missing in manifests created by previous versions of kit-dl."""
+        version = db.execute("PRAGMA user_version").fetchone()[0]
+        columns = {row[1] for row in db.execute("PRAGMA table_info(assignments)")}
+        for statement in MIGRATIONS[version:]:
+            if statement.split()[-2] not in columns:
+                db.execute(statement)
+        db.execute("PRAGMA user_version = {}".format(len(MIGRATIONS)))
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def local_assignments(self, course_name, course_dir, scan):
+        """Returns the rename format and the numbers of all assignments in the given course directory.
+
+        :param scan: Function scanning the course directory, returns the detected rename format and
+                a dict of all assignment numbers and file names in it.
+        """
+        mtime = os.stat(course_dir).st_mtime
+        with self.lock:
+            db = self.connect()
+            row = db.execute(
+                "SELECT path, mtime, rename_format FROM directories WHERE course = ?", (course_name,)
+            ).fetchone()
+            if row and row[0] == course_dir and row[1] == mtime:
+                nums = db.execute("SELECT num FROM assignments WHERE course = ?", (course_name,))
+                return row[2], {num for num, in nums}
+            rename_format, files = scan()
+            self.reconcile(db, course_name, course_dir, files)
+            db.execute(
+                "INSERT OR REPLACE INTO directories (course, path, mtime, rename_format) VALUES (?, ?, ?, ?)",
+                (course_name, course_dir, mtime, rename_format),
+            )
+            db.commit()
+            return rename_format, set(files)
+
+    def reconcile(self, db, course_name, course_dir, files):
+        """Removes assignments which are no longer in the course directory and adds the ones
+        which have been added manually (without source url and hash).
+        """
+        known = dict(db.execute("SELECT num, path FROM assignments WHERE course = ?", (course_name,)))
+        for num, path in known.items():
+            if num not in files or path != os.path.join(course_dir, files[num]):
+                db.execute("DELETE FROM assignments WHERE course = ? AND num = ?", (course_name, num))
+        for num, file_name in files.items():
+            path = os.path.join(course_dir, file_name)
+            if known.get(num) != path:
+                db.execute(
+                    "INSERT OR REPLACE INTO assignments (course, num, path, size) VALUES (?, ?, ?, ?)",
+                    (course_name, num, path, os.path.getsize(path)),
+                )
+
+    def record(self, course_name, num, url, path, etag=None, last_modified=None):
+        """Records a downloaded assignment which has been moved to the given path.
+
+        Since kit-dl knows what it changed in the course directory, the stored modification time
+        is refreshed as well, so that the next run does not need to scan the directory again.
+
+        :param etag: The ETag header of the download if known, used by the refresh command.
+        :param last_modified: The Last-Modified header of the download if known.
+        """
+        with self.lock:
+            db = self.connect()
+            db.execute(
+                "INSERT OR REPLACE INTO assignments "
+                "(course, num, url, path, size, sha256, downloaded, etag, last_modified) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    course_name,
+                    num,
+                    url,
+                    path,
+                    os.path.getsize(path),
+                    file_hash(path),
+                    time.time(),
+                    etag,
+                    last_modified,
+                ),
+            )
+            self.touch_directory(db, course_name, os.path.dirname(path))
+            db.commit()
+
+    def update_version(self, course_name, num, size, sha256, etag, last_modified):
+        """Stores the size, hash and HTTP validators of the current version of a downloaded assignment."""
+        with self.lock:
+            db = self.connect()
+            db.execute(
+                "UPDATE assignments SET size = ?, sha256 = ?, etag = ?, last_modified = ?, downloaded = ? "
+                "WHERE course = ? AND num = ?",
+                (size, sha256, etag, last_modified, time.time(), course_name, num),
+            )
+            path = db.execute(
+                "SELECT path FROM assignments WHERE course = ? AND num = ?", (course_name, num)
+            ).fetchone()
+            if path:
+                self.touch_directory(db, course_name, os.path.dirname(path[0]))
+            db.commit()
+
+    def touch(self, course_name, course_dir):
+        """Refreshes the stored modification time of a course directory after kit-dl has changed it
+        without changing its assignments, e.g. by removing a temporary directory in it.
+        """
+        with self.lock:
+            db = self.connect()
+            self.touch_directory(db, course_name, course_dir)
+            db.commit()
+
+    def touch_directory(self, db, course_name, course_dir):
+        """Refreshes the stored modification time of a course directory changed by kit-dl itself."""
+        db.execute(
+            "UPDATE directories SET mtime = ? WHERE course = ? AND path = ?",
+            (os.stat(course_dir).st_mtime, course_name, course_dir),
+        )
+
+    def assignments(self, course_name):
+        """Returns all recorded assignments of the given course as (num, url, path, size, sha256) tuples."""
+        with self.lock:
+            return (
+                self.connect()
+                .execute(
+                    "SELECT num, url, path, size, sha256 FROM assignments WHERE course = ? ORDER BY num",
+                    (course_name,),
+                )
+                .fetchall()
+            )
+
+    def downloaded_assignments(self, course_name):
+        """Returns all assignments of the given course which have been downloaded by kit-dl (having
+        a source url) as (num, url, path, sha256, etag, last_modified) tuples.
+        """
+        with self.lock:
+            return (
+                self.connect()
+                .execute(
+                    "SELECT num, url, path, sha256, etag, last_modified FROM assignments "
+                    "WHERE course = ? AND url IS NOT NULL ORDER BY num",
+                    (course_name,),
+                )
+                .fetchall()
+            )
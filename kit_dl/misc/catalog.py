@@ -0,0 +1,65 @@
+import bisect
+import re
+
+import kit_dl.misc.utils as utils
+
+ROMAN_NUMERALS = {"i": 1, "ii": 2, "iii": 3, "iv": 4, "v": 5, "vi": 6}
+
+
+def normalize_name(name):
+    """Returns the given course or folder name in lower case with umlauts replaced (see utils.reformat),
+    roman numerals replaced by digits and all other characters collapsed to single spaces,
+    e.g. "Höhere Mathematik II (WS 18/19)" becomes "hoehere mathematik 2 ws 18 19".
+    """
+    words = re.findall(r"[a-z0-9]+", utils.reformat(name).lower())
+    return " ".join(str(ROMAN_NUMERALS.get(word, word)) for word in words)
+
+
+class CourseIndex:
+    """Matches folder names against the courses of the config.yml file.
+
+    The normalized names and the keys of all courses are indexed once, so matching a folder
+    only takes a few lookups instead of comparing it to every course.
+
+    :param config_data: The courses of the config.yml file by course key.
+    """
+
+    def __init__(self, config_data):
+        self.order = {key: i for i, key in enumerate(config_data)}
+        self.keys = {}
+        self.names = {}
+        for key, course in config_data.items():
+            self.keys.setdefault(key.lower(), key)
+            self.names.setdefault(normalize_name(course["name"]), []).append(key)
+        self.sorted_names = sorted(self.names)
+
+    def match(self, folder_name):
+        """Returns the key of the course matching the given folder name or None if there is none
+        or if several courses match it (see matches).
+        """
+        keys = self.matches(folder_name)
+        return keys[0] if len(keys) == 1 else None
+
+    def matches(self, folder_name):
+        """Returns the keys of all courses matching the given folder name in the order of the config.yml file.
+
+        A folder matches a course if its name equals the course key (e.g. la) or if its normalized
+        name starts with the normalized name of the course or the other way round.
+        """
+        key = self.keys.get(folder_name.lower())
+        if key is not None:
+            return [key]
+        name = normalize_name(folder_name)
+        if not name:
+            return []
+        candidates = []
+        # Courses whose name is a prefix of the folder name.
+        for end in range(1, len(name) + 1):
+            candidates.extend(self.names.get(name[:end], ()))
+        # Courses whose name starts with the folder name.
+        start = bisect.bisect_left(self.sorted_names, name)
+        for course_name in self.sorted_names[start:]:
+            if not course_name.startswith(name):
+                break
+            candidates.extend(self.names[course_name])
+        return sorted(set(candidates), key=self.order.get)
@@ -0,0 +1,125 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+# Constants from <sys/inotify.h>.
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class DownloadWatcher:
+    """Waits until the browser has finished downloading a file to the given directory.
+
+    A download is complete once the file exists, is not empty, the temporary .part file
+    of Firefox is gone and its size has not changed since the last check. Uses inotify
+    on Linux to be notified about changes in the directory and falls back to polling
+    on other platforms. The watcher should be started before the download is triggered:
+
+        with DownloadWatcher(download_dir, "Blatt01.pdf") as watcher:
+            link.click()
+            watcher.wait(timeout=30)
+    """
+
+    poll_interval = 0.05
+
+    def __init__(self, directory, file_name):
+        self.directory = directory
+        self.file_name = file_name
+        self.path = os.path.join(directory, file_name)
+        self.initial_state = self.state()
+        self.last_size = None
+        self.fd = None
+
+    def __enter__(self):
+        if sys.platform.startswith("linux"):
+            self.fd = create_inotify(self.directory)
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def state(self):
+        try:
+            stat = os.stat(self.path)
+            return stat.st_size, stat.st_mtime
+        except OSError:
+            return None
+
+    def is_written(self):
+        """Checks whether the file has been created or changed and Firefox is no longer writing to it."""
+        state = self.state()
+        return (
+            state is not None
+            and state != self.initial_state
+            and state[0] > 0
+            and not os.path.exists(self.path + ".part")
+        )
+
+    def is_complete(self):
+        """Checks whether the file has been written and its size did not change since the last check."""
+        if not self.is_written():
+            self.last_size = None
+            return False
+        size = self.state()[0]
+        stable = size == self.last_size
+        self.last_size = size
+        return stable
+
+    def wait(self, timeout):
+        """Blocks until the download is complete.
+
+        :raises TimeoutError: If the download did not finish within the given number of seconds.
+        """
+        deadline = time.monotonic() + timeout
+        while not self.is_complete():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(
+                    "Download of {} did not finish within {} seconds.".format(self.file_name, timeout)
+                )
+            if self.fd is None:
+                time.sleep(min(self.poll_interval, remaining))
+            # The file has been closed or moved into place, no need to wait for its size to be stable.
+            elif self.wait_for_event(min(self.poll_interval * 10, remaining)) and self.is_written():
+                return
+
+    def wait_for_event(self, timeout):
+        """Waits for inotify events and returns True if the downloaded file has been written completely."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        data = os.read(self.fd, 64 * 1024)
+        offset = 0
+        finished = False
+        while offset + EVENT_HEADER.size <= len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size : offset + EVENT_HEADER.size + length].rstrip(b"\0")
+            offset += EVENT_HEADER.size + length
+            if name == os.fsencode(self.file_name) and mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                finished = True
+        return finished
+
+
+def create_inotify(directory):
+    """Creates an inotify instance watching the given directory or returns None if not available."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+# Firefox preferences of the lean profile used for headless runs (see cli.create_profile).
+# The scraper only needs the links and forms of the ilias pages, so everything else a page
+# loads is blocked and the background services of Firefox are disabled. Scripts and
+# stylesheets are still loaded since the login and the navigation depend on them.
+LEAN_PREFERENCES = {
+    # Don't load images, web fonts and media.
+    "permissions.default.image": 2,
+    "gfx.downloadable_fonts.enabled": False,
+    "media.autoplay.default": 5,
+    "media.peerconnection.enabled": False,
+    "media.navigator.enabled": False,
+    # Only cache in memory, the disk cache of a run is not kept in the cached profile (see ProfileCache).
+    "browser.cache.disk.enable": False,
+    "browser.cache.offline.enable": False,
+    "browser.sessionstore.resume_from_crash": False,
+    "browser.sessionhistory.max_total_viewers": 0,
+    # Don't prefetch or preconnect to links on the page.
+    "network.prefetch-next": False,
+    "network.dns.disablePrefetch": True,
+    "network.http.speculative-parallel-limit": 0,
+    "network.predictor.enabled": False,
+    "browser.urlbar.speculativeConnect.enabled": False,
+    # Safe browsing downloads its block lists on startup and checks every download.
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "browser.safebrowsing.downloads.enabled": False,
+    "browser.safebrowsing.downloads.remote.enabled": False,
+    "browser.safebrowsing.blockedURIs.enabled": False,
+    # Telemetry, studies and health reports.
+    "toolkit.telemetry.enabled": False,
+    "toolkit.telemetry.unified": False,
+    "toolkit.telemetry.archive.enabled": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "app.normandy.enabled": False,
+    "app.shield.optoutstudies.enabled": False,
+    "browser.ping-centre.telemetry": False,
+    # Updates of Firefox, its add-ons and search engines.
+    "app.update.enabled": False,
+    "app.update.auto": False,
+    "extensions.update.enabled": False,
+    "browser.search.update": False,
+    # Connections made on startup and pages shown on a new tab.
+    "network.captive-portal-service.enabled": False,
+    "network.connectivity-service.enabled": False,
+    "browser.shell.checkDefaultBrowser": False,
+    "browser.startup.homepage_override.mstone": "ignore",
+    "browser.newtabpage.enabled": False,
+    "extensions.pocket.enabled": False,
+}
+
+
+class ProfileCache:
+    """Keeps a prebuilt Firefox profile in the cache directory of kit-dl.
+
+    Instead of letting selenium create, zip and send a new profile on every start, the profile
+    is created once with the given preferences in its user.js file and Firefox is started with
+    a copy of it (see checkout), since each running Firefox locks and writes to its profile.
+    The first profile returned after use replaces the profile in the cache (see checkin), so later
+    runs also skip the initialization Firefox performs on the first start of a new profile.
+
+    A profile is kept for each version and set of preferences, so changing the preferences
+    (e.g. the root_path) creates a new one and removes the outdated profiles.
+
+    :param directory: The directory containing the cached profile and the copies of running instances.
+    :param preferences: A dict of the names and (bool, int or str) values of the preferences.
+    """
+
+    version = 1
+    # Files Firefox only needs while it is running or which belong to a session, not kept in the cache.
+    transient = (
+        "lock",
+        ".parentlock",
+        "parent.lock",
+        "cookies.sqlite*",
+        "sessionstore*",
+        "sessionCheckpoints.json",
+        "cache2",
+        "storage",
+        "webappsstore.sqlite*",
+        # History and form data of the ilias pages.
+        "places.sqlite*",
+        "favicons.sqlite*",
+        "formhistory.sqlite*",
+        "logins.json",
+        "user.js",
+    )
+    # Copies older than this have been left behind by runs which did not finish and are removed.
+    max_copy_age = 24 * 60 * 60
+
+    def __init__(self, directory, preferences):
+        self.directory = directory
+        self.preferences = preferences
+        key = json.dumps([self.version, preferences], sort_keys=True).encode("utf-8")
+        self.path = os.path.join(directory, "profile-" + hashlib.sha256(key).hexdigest()[:16])
+
+    def is_initialized(self):
+        """Checks whether the cached profile has already been used by Firefox."""
+        return os.path.isfile(os.path.join(self.path, "prefs.js"))
+
+    def checkout(self, preferences=None):
+        """Returns the path of a new copy of the cached profile, which is created if necessary.
+
+        :param preferences: Preferences of this copy only, overriding those of the cached profile.
+        """
+        if not os.path.isdir(self.path):
+            self.build()
+        self.remove_outdated()
+        run_dir = tempfile.mkdtemp(prefix="run-", dir=self.directory)
+        profile_dir = os.path.join(run_dir, "profile")
+        shutil.copytree(self.path, profile_dir)
+        if preferences:
+            self.write_preferences(profile_dir, dict(self.preferences, **preferences))
+        return profile_dir
+
+    def checkin(self, profile_dir, keep=True):
+        """Removes a copy once Firefox has quit.
+
+        :param keep: Whether the copy may replace the cached profile if it has not been initialized yet.
+        """
+        if keep and not self.is_initialized() and os.path.isfile(os.path.join(profile_dir, "prefs.js")):
+            self.replace(profile_dir)
+        shutil.rmtree(os.path.dirname(profile_dir), ignore_errors=True)
+
+    def build(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix="new-", dir=self.directory)
+        self.write_preferences(tmp_dir, self.preferences)
+        try:
+            os.rename(tmp_dir, self.path)
+        except OSError:
+            # Another run has created the profile in the meantime.
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def replace(self, profile_dir):
+        """Replaces the cached profile with the given (initialized) one, except for its transient files."""
+        tmp_dir = tempfile.mkdtemp(prefix="new-", dir=self.directory)
+        try:
+            shutil.copytree(
+                profile_dir, os.path.join(tmp_dir, "profile"), ignore=shutil.ignore_patterns(*self.transient)
+            )
+            self.write_preferences(os.path.join(tmp_dir, "profile"), self.preferences)
+            old_path = os.path.join(tmp_dir, "old")
+            os.rename(self.path, old_path)
+            os.rename(os.path.join(tmp_dir, "profile"), self.path)
+        except OSError:
+            # The profile is kept as it is if another run has replaced it at the same time.
+            pass
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def remove_outdated(self):
+        """Removes the cached profiles of other preferences and copies left behind by previous runs."""
+        for entry in os.scandir(self.directory):
+            if entry.path == self.path:
+                continue
+            if entry.name.startswith("profile-") or (
+                entry.name.startswith(("run-", "new-"))
+                and time.time() - entry.stat().st_mtime > self.max_copy_age
+            ):
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    def write_preferences(self, profile_dir, preferences):
+        with open(os.path.join(profile_dir, "user.js"), "w", encoding="utf-8") as file:
+            for name, value in sorted(preferences.items()):
+                file.write("user_pref({}, {});\n".format(json.dumps(name), json.dumps(value)))
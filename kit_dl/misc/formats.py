@@ -0,0 +1,90 @@
+from collections import Counter
+import functools
+import re
+
+# The last number of a file name and the text before and after it, used to detect formats.
+LAST_NUMBER = re.compile(r"^(.*?)(\d+)(\D*)$", re.DOTALL)
+
+
+class AssignmentFormat:
+    """A compiled assignment format such as "Blatt$$", "$$-aufgaben" or "Übungsblatt $/assignment$$".
+
+    Each run of $-signs stands for the assignment number, padded with leading zeros to the
+    number of $-signs. The format is compiled into a regex with a named group for each number
+    (num0, num1, ...) which only matches names the formatter would create, and into a template
+    for the formatter. Use compile_format to get the cached instance of a format.
+    """
+
+    def __init__(self, format):
+        self.format = format
+        pieces = re.split(r"(\$+)", format)
+        self.literals = pieces[0::2]
+        self.widths = [len(run) for run in pieces[1::2]]
+        self.template = "".join(
+            literal.replace("{", "{{").replace("}", "}}") + ("{{0:0{}d}}".format(width) if width else "")
+            for literal, width in zip(self.literals, self.widths + [0])
+        )
+        groups = [
+            # Numbers are only padded up to the width, longer ones must not start with a zero.
+            "(?P<num{}>\\d{{{}}}|[1-9]\\d{{{},}})".format(i, width, width)
+            for i, width in enumerate(self.widths)
+        ]
+        body = "".join(
+            re.escape(literal) + (groups[i] if i < len(groups) else "")
+            for i, literal in enumerate(self.literals)
+        )
+        self.regex = re.compile(body)
+        # Matches the names of a whole listing joined by newlines at once, see scan.
+        self.listing_regex = re.compile("^{}$".format(body), re.MULTILINE)
+
+    @property
+    def has_number(self):
+        return bool(self.widths)
+
+    def __call__(self, num):
+        """Returns the name of the given assignment number."""
+        return self.template.format(num)
+
+    def number(self, match):
+        nums = {int(value) for value in match.groupdict().values()}
+        return nums.pop() if len(nums) == 1 else None
+
+    def parse(self, name):
+        """Returns the assignment number of the given name if it matches the format, otherwise None."""
+        if not self.has_number:
+            return None
+        match = self.regex.fullmatch(name)
+        return self.number(match) if match else None
+
+    def scan(self, names):
+        """Returns the numbers of all given names matching the format, using a single regex pass
+        over the whole listing instead of matching each name on its own.
+        """
+        if not self.has_number:
+            return set()
+        listing = "\n".join(name for name in names if "\n" not in name)
+        nums = (self.number(match) for match in self.listing_regex.finditer(listing))
+        return {num for num in nums if num is not None}
+
+
+@functools.lru_cache(maxsize=None)
+def compile_format(format):
+    return AssignmentFormat(format)
+
+
+def detect_format(names):
+    """Returns the format matching the most of the given names (without extension) by replacing
+    their last number with $-signs, or None if none of them contains a number.
+    """
+    formats = Counter()
+    for name in names:
+        match = LAST_NUMBER.match(name)
+        if match:
+            prefix, digits, suffix = match.groups()
+            formats[prefix + "$" * len(digits) + suffix] += 1
+    if not formats:
+        return None
+    # Names with more digits than their format also match it (e.g. Blatt10 matches Blatt$),
+    # so the most common formats are compared by the number of names they match.
+    candidates = [format for format, _ in formats.most_common(5)]
+    return max(candidates, key=lambda format: len(compile_format(format).scan(names)))
@@ -1,3 +1,5 @@
+import threading
+
 from selenium.common.exceptions import NoSuchElementException
 from selenium.common.exceptions import TimeoutException
 
@@ -40,7 +42,9 @@ class StateLogger(BaseProgressLogger):
         super().update(msg)
 
     def __exit__(self, exc_type, exc_value, tb):
-        if isinstance(exc_value, TimeoutException):
+        from kit_dl.core import NotFoundException
+
+        if isinstance(exc_value, (TimeoutException, NotFoundException)):
             print(", not found.", end="\n", flush=False)
         else:
             print(", done.", end="\n", flush=False)
@@ -75,12 +79,44 @@ class SilentProgressLogger(BaseProgressLogger):
         self.latest_output = progress
 
     def __exit__(self, exc_type, exc_value, tb):
-        from kit_dl.core import LoginException
+        from kit_dl.core import LoginException, NotFoundException
 
-        if exc_type in (TimeoutException, NoSuchElementException) and self.prev_output is None:
-            print("\rUpdating {}: already up to date.".format(self.course), flush=False, end="\n")
-        elif exc_type is LoginException:
+        if exc_type is LoginException:
             print("\rUpdating {}, cancelled!".format(self.course), flush=False, end="\n")
-        else:
-            output = self.prev_output if self.prev_output else self.latest_output
-            print("\rUpdating {}: {}, done.".format(self.course, output), flush=False, end="\n")
+        elif exc_type is None or exc_type in (TimeoutException, NoSuchElementException, NotFoundException):
+            # The last assignment has not been found if an exception occurred.
+            output = self.prev_output if exc_type else self.latest_output
+            if output is None:
+                print("\rUpdating {}: already up to date.".format(self.course), flush=False, end="\n")
+            else:
+                print("\rUpdating {}: {}, done.".format(self.course, output), flush=False, end="\n")
+        elif self.prev_output is not None:
+            # Only report the assignments which have been downloaded, the error is reported by the caller.
+            print("\rUpdating {}: {}.".format(self.course, self.prev_output), flush=False, end="\n")
+        elif self.latest_output is not None:
+            self.end_line()
+
+    def end_line(self):
+        print(flush=False)
+
+
+class ConcurrentProgressLogger(SilentProgressLogger):
+    """Only prints the final state of a course, so that the output of courses
+    which are updated at the same time is not interleaved.
+    """
+
+    lock = threading.Lock()
+
+    def update(self, progress):
+        if self.latest_output:
+            progress = "{}, {}".format(self.latest_output, progress)
+            self.prev_output = self.latest_output
+        self.latest_output = progress
+
+    def end_line(self):
+        # Nothing has been printed yet.
+        pass
+
+    def __exit__(self, exc_type, exc_value, tb):
+        with self.lock:
+            super().__exit__(exc_type, exc_value, tb)
@@ -0,0 +1,100 @@
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+
+class Form:
+    """A HTML form with its target url and all of its input fields."""
+
+    def __init__(self, action, method):
+        self.action = action
+        self.method = method
+        self.fields = []
+
+    def values(self):
+        """Returns the default values of all named fields except for submit buttons."""
+        return {
+            field["name"]: field.get("value", "")
+            for field in self.fields
+            if "name" in field and field.get("type") not in ("submit", "button", "image")
+        }
+
+    def submit_button(self):
+        """Returns the first submit button of the form (the one pressing enter submits) or None."""
+        return next((field for field in self.fields if field.get("type") in ("submit", "image")), None)
+
+    def has_field(self, name):
+        return any(field.get("name") == name for field in self.fields)
+
+
+class Page(HTMLParser):
+    """Parses a HTML page and collects all links, forms and elements with an id.
+
+    Links are stored as (text, url, classes) tuples where url has been resolved
+    against the url of the page and text contains the whitespace normalized link text.
+    """
+
+    def __init__(self, html, url):
+        super().__init__()
+        self.html = html
+        self.url = url
+        self.links = []
+        self.forms = []
+        self.elements = {}
+        self.base_url = url
+        self._link = None
+        self._form = None
+        self.feed(html)
+        self.close()
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict((key, value if value is not None else "") for key, value in attrs)
+        if tag == "base" and "href" in attrs:
+            self.base_url = urljoin(self.url, attrs["href"])
+        elif tag == "a" and "href" in attrs:
+            self._link = {"href": attrs["href"], "classes": attrs.get("class", "").split(), "text": []}
+        elif tag == "form":
+            self._form = Form(attrs.get("action", ""), attrs.get("method", "get").lower())
+            self.forms.append(self._form)
+        elif tag in ("input", "button", "select", "textarea") and self._form is not None:
+            if tag == "button":
+                attrs.setdefault("type", "submit")
+            self._form.fields.append(attrs)
+        if "id" in attrs:
+            self.elements[attrs["id"]] = dict(attrs, tag=tag, form=self._form)
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._link is not None:
+            text = " ".join("".join(self._link["text"]).split())
+            self.links.append((text, self.resolve(self._link["href"]), self._link["classes"]))
+            self._link = None
+        elif tag == "form":
+            self._form = None
+
+    def handle_data(self, data):
+        if self._link is not None:
+            self._link["text"].append(data)
+
+    def resolve(self, href):
+        return urljoin(self.base_url, href)
+
+    def link(self, text, css_class=None):
+        """Returns the url of the first link with the given text (and class) or None if not found."""
+        for link_text, url, classes in self.links:
+            if link_text == text and (css_class is None or css_class in classes):
+                return url
+
+    def links_of_class(self, css_class):
+        """Returns a dict of all link texts and urls of links with the given class."""
+        result = {}
+        for text, url, classes in self.links:
+            if css_class in classes:
+                result.setdefault(text, url)
+        return result
+
+    def form_of(self, element_id):
+        """Returns the form containing the element with the given id."""
+        element = self.elements.get(element_id)
+        return element["form"] if element else None
+
+    def form_action(self, form):
+        return self.resolve(form.action) if form.action else self.url
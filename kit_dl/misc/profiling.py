@@ -0,0 +1,180 @@
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+from kit_dl.misc.utils import NullContext
+
+# Phases in the order they are printed by Profiler.summary. The course phase contains the time
+# spent on a course which has not been assigned to one of the other phases.
+PHASES = ["startup", "config", "login", "navigation", "sleep", "download", "move", "scan", "course"]
+
+
+class Span:
+    """A timed section of the program. Its self time excludes the time spent in nested spans."""
+
+    def __init__(self, name, phase, args, start=None, duration=0.0):
+        self.name = name
+        self.phase = phase
+        self.args = args
+        self.start = time.perf_counter() if start is None else start
+        self.duration = duration
+        self.child_time = 0.0
+        self.thread_id = threading.get_ident()
+
+    @property
+    def self_time(self):
+        return self.duration - self.child_time
+
+
+class Profiler:
+    """Records spans of all threads and exports them as a Chrome trace.
+
+    Spans are started using the span context manager or the timed decorator of this module,
+    which only record anything while a profiler is active (see start):
+
+        with profiling.span("move", "move", course="la"):
+            shutil.move(src, dst)
+
+    Spans with a course argument also assign all nested spans to that course.
+    """
+
+    def __init__(self, origin=None):
+        self.spans = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.origin = time.perf_counter() if origin is None else origin
+
+    def stack(self):
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    @contextlib.contextmanager
+    def span(self, name, phase, **args):
+        stack = self.stack()
+        if "course" not in args and stack and "course" in stack[-1].args:
+            args["course"] = stack[-1].args["course"]
+        span = Span(name, phase, args)
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - span.start
+            stack.pop()
+            if stack:
+                stack[-1].child_time += span.duration
+            with self.lock:
+                self.spans.append(span)
+
+    def add(self, name, phase, start, duration, **args):
+        """Records a span which has been measured before the profiler was started."""
+        with self.lock:
+            self.spans.append(Span(name, phase, args, start, duration))
+
+    def trace(self):
+        """Returns the recorded spans in the Chrome trace event format (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": span.phase,
+                "ph": "X",
+                "ts": round((span.start - self.origin) * 1e6),
+                "dur": round(span.duration * 1e6),
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": span.args,
+            }
+            for span in sorted(self.spans, key=lambda span: span.start)
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.trace(), file)
+
+    def phase_times(self, course=None):
+        """Returns the self time of all spans (of the given course) summed up by phase."""
+        times = {}
+        for span in self.spans:
+            if course is None or span.args.get("course") == course:
+                times[span.phase] = times.get(span.phase, 0.0) + span.self_time
+        return times
+
+    def summary(self):
+        """Returns a table of the time spent in each phase, in total and per course."""
+        times = self.phase_times()
+        phases = [phase for phase in PHASES if phase in times] + sorted(set(times) - set(PHASES))
+        courses = sorted({span.args["course"] for span in self.spans if "course" in span.args})
+        header = "{:<12}".format("") + "".join(" {:>10}".format(phase) for phase in phases)
+        lines = [header, "-" * len(header)]
+        for name, course_times in [("total", times)] + [
+            (course.upper(), self.phase_times(course)) for course in courses
+        ]:
+            lines.append(
+                "{:<12}".format(name)
+                + "".join(" {:>9.3f}s".format(course_times.get(phase, 0.0)) for phase in phases)
+            )
+        return "\n".join(lines)
+
+
+class NoProfiler:
+    """Used while profiling is disabled, records nothing."""
+
+    null_span = NullContext()
+
+    def span(self, name, phase, **args):
+        return self.null_span
+
+
+_profiler = NoProfiler()
+
+
+def start(origin=None):
+    """Enables profiling and returns the new active profiler.
+
+    :param origin: The time (time.perf_counter) the trace starts at, now by default.
+    """
+    global _profiler
+    _profiler = Profiler(origin)
+    return _profiler
+
+
+def stop():
+    global _profiler
+    _profiler = NoProfiler()
+
+
+def span(name, phase, **args):
+    """Times the enclosed block as a span of the given phase if profiling is enabled."""
+    return _profiler.span(name, phase, **args)
+
+
+def timed(phase):
+    """Decorator timing each call of a function as a span of the given phase."""
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with _profiler.span(function.__qualname__, phase):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def timed_course(method):
+    """Decorator timing each call of a method taking the course and course_name arguments
+    as a span of the course phase, which assigns all nested spans to the course.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, course, course_name, *args, **kwargs):
+        with _profiler.span(course_name, "course", course=course_name):
+            return method(self, course, course_name, *args, **kwargs)
+
+    return wrapper
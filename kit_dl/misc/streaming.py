@@ -0,0 +1,151 @@
+import json
+import os
+import time
+
+import requests
+
+from kit_dl.core import NotFoundException
+
+
+class ResumableDownload:
+    """Streams a file to a .part file next to its destination which is only renamed once it is complete.
+
+    If the connection breaks, the download is resumed from the last written byte using a Range
+    request (up to max_retries times). The .part file and the validator of the response
+    (ETag or Last-Modified) are kept if the download fails, so that the next run can resume it
+    as well. The server only continues the file if it has not changed in the meantime (If-Range).
+    The ETag and Last-Modified headers of the response are kept to be stored in the manifest.
+
+    :param etag: The ETag of a previous version of the file. If given (or last_modified), the file
+            is only downloaded if it has changed since then, otherwise modified is False.
+    :param last_modified: The Last-Modified header of a previous version of the file.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(self, session, url, dst, timeout=10, max_retries=3, etag=None, last_modified=None):
+        self.session = session
+        self.url = url
+        self.dst = dst
+        self.part_path = dst + ".part"
+        self.meta_path = dst + ".part.json"
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.size = 0
+        self.transferred = 0
+        self.elapsed = 0
+        self.previous_etag = etag
+        self.previous_last_modified = last_modified
+        self.modified = True
+        self.etag = None
+        self.last_modified = None
+
+    def run(self):
+        """Downloads the file to its destination.
+
+        :raises NotFoundException: If the server responded with 404 Not Found or a HTML page.
+        """
+        start = time.monotonic()
+        attempts = 0
+        while True:
+            try:
+                self.transfer()
+                break
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError):
+                attempts += 1
+                if attempts > self.max_retries:
+                    raise
+        self.elapsed = time.monotonic() - start
+        if self.modified:
+            self.finish()
+
+    def bytes_per_second(self):
+        """Returns the average transfer rate of the download (excluding resumed bytes)."""
+        return self.transferred / self.elapsed if self.elapsed > 0 else 0
+
+    def transfer(self):
+        offset, validator = self.resume_point()
+        if offset:
+            headers = {"Range": "bytes={}-".format(offset), "If-Range": validator}
+        else:
+            headers = self.conditional_headers()
+        with self.session.get(self.url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 304:
+                self.modified = False
+                return
+            if response.status_code == 404:
+                raise NotFoundException("File {} not found".format(self.url))
+            if response.status_code == 416:
+                # The part file does not match the file on the server, start over.
+                self.discard()
+                return self.transfer()
+            response.raise_for_status()
+            # Ilias answers with its login page instead of the file if the session is not valid.
+            if response.headers.get("Content-Type", "").startswith("text/html"):
+                raise NotFoundException("{} did not return a file".format(self.url))
+            self.etag = response.headers.get("ETag")
+            self.last_modified = response.headers.get("Last-Modified")
+            if response.status_code != 206:
+                offset = 0
+                self.save_validator(response)
+            self.size = offset
+            with open(self.part_path, "ab" if offset else "wb") as file:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    file.write(chunk)
+                    self.size += len(chunk)
+                    self.transferred += len(chunk)
+                file.flush()
+                os.fsync(file.fileno())
+
+    def conditional_headers(self):
+        headers = {}
+        if self.previous_etag:
+            headers["If-None-Match"] = self.previous_etag
+        if self.previous_last_modified:
+            headers["If-Modified-Since"] = self.previous_last_modified
+        return headers
+
+    def resume_point(self):
+        """Returns the size and validator of a previous incomplete download of the same url
+        or (0, None) if it cannot be resumed.
+        """
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as file:
+                meta = json.load(file)
+            size = os.path.getsize(self.part_path)
+        except (IOError, OSError, ValueError):
+            return 0, None
+        if meta.get("url") != self.url or not meta.get("validator") or size == 0:
+            return 0, None
+        return size, meta["validator"]
+
+    def save_validator(self, response):
+        etag = response.headers.get("ETag")
+        # Weak ETags must not be used for range requests.
+        validator = etag if etag and not etag.startswith("W/") else response.headers.get("Last-Modified")
+        with open(self.meta_path, "w", encoding="utf-8") as file:
+            json.dump({"url": self.url, "validator": validator}, file)
+
+    def finish(self):
+        os.replace(self.part_path, self.dst)
+        self.remove(self.meta_path)
+        # Persist the rename as well, otherwise the file may be lost after a crash.
+        if hasattr(os, "O_DIRECTORY"):
+            try:
+                fd = os.open(os.path.dirname(self.dst) or ".", os.O_RDONLY | os.O_DIRECTORY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError:
+                pass
+
+    def discard(self):
+        self.remove(self.part_path)
+        self.remove(self.meta_path)
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -3,3 +3,13 @@ def reformat(value):
     for char in chars:
         value = value.replace(char, chars[char])
     return value
+
+
+class NullContext:
+    """Context manager doing nothing, replaces contextlib.nullcontext which requires python 3.7."""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
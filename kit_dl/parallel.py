@@ -0,0 +1,76 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from kit_dl.core import LOGIN_FAILED_MSG
+
+MAX_PER_HOST = 4
+
+
+class HostLimiter:
+    """Limits the number of courses which are updated at the same time for each host.
+
+    Since every course on ilias sends its requests one after another, this also limits the
+    number of requests in flight to ilias. Courses on external pages download several
+    assignments at the same time, their requests are limited per host by the ExternalFetcher.
+    """
+
+    def __init__(self, max_per_host):
+        self.max_per_host = max_per_host
+        self.semaphores = {}
+
+    def semaphore(self, host):
+        # Semaphores must be created while the event loop is running (python < 3.10).
+        if host not in self.semaphores:
+            self.semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return self.semaphores[host]
+
+
+class ConcurrentUpdater:
+    """Updates multiple courses at the same time using an asyncio event loop.
+
+    The blocking update_directory calls of the given scraper are executed by a thread pool
+    of the specified size. Each course is updated by a clone of the scraper sharing its
+    (already logged in) session, which downloads to the staging directory of the course.
+    """
+
+    def __init__(self, scraper, jobs, max_per_host=MAX_PER_HOST):
+        self.scraper = scraper
+        self.jobs = jobs
+        self.limiter = HostLimiter(min(jobs, max_per_host))
+
+    def update(self, courses):
+        """Updates the given courses, a list of (course_name, course) tuples."""
+        loop = asyncio.new_event_loop()
+        executor = ThreadPoolExecutor(max_workers=self.jobs)
+        try:
+            loop.run_until_complete(self.update_all(loop, executor, courses))
+        finally:
+            executor.shutdown()
+            loop.close()
+
+    async def update_all(self, loop, executor, courses):
+        # Log in once before starting, otherwise every ilias course would log in on its own.
+        if any("link" not in course for _, course in courses) and not self.scraper.on_ilias_page():
+            if not await loop.run_in_executor(executor, self.scraper.login):
+                print(LOGIN_FAILED_MSG)
+                courses = [(name, course) for name, course in courses if "link" in course]
+        results = await asyncio.gather(
+            *(self.update_course(loop, executor, name, course) for name, course in courses),
+            return_exceptions=True
+        )
+        for (name, _), result in zip(courses, results):
+            if isinstance(result, Exception):
+                print("Updating {} failed: {}".format(name.upper(), result))
+
+    async def update_course(self, loop, executor, name, course):
+        async with self.limiter.semaphore(self.host_of(course)):
+            await loop.run_in_executor(executor, self.update_directory, name, course)
+
+    def update_directory(self, name, course):
+        scraper = self.scraper.clone()
+        scraper.concurrent = True
+        scraper.update_directory(course, name)
+
+    def host_of(self, course):
+        return urlparse(course["link"] if "link" in course else self.scraper.main_page).netloc
@@ -0,0 +1,120 @@
+import os
+
+# The backends a course is downloaded with.
+ILIAS = "ilias"
+EXTERNAL = "external"
+NOTHING = "nothing"
+
+
+class CoursePlan:
+    """The backend and the assignments a single course is downloaded with.
+
+    :param assignments: The assignment numbers to download, or None if the assignments missing
+            in the course directory are determined online (update).
+    :param reason: Why nothing has to be done for the course.
+    """
+
+    def __init__(self, name, course, backend, assignments=None, reason=None):
+        self.name = name
+        self.course = course
+        self.backend = backend
+        self.assignments = assignments
+        self.reason = reason
+
+    def describe(self):
+        if self.backend == NOTHING:
+            return "{}: nothing to do, {}.".format(self.name.upper(), self.reason)
+        source = "ilias" if self.backend == ILIAS else self.course["link"]
+        if self.assignments is None:
+            return "{}: missing assignments from {}".format(self.name.upper(), source)
+        return "{}: assignments {} from {}".format(
+            self.name.upper(), ", ".join(str(num) for num in self.assignments), source
+        )
+
+
+class Plan:
+    """The courses of a get or update command grouped by the backend they are downloaded with."""
+
+    def __init__(self, courses):
+        self.courses = courses
+
+    @property
+    def backends(self):
+        """Returns the backends which have to be started, a set of ILIAS and EXTERNAL."""
+        return {course.backend for course in self.courses if course.backend != NOTHING}
+
+    def needs_ilias(self):
+        return ILIAS in self.backends
+
+    def active(self):
+        """Returns the (course_name, course) tuples of all courses something has to be done for."""
+        return [(course.name, course.course) for course in self.courses if course.backend != NOTHING]
+
+    def assignments(self):
+        """Returns the assignment numbers to download by course name."""
+        return {course.name: course.assignments for course in self.courses if course.backend != NOTHING}
+
+    def skipped(self):
+        return [course for course in self.courses if course.backend == NOTHING]
+
+    def describe(self):
+        lines = [course.describe() for course in self.courses]
+        backends = sorted(self.backends)
+        lines.append("Backends: {}".format(", ".join(backends) if backends else "none"))
+        return "\n".join(lines)
+
+
+class Planner:
+    """Plans a get or update command before anything is started, using local information only.
+
+    Each course is assigned to the backend it is downloaded with: ilias (requiring a login and,
+    for the selenium engine, Firefox), the external page of the course (plain HTTP requests)
+    or nothing, e.g. if all requested assignments have already been downloaded.
+
+    :param scraper: A BaseScraper used to read the course directories (and the manifest).
+    """
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+
+    def check_directory(self, course):
+        """Returns why the given course cannot be downloaded to its directory or None if it can."""
+        if not course.get("path"):
+            return "no directory has been set up"
+        if not os.path.isdir(self.scraper.get_course_dir(course)):
+            return "directory {} does not exist".format(self.scraper.get_course_dir(course))
+        return None
+
+    def backend(self, course):
+        return EXTERNAL if "link" in course else ILIAS
+
+    def plan_get(self, courses, assignment_nums, move, force=False):
+        """Plans downloading the given assignments of the given (course_name, course) tuples.
+        Assignments which are already in the course directory are skipped unless forced.
+        """
+        plans = []
+        for name, course in courses:
+            reason = self.check_directory(course)
+            if reason:
+                plans.append(CoursePlan(name, course, NOTHING, reason=reason))
+                continue
+            nums = [int(num) for num in assignment_nums]
+            if move and not force:
+                _, present_assignments = self.scraper.get_local_assignments(course)
+                nums = [num for num in nums if num not in present_assignments]
+            if nums:
+                plans.append(CoursePlan(name, course, self.backend(course), nums))
+            else:
+                plans.append(CoursePlan(name, course, NOTHING, reason="already downloaded"))
+        return Plan(plans)
+
+    def plan_update(self, courses):
+        """Plans updating the given (course_name, course) tuples."""
+        plans = []
+        for name, course in courses:
+            reason = self.check_directory(course)
+            if reason:
+                plans.append(CoursePlan(name, course, NOTHING, reason=reason))
+            else:
+                plans.append(CoursePlan(name, course, self.backend(course)))
+        return Plan(plans)
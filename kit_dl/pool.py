@@ -0,0 +1,211 @@
+import queue
+import shutil
+import tempfile
+import threading
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import TimeoutException
+
+from kit_dl.core import BaseScraper, LoginException, NotFoundException
+from kit_dl.misc import profiling
+from kit_dl.misc.utils import NullContext
+
+
+class Job:
+    """Downloads a single assignment of a course. If no assignment number has been specified,
+    the job lists the assignments available online and adds a job for each missing one instead.
+    """
+
+    def __init__(self, course_name, course, assignment_num, move, rename_format, present_assignments=None):
+        self.course_name = course_name
+        self.course = course
+        self.assignment_num = assignment_num
+        self.move = move
+        self.rename_format = rename_format
+        self.present_assignments = present_assignments
+        self.attempts = 0
+
+
+class CourseReport:
+    def __init__(self, update):
+        self.update = update
+        self.downloaded = []
+        self.errors = []
+        self.cancelled = False
+
+    def summary(self, course_name):
+        if self.cancelled:
+            return "Updating {}, cancelled!".format(course_name.upper())
+        if self.downloaded:
+            nums = ", ".join(str(num) for num in sorted(self.downloaded))
+            return "Updating {}: {}, done.".format(course_name.upper(), nums)
+        if self.update and not self.errors:
+            return "Updating {}: already up to date.".format(course_name.upper())
+        return "Updating {}: not found.".format(course_name.upper())
+
+
+class DriverPool:
+    """Downloads assignments using a pool of selenium Scrapers, each controlling its own Firefox instance.
+
+    All (course, assignment) jobs are shared between the workers using a queue. Each worker
+    logs in independently, is reused for all of its jobs and downloads to its own temporary directory
+    in order to not mix up files with the same name. If the browser of a worker crashes,
+    it will be replaced by a new one and the job will be retried.
+
+    :param create_scraper: Function creating a new Scraper downloading to the given directory.
+    :param size: The number of workers.
+    """
+
+    def __init__(self, dao, verbose, create_scraper, size, manifest=None, max_attempts=2):
+        self.dao = dao
+        self.helper = BaseScraper(dao, verbose, manifest=manifest)
+        self.create_scraper = create_scraper
+        self.size = size
+        self.max_attempts = max_attempts
+        self.jobs = queue.Queue()
+        self.reports = {}
+        self.lock = threading.Lock()
+        self.alive = 0
+
+    def get(self, courses, assignment_nums, move):
+        """Downloads the given assignments of all courses, a list of (course_name, course) tuples.
+
+        :param assignment_nums: The assignment numbers to download, or a dict of them by course name.
+        """
+        for name, course in courses:
+            rename_format, _ = self.helper.get_local_assignments(course)
+            self.reports[name] = CourseReport(update=False)
+            for num in assignment_nums[name] if isinstance(assignment_nums, dict) else assignment_nums:
+                self.jobs.put(Job(name, course, int(num), move, rename_format))
+        self.run()
+
+    def update(self, courses):
+        """Downloads all assignments available online but missing in the directory of each course."""
+        for name, course in courses:
+            rename_format, present_assignments = self.helper.get_local_assignments(course)
+            self.reports[name] = CourseReport(update=True)
+            self.jobs.put(Job(name, course, None, True, rename_format, present_assignments))
+        self.run()
+
+    def run(self):
+        workers = [threading.Thread(target=self.work, args=(i,), daemon=True) for i in range(self.size)]
+        self.alive = len(workers)
+        for worker in workers:
+            worker.start()
+        self.jobs.join()
+        for _ in workers:
+            self.jobs.put(None)
+        for worker in workers:
+            worker.join()
+        for name, report in self.reports.items():
+            print(report.summary(name))
+            for error in report.errors:
+                print(error)
+
+    def work(self, worker):
+        # Created in the temporary directory of the system, never left behind in the root_path if
+        # kit-dl is killed. Moved assignments are downloaded to the staging directory of their course.
+        download_dir = tempfile.mkdtemp(prefix="kit-dl-")
+        scraper = self.start_scraper(download_dir, worker)
+        try:
+            while scraper is not None:
+                job = self.jobs.get()
+                if job is None:
+                    self.jobs.task_done()
+                    break
+                try:
+                    scraper = self.perform(scraper, job, download_dir, worker)
+                finally:
+                    self.jobs.task_done()
+        finally:
+            if scraper is not None:
+                scraper.close()
+            else:
+                self.stop_worker()
+            shutil.rmtree(download_dir, ignore_errors=True)
+
+    def start_scraper(self, download_dir, worker):
+        try:
+            scraper = self.create_scraper(download_dir)
+            scraper.download_dir = download_dir
+            # Workers may download assignments of the same course at the same time.
+            scraper.staging_suffix = "-{}".format(worker)
+            return scraper
+        except Exception as e:
+            print("Could not start Firefox: {}".format(e))
+
+    def stop_worker(self):
+        """Removes a worker whose browser could not be started. If it was the last one,
+        all remaining jobs fail since nobody is left to perform them.
+        """
+        with self.lock:
+            self.alive -= 1
+            if self.alive > 0:
+                return
+        while True:
+            try:
+                job = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                self.report_error(job, "no browser available")
+            self.jobs.task_done()
+
+    def perform(self, scraper, job, download_dir, worker):
+        """Performs the given job and returns the scraper to use for the following jobs."""
+        report = self.reports[job.course_name]
+        if report.cancelled:
+            return scraper
+        with profiling.span(job.course_name, "course", course=job.course_name):
+            return self.perform_job(scraper, job, report, download_dir, worker)
+
+    def perform_job(self, scraper, job, report, download_dir, worker):
+        try:
+            if job.assignment_num is None:
+                self.add_missing_assignments(scraper, job)
+            elif not self.download(scraper, job):
+                report.cancelled = True
+            else:
+                with self.lock:
+                    report.downloaded.append(job.assignment_num)
+        except LoginException:
+            report.cancelled = True
+        except (TimeoutException, NoSuchElementException, NotFoundException):
+            # The assignment does not exist (yet).
+            pass
+        except Exception as e:
+            if scraper.is_alive():
+                self.report_error(job, e)
+                return scraper
+            # Firefox or geckodriver crashed, replace the worker's browser and try again.
+            try:
+                scraper.close()
+            except Exception:
+                pass
+            scraper = self.start_scraper(download_dir, worker)
+            job.attempts += 1
+            if scraper is not None and job.attempts < self.max_attempts:
+                self.jobs.put(job)
+            else:
+                self.report_error(job, e)
+        return scraper
+
+    def download(self, scraper, job):
+        """Downloads the assignment of the given job, directly into the staging directory of its course
+        if it is moved (see BaseScraper.staging).
+        """
+        with scraper.staging(job.course) if job.move else NullContext():
+            return scraper.download_default(job.course, job.assignment_num, job.move, job.rename_format)
+
+    def add_missing_assignments(self, scraper, job):
+        missing_assignments = sorted(scraper.list_assignments(job.course) - job.present_assignments)
+        for num in missing_assignments:
+            self.jobs.put(Job(job.course_name, job.course, num, job.move, job.rename_format))
+
+    def report_error(self, job, error):
+        with self.lock:
+            self.reports[job.course_name].errors.append(
+                "Error while downloading {} assignment {}: {}".format(
+                    job.course_name.upper(), job.assignment_num, error
+                )
+            )
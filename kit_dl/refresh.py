@@ -0,0 +1,92 @@
+import os
+import time
+
+from kit_dl.core import LOGIN_FAILED_MSG, NotFoundException
+from kit_dl.manifest import file_hash
+from kit_dl.misc.streaming import ResumableDownload
+
+
+class Refresher:
+    """Downloads assignments again which have been changed online after they have been downloaded,
+    e.g. because the lecturer uploaded a corrected version under the same name.
+
+    For every assignment recorded in the manifest, a conditional request is sent to its source url
+    using the ETag and Last-Modified validators of the previous download. If the server does not
+    answer with 304 Not Modified, the transferred file is compared to the stored hash instead.
+    Changed assignments replace the previous version, which is kept in the "previous"
+    subdirectory of the course directory.
+    """
+
+    previous_dir = "previous"
+    # Prefix of the new version of an assignment while it is downloaded.
+    tmp_prefix = ".kit-dl-refresh-"
+
+    def __init__(self, scraper, manifest):
+        self.scraper = scraper
+        self.manifest = manifest
+
+    def refresh(self, courses):
+        """Refreshes the given courses, a list of (course_name, course) tuples."""
+        if any("link" not in course for _, course in courses) and not self.scraper.on_ilias_page():
+            if not self.scraper.login():
+                print(LOGIN_FAILED_MSG)
+                courses = [(name, course) for name, course in courses if "link" in course]
+        for name, course in courses:
+            self.refresh_course(name, course)
+
+    def refresh_course(self, course_name, course):
+        assignments = self.manifest.downloaded_assignments(course["name"])
+        if not assignments:
+            print("Refreshing {}: no downloaded assignments.".format(course_name.upper()))
+            return
+        changed = []
+        for num, url, path, sha256, etag, last_modified in assignments:
+            try:
+                if self.refresh_assignment(course, num, url, path, sha256, etag, last_modified):
+                    changed.append(num)
+            except (IOError, NotFoundException) as e:
+                print("Error while refreshing {} assignment {}: {}".format(course_name.upper(), num, e))
+        if changed:
+            nums = ", ".join(str(num) for num in changed)
+            print("Refreshing {}: {} changed, done.".format(course_name.upper(), nums))
+        else:
+            print("Refreshing {}: no changes.".format(course_name.upper()))
+
+    def refresh_assignment(self, course, num, url, path, sha256, etag, last_modified):
+        """Downloads the given assignment again if it has been changed and returns whether it did.
+
+        :raises NotFoundException: If the assignment is no longer available.
+        """
+        # Downloaded next to the assignment, so that it can replace it atomically.
+        tmp_path = os.path.join(os.path.dirname(path), self.tmp_prefix + os.path.basename(path))
+        download = ResumableDownload(
+            self.scraper.session, url, tmp_path, self.scraper.timeout, etag=etag, last_modified=last_modified
+        )
+        download.run()
+        if not download.modified:
+            return False
+        new_sha256 = file_hash(tmp_path)
+        if sha256 is None and os.path.isfile(path):
+            sha256 = file_hash(path)
+        if new_sha256 == sha256:
+            os.remove(tmp_path)
+            self.manifest.update_version(
+                course["name"], num, download.size, sha256, download.etag, download.last_modified
+            )
+            return False
+        self.keep_previous_version(path)
+        os.replace(tmp_path, path)
+        self.manifest.update_version(
+            course["name"], num, download.size, new_sha256, download.etag, download.last_modified
+        )
+        return True
+
+    def keep_previous_version(self, path):
+        """Moves the given file to the previous directory, adding its modification date to the name."""
+        if not os.path.isfile(path):
+            return
+        previous_dir = os.path.join(os.path.dirname(path), self.previous_dir)
+        os.makedirs(previous_dir, exist_ok=True)
+        name, extension = os.path.splitext(os.path.basename(path))
+        date = time.strftime("%Y-%m-%d_%H%M%S", time.localtime(os.path.getmtime(path)))
+        os.replace(path, os.path.join(previous_dir, "{}_{}{}".format(name, date, extension)))
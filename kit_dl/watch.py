@@ -0,0 +1,116 @@
+import contextlib
+import hashlib
+import time
+
+from selenium.common.exceptions import TimeoutException
+
+from kit_dl.core import LoginException, NotFoundException
+
+# Factor the polling interval of a course is multiplied with whenever its folder has not changed.
+BACKOFF = 2
+
+
+def listing_hash(names):
+    """Returns a hash of the given link names which does not depend on their order."""
+    return hashlib.sha256("\n".join(sorted(names)).encode("utf-8")).hexdigest()
+
+
+def format_interval(seconds):
+    if seconds < 60 * 60:
+        return "{} min".format(round(seconds / 60))
+    return "{:g} h".format(round(seconds / (60 * 60), 1))
+
+
+class CourseState:
+    def __init__(self, interval):
+        self.listing_hash = None
+        self.interval = interval
+        self.next_poll = 0.0
+
+
+class Watcher:
+    """Polls the assignment folders of the given courses and downloads new assignments.
+
+    Each poll lists the folder of a course once and hashes the names of its links. Only if the
+    hash differs from the previous poll, the available assignments are compared to the latest
+    local ones (see update_directory) and the missing ones are downloaded. The hash is only stored
+    once all available assignments are present locally, so failed downloads are retried with the
+    next poll. Courses whose folder has not changed are polled less and less often, their interval
+    is multiplied by BACKOFF up to max_interval (e.g. outside the lecture period) and reset to
+    min_interval once they change.
+
+    If a poll fails (e.g. because the session expired), the scraper is replaced by a new one.
+
+    :param create_scraper: Function creating a new scraper, called again after a failed poll.
+    :param courses: A list of (course_name, course) tuples.
+    :param min_interval: Seconds between two polls of a course which has just changed.
+    :param max_interval: Maximum seconds between two polls of a course.
+    """
+
+    def __init__(self, create_scraper, courses, min_interval=5 * 60, max_interval=6 * 60 * 60, verbose=False):
+        self.create_scraper = create_scraper
+        self.courses = courses
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.verbose = verbose
+        self.scraper = None
+        self.states = {name: CourseState(min_interval) for name, _ in courses}
+
+    def run(self):
+        """Polls the courses until interrupted."""
+        try:
+            while True:
+                self.poll_due()
+                time.sleep(max(0.0, self.next_poll() - time.monotonic()))
+        finally:
+            self.close()
+
+    def close(self):
+        scraper, self.scraper = self.scraper, None
+        if scraper is not None:
+            scraper.close()
+
+    def next_poll(self):
+        return min(state.next_poll for state in self.states.values())
+
+    def poll_due(self):
+        """Polls all courses whose interval has passed."""
+        for name, course in self.courses:
+            state = self.states[name]
+            if state.next_poll <= time.monotonic():
+                self.poll(name, course, state)
+
+    def poll(self, course_name, course, state):
+        """Lists the folder of the given course and updates its directory if the folder has changed."""
+        if self.scraper is None:
+            self.scraper = self.create_scraper()
+        try:
+            names = self.scraper.list_links(course)
+        except (IOError, TimeoutException, NotFoundException, LoginException) as e:
+            print("Checking {} failed: {}".format(course_name.upper(), e))
+            with contextlib.suppress(Exception):
+                self.close()
+            self.back_off(state, changed=False)
+            return
+        digest = listing_hash(names)
+        changed = digest != state.listing_hash
+        if changed:
+            available = self.scraper.list_assignments(course, names)
+            self.scraper.update_directory(course, course_name, available)
+            # Failed downloads are only reported by update_directory, keep the previous hash
+            # in order to retry them with the next poll.
+            _, present_assignments = self.scraper.get_local_assignments(course)
+            if available <= present_assignments:
+                state.listing_hash = digest
+        self.back_off(state, changed)
+        if self.verbose and not changed:
+            print(
+                "No changes in {}, checking again in {}.".format(
+                    course_name.upper(), format_interval(state.interval)
+                )
+            )
+
+    def back_off(self, state, changed):
+        """Schedules the next poll of a course, resetting its interval if it has changed."""
+        state.interval = self.min_interval if changed else min(state.interval * BACKOFF, self.max_interval)
+        state.next_poll = time.monotonic() + state.interval
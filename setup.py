@@ -23,10 +23,10 @@ setup(
         "Intended Audience :: End Users/Desktop",
         "Topic :: Utilities",
     ],
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks"]),
     package_data={"": ["LICENSE", "config.yml", "geckodriver.exe"]},
     test_suite="tests",
     include_package_data=True,
-    install_requires=["click", "colorama", "ruamel.yaml>0.15", "selenium>=3"],
+    install_requires=["click", "colorama", "requests", "ruamel.yaml>0.15", "selenium>=3"],
     entry_points={"console_scripts": ["kit-dl=kit_dl.cli:cli"]},
 )
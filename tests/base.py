@@ -3,6 +3,7 @@ from pathlib import Path
 import shutil
 import unittest
 
+from requests.cookies import RequestsCookieJar
 from ruamel.yaml import YAML
 
 from kit_dl.dao import Dao
@@ -26,6 +27,89 @@ def create_yaml():
     return yaml
 
 
+class MockResponse:
+    def __init__(self, url, text="", content=b"", status_code=200, headers=None):
+        self.url = url
+        self.text = text
+        self.content = content if content else text.encode("utf-8")
+        self.status_code = status_code
+        self.headers = headers if headers else {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        pass
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise IOError("HTTP error {}".format(self.status_code))
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i : i + chunk_size]
+
+
+class MockSession:
+    """Replaces a requests.Session by returning predefined responses for each url."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+        self.cookies = RequestsCookieJar()
+
+    def respond(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        page = self.pages.get(url)
+        if page is None:
+            return MockResponse(url, status_code=404)
+        if isinstance(page, MockResponse):
+            return page
+        if isinstance(page, bytes):
+            return MockResponse(url, content=page)
+        return MockResponse(url, text=page)
+
+    def get(self, url, **kwargs):
+        return self.respond("get", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.respond("post", url, **kwargs)
+
+    def close(self):
+        pass
+
+
+class MockDriver:
+    """Replaces a selenium webdriver by serving predefined pages for each url.
+
+    Pages are either HTML or the url they redirect to (as a MockResponse), files (bytes)
+    are written to the download_dir when their url is loaded using window.location.assign.
+    """
+
+    def __init__(self, pages, download_dir=None):
+        self.pages = pages
+        self.download_dir = download_dir
+        self.requests = []
+        self.scripts = []
+        self.current_url = "about:blank"
+        self.page_source = ""
+
+    def get(self, url):
+        self.requests.append(url)
+        page = self.pages.get(url, "<html>404</html>")
+        if isinstance(page, MockResponse):
+            url, page = page.url, self.pages.get(page.url, page.text)
+        self.current_url = url
+        self.page_source = page
+
+    def execute_script(self, script, *args):
+        self.scripts.append((script, args))
+        if "location.assign" in script:
+            self.requests.append(args[0])
+            with open(os.path.join(self.download_dir, os.path.basename(args[0]) + ".pdf"), "wb") as file:
+                file.write(self.pages[args[0]])
+
+
 def delete_temp_folders():
     shutil.rmtree(os.path.join(os.path.dirname(__file__), "Downloads"), ignore_errors=True)
 
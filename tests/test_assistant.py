@@ -1,4 +1,6 @@
 import os
+import tempfile
+from unittest import mock
 
 from kit_dl.assistant import Assistant
 from tests.base import BaseUnitTest
@@ -10,27 +12,6 @@ class TestAssistant(BaseUnitTest):
         super().setUpClass()
         cls.assistant = Assistant(cls.yaml, cls.dao)
 
-    def test_same_folder_name_and_course_name(self):
-        folder_name = "Lineare Algebra 1"
-        course_name = "Lineare Algebra 1"
-        self.assertTrue(self.assistant.are_similar(folder_name, None, course_name))
-
-    def test_same_folder_name_and_course_name_except_folder_suffix(self):
-        folder_name = "Lineare Algebra I"
-        course_name = "Lineare Algebra 1"
-        self.assertTrue(self.assistant.are_similar(folder_name, None, course_name))
-
-    def test_same_folder_name_and_course_name_except_course_suffix(self):
-        folder_name = "Lineare Algebra 1"
-        course_name = "Lineare Algebra I"
-        self.assertTrue(self.assistant.are_similar(folder_name, None, course_name))
-
-    def test_same_folder_name_and_course_key(self):
-        folder_name = "LA"
-        course_key = "la"
-        course_name = "Doesn't matter"
-        self.assertTrue(self.assistant.are_similar(folder_name, course_key, course_name))
-
     def test_assignments_sub_folder(self):
         folder_name = "Course Folder"
         sub_folders = ["Some subfolder", "/!\\ 234", "_doesnt__matter", "Übungen"]
@@ -90,3 +71,49 @@ class TestAssistant(BaseUnitTest):
         expected_course_name = self.full_course_name("gbi").replace("/", "-")
         expected_gbi_folder = os.path.join(self.root_path, "Downloads", expected_course_name)
         self.assertTrue(os.path.exists(expected_gbi_folder))
+
+    def test_detect_course_folders_in_semester_folders(self):
+        with tempfile.TemporaryDirectory() as root_path:
+            for path in (
+                ("WS18", "Lineare Algebra I", "Übungsblätter"),
+                ("WS18", "Programmieren", "Vorlesung", "Lineare Algebra 1"),
+                ("Programmieren",),
+                ("Fotos", "Urlaub", "Höhere Mathematik 1"),
+                (".git", "Programmieren"),
+            ):
+                os.makedirs(os.path.join(root_path, *path))
+            with mock.patch.object(self.assistant, "echo") as echo:
+                self.assertEqual(
+                    [
+                        {
+                            "course_key": "la",
+                            "folder_name": os.path.join("WS18", "Lineare Algebra I", "Übungsblätter"),
+                        }
+                    ],
+                    self.assistant.detected_assignment_folders(root_path, depth=2),
+                )
+            # Programmieren of both semesters matches, neither of them is picked.
+            echo.assert_called_once_with(
+                "Several folders match PRG (Programmieren, {}), choose one manually.".format(
+                    os.path.join("WS18", "Programmieren")
+                )
+            )
+            self.assertEqual(
+                [{"course_key": "prg", "folder_name": "Programmieren"}],
+                self.assistant.detected_assignment_folders(root_path, depth=1),
+            )
+
+    def test_folder_matching_several_courses_is_reported(self):
+        with tempfile.TemporaryDirectory() as root_path:
+            os.makedirs(os.path.join(root_path, "Lineare Algebra"))
+            self.assistant.dao.config_data["la2"] = {"name": "Lineare Algebra 2"}
+            self.assistant.index = None
+            try:
+                with mock.patch.object(self.assistant, "echo") as echo:
+                    self.assertEqual([], self.assistant.detected_assignment_folders(root_path, depth=1))
+            finally:
+                del self.assistant.dao.config_data["la2"]
+                self.assistant.index = None
+            echo.assert_called_once_with(
+                "'Lineare Algebra' matches several courses (LA, LA2), choose its course manually."
+            )
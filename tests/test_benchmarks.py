@@ -0,0 +1,30 @@
+import requests
+
+from benchmarks.mock_ilias import MockIlias
+from benchmarks.run import Benchmark, PHASES, run_benchmark
+from kit_dl import cli
+from tests.base import BaseUnitTest
+
+
+class TestBenchmarks(BaseUnitTest):
+    def test_update_downloads_all_assignments_of_mock_ilias(self):
+        result = run_benchmark("update", {"courses": 2, "sheets": 3, "pdf_size": 1024}, "http", "cli_update")
+        self.assertEqual(6, result["files"])
+        self.assertEqual(set(PHASES), set(result["phases"]))
+        self.assertEqual(6, result["calls"]["download"])
+
+    def test_up_to_date_update_does_not_download(self):
+        result = run_benchmark("update", {"courses": 1, "sheets": 2}, "http", "update_directory", repeat=True)
+        self.assertEqual(0, result["calls"]["download"])
+        self.assertEqual(2, result["files"])
+
+    def test_mock_ilias_requires_login(self):
+        with MockIlias(courses=1, sheets=1) as server:
+            response = requests.get(server.url + "/goto.php?target=file_1_1_download")
+            self.assertEqual(server.main_page, response.url)
+
+    def test_benchmark_does_not_use_files_of_user(self):
+        with MockIlias(courses=1, sheets=1) as server, Benchmark(server, "http") as benchmark:
+            for path in (cli.daemon_socket_path, cli.cache_dir, cli.profiles_dir, cli.session_path):
+                self.assertTrue(path.startswith(benchmark.app_dir))
+        self.assertFalse(cli.daemon_socket_path.startswith(benchmark.app_dir))
@@ -0,0 +1,66 @@
+import os
+import stat
+import tempfile
+
+from kit_dl.cache import SessionCache, UrlCache
+from kit_dl.client import HttpScraper
+from tests.base import BaseUnitTest, MockResponse, MockSession
+
+HOME = "https://ilias.studium.kit.edu/ilias.php?baseClass=ilDashboardGUI"
+COOKIE = {"name": "PHPSESSID", "value": "abc", "domain": "ilias.studium.kit.edu", "path": "/", "secure": True}
+
+
+class TestCache(BaseUnitTest):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = SessionCache(os.path.join(self.temp_dir.name, "session.json"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_saved_session_can_be_loaded(self):
+        self.cache.save("user", HOME, [COOKIE])
+        session = self.cache.load("user")
+        self.assertEqual(HOME, session["home"])
+        self.assertEqual([COOKIE], session["cookies"])
+
+    def test_session_of_different_user_should_not_be_loaded(self):
+        self.cache.save("user", HOME, [COOKIE])
+        self.assertIsNone(self.cache.load("other user"))
+
+    def test_expired_session_should_not_be_loaded(self):
+        self.cache.max_age = -1
+        self.cache.save("user", HOME, [COOKIE])
+        self.assertIsNone(self.cache.load("user"))
+
+    def test_session_file_only_accessible_by_user(self):
+        self.cache.save("user", HOME, [COOKIE])
+        if os.name == "posix":
+            self.assertEqual(0o600, stat.S_IMODE(os.stat(self.cache.path).st_mode))
+
+    def test_valid_session_should_skip_login(self):
+        self.cache.save(self.dao.user_data["user_name"], HOME, [COOKIE])
+        session = MockSession({HOME: "<html>Dashboard</html>"})
+        scraper = HttpScraper(session, self.dao, False, self.cache)
+        self.assertTrue(scraper.login())
+        self.assertEqual([("get", HOME)], [request[:2] for request in session.requests])
+        self.assertEqual("abc", session.cookies["PHPSESSID"])
+
+    def test_stale_session_should_be_cleared(self):
+        self.cache.save(self.dao.user_data["user_name"], HOME, [COOKIE])
+        # Ilias redirects to the login page if the session has expired.
+        session = MockSession({HOME: MockResponse(HttpScraper.main_page, text="<html>Login</html>")})
+        scraper = HttpScraper(session, self.dao, False, self.cache)
+        self.assertFalse(scraper.resume_session())
+        self.assertIsNone(self.cache.read())
+
+    def test_cached_urls_are_persisted(self):
+        course = self.dao.config_data["prg"]
+        cache = UrlCache(os.path.join(self.temp_dir.name, "urls.json"))
+        cache.put(course, None, HOME + "&ref_id=1")
+        cache.put(course, "Übungsblatt 1", HOME + "&ref_id=2")
+        cache = UrlCache(cache.path)
+        self.assertEqual(HOME + "&ref_id=1", cache.get(course))
+        self.assertEqual(HOME + "&ref_id=2", cache.get(course, "Übungsblatt 1"))
+        cache.remove(course)
+        self.assertIsNone(UrlCache(cache.path).get(course))
@@ -0,0 +1,38 @@
+from kit_dl.misc.catalog import CourseIndex, normalize_name
+from tests.base import BaseUnitTest
+
+COURSES = {
+    "la": {"name": "Lineare Algebra 1"},
+    "la2": {"name": "Lineare Algebra II"},
+    "hm": {"name": "Höhere Mathematik 1"},
+    "gbi": {"name": "Grundbegriffe der Informatik (2018/2019)"},
+}
+
+
+class TestCatalog(BaseUnitTest):
+    def setUp(self):
+        self.index = CourseIndex(COURSES)
+
+    def test_normalize_name(self):
+        self.assertEqual("hoehere mathematik 2 ws 18 19", normalize_name("Höhere Mathematik II (WS 18/19)"))
+        self.assertEqual("uebungen", normalize_name("  ÜBUNGEN!"))
+
+    def test_match_course_key(self):
+        self.assertEqual("gbi", self.index.match("GBI"))
+
+    def test_match_roman_numerals_and_umlauts(self):
+        self.assertEqual("la", self.index.match("Lineare Algebra I"))
+        self.assertEqual("la2", self.index.match("lineare-algebra-2"))
+        self.assertEqual("hm", self.index.match("Hoehere Mathematik I"))
+
+    def test_match_prefixes(self):
+        self.assertEqual("gbi", self.index.match("Grundbegriffe der Informatik"))
+        self.assertEqual("hm", self.index.match("Höhere Mathematik 1 - Skript"))
+
+    def test_ambiguous_folder_is_not_matched(self):
+        self.assertEqual(["la", "la2"], self.index.matches("Lineare Algebra"))
+        self.assertIsNone(self.index.match("Lineare Algebra"))
+
+    def test_no_match(self):
+        self.assertIsNone(self.index.match("Urlaubsfotos"))
+        self.assertIsNone(self.index.match("!!!"))
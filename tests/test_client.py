@@ -0,0 +1,213 @@
+import os
+import tempfile
+from unittest import mock
+
+from kit_dl.cache import UrlCache
+from kit_dl.client import HttpScraper
+from kit_dl.core import NotFoundException
+from kit_dl.misc.page import Page
+from tests.base import BaseUnitTest, MockResponse, MockSession
+
+ILIAS = "https://ilias.studium.kit.edu/"
+
+
+def ilias_page(**links):
+    """Creates an ilias page containing a container link for each given link text and ref_id."""
+    return "<html><body>{}</body></html>".format(
+        "".join(
+            '<div><a class="il_ContainerItemTitle" href="ilias.php?ref_id={}">{}</a></div>'.format(
+                ref_id, name
+            )
+            for name, ref_id in links.items()
+        )
+    )
+
+
+class TestClient(BaseUnitTest):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.dao.user_data["destination"]["root_path"] = cls.temp_dir.name
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def create_scraper(self, pages, url_cache=None):
+        scraper = HttpScraper(MockSession(pages), self.dao, False, url_cache=url_cache)
+        home_page = ilias_page(**{"Lineare Algebra 1": 1})
+        scraper.home_page = Page(home_page, ILIAS + "ilias.php?baseClass=ilDashboardGUI")
+        return scraper
+
+    def test_page_resolves_container_links(self):
+        page = Page(ilias_page(Skript=1, Übungen=2), ILIAS + "goto.php")
+        self.assertEqual(ILIAS + "ilias.php?ref_id=2", page.link("Übungen", "il_ContainerItemTitle"))
+        self.assertIsNone(page.link("Übungen", "other_class"))
+
+    def test_page_normalizes_link_text(self):
+        page = Page('<a href="/a.pdf">\n  Blatt   1 </a>', "http://www.math.kit.edu/hm/")
+        self.assertEqual("http://www.math.kit.edu/a.pdf", page.link("Blatt 1"))
+
+    def test_form_values_exclude_submit_buttons(self):
+        page = Page(
+            '<form method="POST" action="/login"><input type="hidden" name="token" value="abc">'
+            '<input id="name" name="j_username"><button name="submit">Login</button></form>',
+            "https://idp.scc.kit.edu/",
+        )
+        form = page.form_of("name")
+        self.assertEqual("post", form.method)
+        self.assertEqual({"token": "abc", "j_username": ""}, form.values())
+
+    def test_download_follows_course_folder_and_assignment(self):
+        scraper = self.create_scraper(
+            {
+                ILIAS + "ilias.php?ref_id=1": ilias_page(Übungen=2),
+                ILIAS + "ilias.php?ref_id=2": ilias_page(Skript=3, Blatt01=4),
+                ILIAS + "ilias.php?ref_id=4": b"%PDF-1.4",
+            }
+        )
+        course = self.dao.config_data["la"]
+        self.assertEqual("Blatt01", scraper.download(course, 1))
+        with open(os.path.join(self.temp_dir.name, "Blatt01.pdf"), "rb") as file:
+            self.assertEqual(b"%PDF-1.4", file.read())
+
+    def test_cached_folder_url_skips_navigation(self):
+        url_cache = UrlCache(os.path.join(self.temp_dir.name, "urls.json"))
+        course = self.dao.config_data["la"]
+        url_cache.put(course, None, ILIAS + "ilias.php?ref_id=2")
+        scraper = self.create_scraper(
+            {
+                ILIAS + "ilias.php?ref_id=2": ilias_page(Blatt02=5),
+                ILIAS + "ilias.php?ref_id=5": b"%PDF",
+            },
+            url_cache,
+        )
+        scraper.download(course, 2)
+        self.assertEqual(
+            [ILIAS + "ilias.php?ref_id=2", ILIAS + "ilias.php?ref_id=5"],
+            [url for _, url, _ in scraper.session.requests],
+        )
+
+    def test_redirected_folder_url_should_be_replaced(self):
+        url_cache = UrlCache(os.path.join(self.temp_dir.name, "urls.json"))
+        course = self.dao.config_data["la"]
+        url_cache.put(course, None, ILIAS + "ilias.php?ref_id=9")
+        scraper = self.create_scraper(
+            {
+                ILIAS + "ilias.php?ref_id=9": MockResponse(ILIAS + "ilias.php?baseClass=ilDashboardGUI"),
+                ILIAS + "ilias.php?ref_id=1": ilias_page(Übungen=2),
+                ILIAS + "ilias.php?ref_id=2": ilias_page(Blatt03=6),
+                ILIAS + "ilias.php?ref_id=6": b"%PDF",
+            },
+            url_cache,
+        )
+        scraper.download(course, 3)
+        self.assertEqual(ILIAS + "ilias.php?ref_id=2", url_cache.get(course))
+
+    def test_missing_assignment_should_raise_not_found(self):
+        scraper = self.create_scraper(
+            {
+                ILIAS + "ilias.php?ref_id=1": ilias_page(Übungen=2),
+                ILIAS + "ilias.php?ref_id=2": ilias_page(Blatt01=4),
+            }
+        )
+        with self.assertRaises(NotFoundException):
+            scraper.download(self.dao.config_data["la"], 2)
+
+    def test_download_from_external_link_uses_file_format(self):
+        course = self.dao.config_data["hm"]
+        scraper = self.create_scraper(
+            {
+                course["link"]: '<a href="blatt3.pdf">Blatt 3</a>',
+                "http://www.math.kit.edu/iana2/edu/hm1info2018w/blatt3.pdf": b"%PDF",
+            }
+        )
+        self.assertEqual("Blatt 3", scraper.download_from(course, 3))
+        self.assertTrue(os.path.isfile(os.path.join(self.temp_dir.name, "blatt3.pdf")))
+
+    def test_login_submits_credentials_and_saml_response(self):
+        session = MockSession(
+            {
+                HttpScraper.main_page: '<a id="f807" href="/shib_login.php">KIT-Account</a>',
+                ILIAS + "shib_login.php": '<form method="post" action="https://idp.scc.kit.edu/sso">'
+                '<input id="name" name="j_username"><input id="password" name="j_password"></form>',
+                "https://idp.scc.kit.edu/sso": '<form method="post" action="https://ilias.studium.kit.edu/saml">'
+                '<input type="hidden" name="SAMLResponse" value="xyz"></form>',
+                ILIAS + "saml": ilias_page(**{"Lineare Algebra 1": 1}),
+            }
+        )
+        scraper = HttpScraper(session, self.dao, False)
+        self.assertTrue(scraper.to_home())
+        self.assertTrue(scraper.on_ilias_page())
+        _, _, credentials = session.requests[2]
+        self.assertEqual(self.dao.user_data["password"], credentials["data"]["j_password"])
+        _, _, saml = session.requests[3]
+        self.assertEqual({"SAMLResponse": "xyz"}, saml["data"])
+
+    def test_login_submits_named_submit_button(self):
+        session = MockSession(
+            {
+                HttpScraper.main_page: '<a id="f807" href="/shib_login.php">KIT-Account</a>',
+                ILIAS + "shib_login.php": '<form method="post" action="https://idp.scc.kit.edu/sso">'
+                '<input id="name" name="j_username"><input id="password" name="j_password">'
+                '<button name="_eventId_proceed">Anmelden</button>'
+                '<button name="_eventId_cancel">Abbrechen</button>'
+                "</form>",
+                "https://idp.scc.kit.edu/sso": ilias_page(**{"Lineare Algebra 1": 1}),
+            }
+        )
+        scraper = HttpScraper(session, self.dao, False)
+        self.assertTrue(scraper.to_home())
+        _, _, credentials = session.requests[2]
+        self.assertEqual("", credentials["data"]["_eventId_proceed"])
+        self.assertNotIn("_eventId_cancel", credentials["data"])
+
+    def test_login_form_without_user_field_should_raise_not_found(self):
+        session = MockSession(
+            {
+                HttpScraper.main_page: '<a id="f807" href="/shib_login.php">KIT-Account</a>',
+                ILIAS + "shib_login.php": '<form method="post" action="https://idp.scc.kit.edu/sso">'
+                '<input id="username" name="j_username"><input id="password" name="j_password"></form>',
+            }
+        )
+        with self.assertRaises(NotFoundException):
+            HttpScraper(session, self.dao, False).to_home()
+
+    @mock.patch("builtins.print")
+    def test_transfer_rate_is_only_printed_in_verbose_mode(self, mock_print):
+        download = mock.Mock(url=ILIAS + "blatt01.pdf", size=2048, etag='"v1"', last_modified=None)
+        download.bytes_per_second.return_value = 1024
+        scraper = self.create_scraper({})
+        scraper.finish_download(download)
+        mock_print.assert_not_called()
+        self.assertEqual((ILIAS + "blatt01.pdf", ('"v1"', None)), (scraper.source_url, scraper.source_validators))
+        scraper.verbose = True
+        scraper.finish_download(download)
+        mock_print.assert_called_once_with("\nDownloaded 2 KiB at 1.0 KiB/s")
+
+    def test_list_assignments_reads_folder_once(self):
+        scraper = self.create_scraper(
+            {
+                ILIAS + "ilias.php?ref_id=1": ilias_page(Übungen=2),
+                ILIAS + "ilias.php?ref_id=2": ilias_page(Blatt01=3, Blatt02=4, Blatt04=5, Lösung01=6),
+            }
+        )
+        self.assertEqual({1, 2, 4}, scraper.list_assignments(self.dao.config_data["la"]))
+        self.assertEqual(2, len(scraper.session.requests))
+
+    def test_list_assignments_of_listed_names(self):
+        scraper = self.create_scraper({})
+        names = ["Blatt01", "Blatt03", "Lösung01"]
+        self.assertEqual({1, 3}, scraper.list_assignments(self.dao.config_data["la"], names))
+        self.assertEqual(0, len(scraper.session.requests))
+
+    def test_list_assignments_of_optional_path(self):
+        scraper = self.create_scraper(
+            {
+                ILIAS + "ilias.php?ref_id=1": ilias_page(Übungen=2),
+                ILIAS + "ilias.php?ref_id=2": ilias_page(**{"Übungsblatt 1": 3, "Übungsblatt 2": 4}),
+            }
+        )
+        scraper.home_page = Page(ilias_page(Programmieren=1), ILIAS)
+        self.assertEqual({1, 2}, scraper.list_assignments(self.dao.config_data["prg"]))
@@ -1,5 +1,19 @@
-from kit_dl.core import Scraper
-from tests.base import BaseUnitTest
+import os
+import tempfile
+from unittest import mock
+
+import requests
+
+from kit_dl.core import BaseScraper, NotFoundException, Scraper
+from kit_dl.misc.page import Page
+from tests.base import BaseUnitTest, MockDriver
+
+ILIAS = "https://ilias.studium.kit.edu/"
+
+
+def ilias_page(*names):
+    """Creates an ilias page containing a container link to ILIAS + name for each given name."""
+    return "".join('<a class="il_ContainerItemTitle" href="{0}">{0}</a>'.format(name) for name in names)
 
 
 class TestCore(BaseUnitTest):
@@ -32,6 +46,14 @@ class TestCore(BaseUnitTest):
         assignment_files = ["Blatt-05.pdf", "Blatt-10.pdf"]
         self.assertEqual(10, self.scraper.get_latest_assignment(assignment_files, "Blatt-$$"))
 
+    def test_find_latest_assignment_with_zero(self):
+        assignment_files = ["Blatt01.pdf", "Blatt10.pdf", "Blatt20.pdf"]
+        self.assertEqual(20, self.scraper.get_latest_assignment(assignment_files, "Blatt$$"))
+
+    def test_detect_format_of_most_files(self):
+        assignment_files = ["notes2.txt", "Blatt 1.pdf", "Blatt 2.pdf", "Blatt 10.pdf"]
+        self.assertEqual("Blatt $", self.scraper.detect_format(assignment_files))
+
     def test_on_start_update_latest_assignment_found(self):
         actual = self.scraper.get_on_start_update_msg("la", 9, "Blatt$$")
         self.assertEqual("Updating LA assignments, latest: Blatt09.pdf", actual)
@@ -43,3 +65,240 @@ class TestCore(BaseUnitTest):
     def test_on_start_update_latest_assignment_not_found_zero(self):
         actual = self.scraper.get_on_start_update_msg("la", 0, "Blatt$$")
         self.assertEqual("No assignments found in LA directory, starting at 1.", actual)
+
+    def test_parse_assignment_num(self):
+        self.assertEqual(10, self.scraper.parse_assignment_num("Blatt$$", "Blatt10"))
+        self.assertEqual(3, self.scraper.parse_assignment_num("$$-aufgaben", "03-aufgaben"))
+        self.assertEqual(1, self.scraper.parse_assignment_num("Übungsblatt $", "Übungsblatt 1"))
+
+    def test_parse_assignment_num_not_matching_format(self):
+        self.assertIsNone(self.scraper.parse_assignment_num("Blatt$$", "Blatt1"))
+        self.assertIsNone(self.scraper.parse_assignment_num("Blatt$$", "Lösung01"))
+        self.assertIsNone(self.scraper.parse_assignment_num("Skript", "Skript"))
+
+    def test_present_assignments_include_gaps(self):
+        assignment_files = ["Blatt01.pdf", "Blatt03.pdf", "Blatt10.pdf", "notes.txt"]
+        self.assertEqual({1, 3, 10}, self.scraper.get_present_assignments(assignment_files, "Blatt$$"))
+
+    def test_group_by_folder(self):
+        course = {"name": "Programmieren", "assignment": {"link_format": "Übungsblatt $/assignment$$"}}
+        self.assertEqual(
+            [("Übungsblatt 2", [2]), ("Übungsblatt 1", [1])], self.scraper.group_by_folder(course, [2, 1])
+        )
+        course["assignment"]["link_format"] = "Blätter/Blatt$$"
+        self.assertEqual([("Blätter", [3, 1, 2])], self.scraper.group_by_folder(course, [3, 1, 2]))
+        self.assertEqual([(None, [1, 2])], self.scraper.group_by_folder(self.dao.config_data["la"], [1, 2]))
+
+
+class TestStaging(BaseUnitTest):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root_path = self.dao.user_data["destination"]["root_path"]
+        self.dao.user_data["destination"]["root_path"] = self.temp_dir.name
+        os.makedirs(os.path.join(self.temp_dir.name, "LA"))
+        self.course = dict(self.dao.config_data["la"], path="LA")
+        self.scraper = BaseScraper(self.dao, False)
+
+    def tearDown(self):
+        self.dao.user_data["destination"]["root_path"] = self.root_path
+        self.temp_dir.cleanup()
+
+    def download(self, file_name):
+        with open(os.path.join(self.scraper.get_download_dir(), file_name), "wb") as file:
+            file.write(b"%PDF")
+
+    def staging_dirs(self):
+        course_dir = os.path.join(self.temp_dir.name, "LA")
+        return sorted(name for name in os.listdir(course_dir) if name.startswith(BaseScraper.staging_name))
+
+    def test_downloads_to_staging_dir_of_course(self):
+        staging_dir = os.path.join(self.temp_dir.name, "LA", BaseScraper.staging_name)
+        with self.scraper.staging(self.course):
+            self.assertEqual(staging_dir, self.scraper.get_download_dir())
+            self.download("Blatt01.pdf")
+            dst_file = self.scraper.move_and_rename("Blatt01", self.course, 1, "Blatt_$$")
+        self.assertEqual(os.path.join(self.temp_dir.name, "LA", "Blatt_01.pdf"), dst_file)
+        self.assertTrue(os.path.isfile(dst_file))
+        self.assertFalse(os.path.exists(staging_dir))
+        self.assertEqual(self.temp_dir.name, self.scraper.get_download_dir())
+
+    def test_staging_dir_is_only_created_when_downloading(self):
+        with self.scraper.staging(self.course):
+            self.assertEqual([], self.staging_dirs())
+        self.assertEqual([], self.staging_dirs())
+
+    def test_resumable_download_is_kept_for_next_run(self):
+        with self.scraper.staging(self.course):
+            self.download("Blatt01.pdf.part")
+            self.download("Blatt01.pdf.part.json")
+        with self.scraper.staging(self.course):
+            staging_dir = self.scraper.get_download_dir()
+            self.assertTrue(os.path.isfile(os.path.join(staging_dir, "Blatt01.pdf.part")))
+
+    def test_incomplete_download_of_browser_is_removed(self):
+        with self.scraper.staging(self.course):
+            self.download("Blatt01.pdf.part")
+        self.assertEqual([], self.staging_dirs())
+
+    def test_stale_staging_dirs_are_swept(self):
+        course_dir = os.path.join(self.temp_dir.name, "LA")
+        os.makedirs(os.path.join(course_dir, BaseScraper.staging_name + "-1"))
+        resumable_dir = os.path.join(course_dir, BaseScraper.staging_name + "-2")
+        os.makedirs(resumable_dir)
+        for name in ("Blatt02.pdf.part", "Blatt02.pdf.part.json"):
+            open(os.path.join(resumable_dir, name), "wb").close()
+        with self.scraper.staging(self.course):
+            pass
+        self.assertEqual([BaseScraper.staging_name + "-2"], self.staging_dirs())
+
+    def test_scrapers_downloading_the_same_course_use_separate_staging_dirs(self):
+        other = BaseScraper(self.dao, False)
+        other.staging_suffix = "-1"
+        with self.scraper.staging(self.course), other.staging(self.course):
+            self.assertNotEqual(self.scraper.get_download_dir(), other.get_download_dir())
+            # Staging directories in use are never swept.
+            with BaseScraper(self.dao, False).staging(self.course):
+                self.assertEqual(2, len(self.staging_dirs()))
+
+    def test_staging_dir_is_ignored_by_scan(self):
+        with self.scraper.staging(self.course):
+            self.download("Blatt01.pdf")
+            self.assertEqual(("Blatt$$", {}), self.scraper.scan_course_directory(self.course))
+
+    def test_falls_back_to_download_dir_if_engine_cannot_change_it(self):
+        self.scraper.use_download_dir = lambda directory: False
+        with self.scraper.staging(self.course):
+            self.assertEqual(self.temp_dir.name, self.scraper.get_download_dir())
+            self.download("Blatt01.pdf")
+            self.scraper.move_and_rename("Blatt01", self.course, 1, "Blatt$$")
+        self.assertTrue(os.path.isfile(os.path.join(self.temp_dir.name, "LA", "Blatt01.pdf")))
+        self.assertEqual([], self.staging_dirs())
+
+    def test_selenium_changes_download_dir_in_chrome_context(self):
+        driver = mock.MagicMock()
+        self.assertTrue(Scraper(driver, self.dao, False).use_download_dir("staging"))
+        driver.context.assert_called_once_with(driver.CONTEXT_CHROME)
+        self.assertEqual("staging", driver.execute_script.call_args[0][1])
+
+    def test_selenium_download_dir_cannot_be_changed(self):
+        driver = mock.MagicMock()
+        driver.execute_script.side_effect = Exception("chrome context not allowed")
+        self.assertFalse(Scraper(driver, self.dao, False).use_download_dir("staging"))
+
+
+class TestDownloadErrors(BaseUnitTest):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root_path = self.dao.user_data["destination"]["root_path"]
+        self.dao.user_data["destination"]["root_path"] = self.temp_dir.name
+        self.course = dict(self.dao.config_data["la"], path="")
+        self.scraper = BaseScraper(self.dao, False)
+
+    def tearDown(self):
+        self.dao.user_data["destination"]["root_path"] = self.root_path
+        self.temp_dir.cleanup()
+
+    @mock.patch("builtins.print")
+    def test_network_error_is_reported_with_url(self, mock_print):
+        error = requests.HTTPError("503 Server Error: Service Unavailable for url: " + ILIAS)
+        self.scraper.download_all = mock.Mock(side_effect=error)
+        self.scraper.get(self.course, "la", [1], True)
+        mock_print.assert_called_with("Network error: 503 Server Error: Service Unavailable for url: " + ILIAS)
+
+    @mock.patch("builtins.print")
+    def test_invalid_destination_is_reported(self, mock_print):
+        self.scraper.download_all = mock.Mock(side_effect=PermissionError("read-only"))
+        self.scraper.get(self.course, "la", [1], True)
+        mock_print.assert_called_with("Invalid destination path for this assignment!")
+
+
+class TestSeleniumNavigation(BaseUnitTest):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root_path = self.dao.user_data["destination"]["root_path"]
+        self.dao.user_data["destination"]["root_path"] = self.temp_dir.name
+        self.course = dict(self.dao.config_data["la"], path="")
+        self.driver = MockDriver(
+            {
+                ILIAS + "la": ilias_page("Skript", "Übungen"),
+                ILIAS + "Übungen": ilias_page("Blatt01", "Blatt02", "Blatt03", "Lösung01"),
+                ILIAS + "Blatt01": b"%PDF 1",
+                ILIAS + "Blatt02": b"%PDF 2",
+                ILIAS + "Blatt03": b"%PDF 3",
+            },
+            self.temp_dir.name,
+        )
+        self.driver.current_url = ILIAS + "ilias.php"
+        self.scraper = Scraper(self.driver, self.dao, False)
+        self.scraper.home_page = Page(
+            '<a class="il_ContainerItemTitle" href="la">Lineare Algebra 1</a>', ILIAS + "ilias.php"
+        )
+
+    def tearDown(self):
+        self.dao.user_data["destination"]["root_path"] = self.root_path
+        self.temp_dir.cleanup()
+
+    @mock.patch("builtins.print")
+    def test_range_loads_each_page_once(self, mock_print):
+        self.scraper.get(self.course, "la", range(1, 4), False)
+        self.assertEqual(
+            [ILIAS + "la", ILIAS + "Übungen", ILIAS + "Blatt01", ILIAS + "Blatt02", ILIAS + "Blatt03"],
+            self.driver.requests,
+        )
+        self.assertEqual(["Blatt01.pdf", "Blatt02.pdf", "Blatt03.pdf"], sorted(os.listdir(self.temp_dir.name)))
+        self.assertEqual(ILIAS + "Blatt03", self.scraper.source_url)
+
+    def test_folder_is_loaded_again_if_assignment_is_missing(self):
+        self.scraper.download(self.course, 1)
+        self.driver.pages[ILIAS + "Übungen"] = ilias_page("Blatt01", "Blatt04")
+        self.driver.pages[ILIAS + "Blatt04"] = b"%PDF 4"
+        self.scraper.download(self.course, 4)
+        self.assertEqual(2, self.driver.requests.count(ILIAS + "Übungen"))
+        self.assertTrue(os.path.isfile(os.path.join(self.temp_dir.name, "Blatt04.pdf")))
+
+    def test_list_folder_always_loads_folder(self):
+        self.assertEqual(["Blatt01", "Blatt02", "Blatt03", "Lösung01"], self.scraper.list_folder(self.course))
+        self.assertEqual({1, 2, 3}, self.scraper.list_assignments(self.course))
+        self.assertEqual(2, self.driver.requests.count(ILIAS + "Übungen"))
+
+    def test_login_fills_in_credentials_at_once(self):
+        self.driver.pages[Scraper.main_page] = '<a id="f807" href="/shib_login.php">KIT-Account</a>'
+        self.driver.pages[ILIAS + "shib_login.php"] = '<input id="name"><input id="password">'
+        with mock.patch("time.sleep"):
+            self.assertTrue(self.scraper.to_home())
+        self.assertEqual([Scraper.main_page, ILIAS + "shib_login.php"], self.driver.requests)
+        [(_, credentials)] = self.driver.scripts
+        self.assertEqual((self.dao.user_data["user_name"], self.dao.user_data["password"]), credentials)
+
+    def test_on_ilias_page_uses_configured_host(self):
+        self.assertTrue(self.scraper.on_ilias_page())
+        self.scraper.main_page = "https://ilias.example.org/login.php"
+        self.assertFalse(self.scraper.on_ilias_page())
+        self.driver.current_url = "https://ilias.example.org/ilias.php"
+        self.assertTrue(self.scraper.on_ilias_page())
+
+    def test_download_from_missing_external_assignment(self):
+        course = self.dao.config_data["hm"]
+        self.driver.pages[course["link"]] = '<a href="blatt1.pdf">Blatt 1</a>'
+        with self.assertRaises(NotFoundException):
+            self.scraper.download_from(course, 2)
+        self.assertEqual([], self.driver.scripts)
+
+    @mock.patch("builtins.print")
+    def test_optional_paths_start_at_parsed_folder(self, mock_print):
+        course = dict(self.dao.config_data["prg"], path="")
+        self.scraper.home_page = Page(ilias_page("Programmieren"), ILIAS + "ilias.php")
+        self.driver.pages.update(
+            {
+                ILIAS + "Programmieren": ilias_page("Übungen"),
+                ILIAS + "Übungen": ilias_page("Übungsblatt 1", "Übungsblatt 2"),
+                ILIAS + "Übungsblatt 1": ilias_page("assignment01"),
+                ILIAS + "Übungsblatt 2": ilias_page("assignment02"),
+                ILIAS + "assignment01": b"%PDF 1",
+                ILIAS + "assignment02": b"%PDF 2",
+            }
+        )
+        self.scraper.get(course, "prg", [1, 2], False)
+        self.assertEqual(1, self.driver.requests.count(ILIAS + "Übungen"))
+        self.assertEqual(["assignment01.pdf", "assignment02.pdf"], sorted(os.listdir(self.temp_dir.name)))
+        self.assertEqual({}, self.scraper.folders)
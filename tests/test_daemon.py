@@ -0,0 +1,136 @@
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from kit_dl.daemon import Daemon, DaemonClient, is_supported
+from tests.base import BaseUnitTest
+
+
+class MockScraper:
+    def __init__(self, engine):
+        self.engine = engine
+        self.verbose = False
+        self.closed = False
+        self.logins = 0
+
+    def login(self):
+        self.logins += 1
+        return True
+
+    def is_alive(self):
+        return not self.closed
+
+    def close(self):
+        self.closed = True
+
+
+@unittest.skipUnless(is_supported(), "Unix domain sockets are not supported.")
+class TestDaemon(BaseUnitTest):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.temp_dir.name, "daemon.sock")
+        self.created = []
+        self.jobs = []
+        self.daemon = Daemon(self.socket_path, self.create_scraper, self.execute, idle_timeout=10)
+        self.thread = threading.Thread(target=self.daemon.serve, daemon=True)
+        self.thread.start()
+        self.client = DaemonClient(self.socket_path)
+        while not self.client.is_running():
+            time.sleep(0.01)
+
+    def tearDown(self):
+        if self.thread.is_alive():
+            self.client.submit({"command": "stop"}, io.StringIO())
+        self.thread.join()
+        self.temp_dir.cleanup()
+
+    def create_scraper(self, engine, headless, verbose):
+        scraper = MockScraper(engine)
+        self.created.append(scraper)
+        return scraper
+
+    def execute(self, job, scraper):
+        self.jobs.append((job, scraper))
+        if job["command"] == "fail":
+            raise ValueError("broken")
+        print("Downloading", end="", flush=True)
+        print("\rDownloaded {}".format(job["command"]))
+
+    def submit(self, command, engine="http"):
+        output = io.StringIO()
+        result = self.client.submit(
+            {"command": command, "engine": engine, "headless": True, "verbose": True}, output
+        )
+        return result, output.getvalue()
+
+    def test_output_is_streamed_to_client(self):
+        result, output = self.submit("update")
+        self.assertTrue(result)
+        self.assertEqual("Downloading\rDownloaded update\n", output)
+
+    def test_scraper_is_reused_between_jobs(self):
+        self.submit("update")
+        self.submit("get")
+        self.assertEqual(1, len(self.created))
+        self.assertIs(self.jobs[0][1], self.jobs[1][1])
+        self.assertTrue(self.jobs[0][1].verbose)
+
+    def test_separate_scraper_per_engine(self):
+        self.submit("update")
+        self.submit("update", engine="selenium")
+        self.assertEqual(["http", "selenium"], [scraper.engine for scraper in self.created])
+
+    def test_scraper_is_replaced_after_error(self):
+        result, output = self.submit("fail")
+        self.assertFalse(result)
+        self.assertIn("ValueError: broken", output)
+        self.assertTrue(self.created[0].closed)
+        self.submit("update")
+        self.assertEqual(2, len(self.created))
+
+    def test_stale_scraper_is_replaced(self):
+        self.daemon.refresh_after = 0
+        self.submit("update")
+        time.sleep(0.01)
+        self.submit("update")
+        self.assertEqual(2, len(self.created))
+        self.assertTrue(self.created[0].closed)
+
+    def test_warm_up_logs_in(self):
+        self.assertTrue(self.daemon.warm_up("http", True))
+        self.submit("update")
+        self.assertEqual(1, len(self.created))
+        self.assertEqual(1, self.created[0].logins)
+
+    def test_stop_closes_scrapers_and_removes_socket(self):
+        self.submit("update")
+        self.assertTrue(self.client.submit({"command": "stop"}, io.StringIO()))
+        self.thread.join()
+        self.assertTrue(self.created[0].closed)
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_second_daemon_is_rejected(self):
+        with self.assertRaises(RuntimeError):
+            Daemon(self.socket_path, self.create_scraper, self.execute).serve()
+
+
+class TestDaemonClient(BaseUnitTest):
+    def test_returns_none_without_daemon(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = DaemonClient(os.path.join(temp_dir, "daemon.sock"))
+            self.assertIsNone(client.submit({"command": "update"}, io.StringIO()))
+            self.assertFalse(client.is_running())
+
+    @unittest.skipUnless(is_supported(), "Unix domain sockets are not supported.")
+    def test_returns_none_for_stale_socket(self):
+        import socket
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "daemon.sock")
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(path)
+            server.close()
+            self.assertIsNone(DaemonClient(path).submit({"command": "update"}, io.StringIO()))
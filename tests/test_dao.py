@@ -0,0 +1,47 @@
+import os
+import shutil
+import tempfile
+
+from kit_dl.dao import Dao, UnsafeDict
+from tests.base import BaseUnitTest
+
+
+class TestDao(BaseUnitTest):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.temp_dir.name, "config.yml")
+        shutil.copy(self.dao.config_yml_path, self.config_path)
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+        self.compiled_dao = Dao(None, self.dao.user_yml_path, self.config_path, self.yaml, self.cache_dir)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_compiled_data_equals_parsed_data(self):
+        self.dao.load_data()
+        self.compiled_dao.load_data(compiled=True)
+        self.assertEqual(self.dao.config_data, self.compiled_dao.config_data)
+        self.assertEqual(self.dao.user_data, self.compiled_dao.user_data)
+        self.assertIs(dict, type(self.compiled_dao.config_data["la"]["assignment"]))
+        self.assertIs(str, type(self.compiled_dao.config_data["la"]["name"]))
+
+    def test_snapshot_is_used_while_file_unchanged(self):
+        self.compiled_dao.load_data(compiled=True)
+        self.compiled_dao.try_load_file = None
+        self.compiled_dao.load_data(suppress_access_errors=True, compiled=True)
+        self.assertIsInstance(self.compiled_dao.config_data, UnsafeDict)
+        self.assertEqual("Lineare Algebra 1", self.compiled_dao.config_data["la"]["name"])
+
+    def test_modified_file_is_parsed_again(self):
+        self.compiled_dao.load_data(compiled=True)
+        with open(self.config_path, "a", encoding="utf-8") as file:
+            file.write("new:\n  name: New course\n")
+        self.compiled_dao.load_data(compiled=True)
+        self.assertEqual("New course", self.compiled_dao.config_data["new"]["name"])
+
+    def test_dump_config_removes_snapshot(self):
+        self.compiled_dao.load_data(compiled=True)
+        self.assertEqual(2, len(os.listdir(self.cache_dir)))
+        self.compiled_dao.load_config()
+        self.compiled_dao.dump_config()
+        self.assertEqual(["mock_user.yml.marshal"], os.listdir(self.cache_dir))
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import threading
+import time
+import unittest.mock as mock
+
+from kit_dl.misc.downloads import DownloadWatcher
+from tests.base import BaseUnitTest
+
+
+class TestDownloads(BaseUnitTest):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "Blatt01.pdf")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def download_later(self, delay=0.1):
+        """Imitates Firefox by writing to a .part file first and moving it into place afterwards."""
+
+        def download():
+            with open(self.path, "wb"):
+                pass
+            with open(self.path + ".part", "wb") as file:
+                file.write(b"%PDF-1.4")
+            time.sleep(delay)
+            os.replace(self.path + ".part", self.path)
+
+        thread = threading.Thread(target=download)
+        thread.start()
+        return thread
+
+    def test_wait_returns_after_download_finished(self):
+        with DownloadWatcher(self.temp_dir.name, "Blatt01.pdf") as watcher:
+            thread = self.download_later()
+            watcher.wait(5)
+        thread.join()
+        self.assertFalse(os.path.exists(self.path + ".part"))
+        self.assertEqual(8, os.path.getsize(self.path))
+
+    @mock.patch("sys.platform", "win32")
+    def test_wait_returns_after_download_finished_polling(self):
+        with DownloadWatcher(self.temp_dir.name, "Blatt01.pdf") as watcher:
+            self.assertIsNone(watcher.fd)
+            thread = self.download_later()
+            watcher.wait(5)
+        thread.join()
+        self.assertEqual(8, os.path.getsize(self.path))
+
+    def test_partial_download_is_not_complete(self):
+        watcher = DownloadWatcher(self.temp_dir.name, "Blatt01.pdf")
+        with open(self.path, "wb"), open(self.path + ".part", "wb") as file:
+            file.write(b"%PDF")
+        self.assertFalse(watcher.is_written())
+
+    def test_existing_file_should_time_out(self):
+        with open(self.path, "wb") as file:
+            file.write(b"%PDF-1.4")
+        with DownloadWatcher(self.temp_dir.name, "Blatt01.pdf") as watcher:
+            with self.assertRaises(TimeoutError):
+                watcher.wait(0.2)
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from kit_dl.client import HttpScraper
+from kit_dl.core import NotFoundException
+from kit_dl.external import ExternalFetcher
+from kit_dl.misc.logger import SilentProgressLogger
+from tests.base import BaseUnitTest, MockSession
+
+LINK = "http://www.math.kit.edu/iana2/edu/hm1info2018w/de"
+PAGE = (
+    '<html><body><a href="files/blatt1.pdf">Blatt 1</a><a href="files/blatt2.pdf">Blatt 2</a>'
+    '<a href="files/loesung1.pdf">Lösung 1</a><a href="files/blatt4.pdf">Blatt 4</a></body></html>'
+)
+
+
+class CountingSession(MockSession):
+    """Records the maximum number of requests in flight at the same time."""
+
+    def __init__(self, pages):
+        super().__init__(pages)
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def get(self, url, **kwargs):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.02)
+        with self.lock:
+            self.running -= 1
+        return super().get(url, **kwargs)
+
+
+class TestExternal(BaseUnitTest):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root_path = self.dao.user_data["destination"]["root_path"]
+        self.dao.user_data["destination"]["root_path"] = self.temp_dir.name
+        os.makedirs(os.path.join(self.temp_dir.name, "HM"))
+        self.course = dict(self.dao.config_data["hm"], path="HM")
+        pages = {LINK: PAGE}
+        for num in (1, 2, 4):
+            pages["http://www.math.kit.edu/iana2/edu/hm1info2018w/files/blatt{}.pdf".format(num)] = (
+                "%PDF blatt {}".format(num).encode("ascii")
+            )
+        self.session = MockSession(pages)
+        self.fetcher = ExternalFetcher(self.session)
+        self.scraper = HttpScraper(self.session, self.dao, False)
+        self.scraper.external_fetcher = self.fetcher
+
+    def tearDown(self):
+        self.dao.user_data["destination"]["root_path"] = self.root_path
+        self.temp_dir.cleanup()
+
+    def page_requests(self):
+        return [url for _, url, _ in self.session.requests if url == LINK]
+
+    def read(self, name):
+        with open(os.path.join(self.temp_dir.name, "HM", name), "rb") as file:
+            return file.read()
+
+    def test_index_contains_matching_links_only(self):
+        index = self.fetcher.fetch_index(self.scraper, self.course)
+        self.assertEqual({1, 2, 4}, set(index))
+        self.assertEqual(
+            ("Blatt 2", "http://www.math.kit.edu/iana2/edu/hm1info2018w/files/blatt2.pdf"), index[2]
+        )
+
+    @mock.patch("builtins.print")
+    def test_update_fetches_page_once(self, mock_print):
+        self.scraper.update_directory(self.course, "hm")
+        self.assertEqual(1, len(self.page_requests()))
+        self.assertEqual(b"%PDF blatt 4", self.read("Blatt04.pdf"))
+        self.assertEqual(
+            ["Blatt01.pdf", "Blatt02.pdf", "Blatt04.pdf"],
+            sorted(os.listdir(os.path.join(self.temp_dir.name, "HM"))),
+        )
+        mock_print.assert_any_call("\rUpdating HM: 1, 2, 4, done.", flush=False, end="\n")
+
+    @mock.patch("builtins.print")
+    def test_get_stops_at_missing_assignment(self, mock_print):
+        self.scraper.get(self.course, "hm", range(1, 4), True)
+        self.assertEqual(
+            ["Blatt01.pdf", "Blatt02.pdf"], sorted(os.listdir(os.path.join(self.temp_dir.name, "HM")))
+        )
+        self.assertEqual(1, len(self.page_requests()))
+        mock_print.assert_any_call("\rUpdating HM: 1, 2, done.", flush=False, end="\n")
+
+    def test_missing_assignment_raises_after_previous_ones(self):
+        logger = mock.MagicMock()
+        with self.assertRaises(NotFoundException):
+            self.fetcher.download(self.scraper, self.course, [1, 3, 4], False, None, logger)
+        self.assertEqual([mock.call(1), mock.call(3)], logger.update.call_args_list)
+        self.assertTrue(os.path.isfile(os.path.join(self.temp_dir.name, "blatt1.pdf")))
+
+    def test_listed_links_are_used_for_download(self):
+        names = self.scraper.list_links(self.course)
+        self.assertEqual(["Blatt 1", "Blatt 2", "Blatt 4"], names)
+        with mock.patch("builtins.print"), SilentProgressLogger("HM") as logger:
+            self.fetcher.download(self.scraper, self.course, [4], True, "Blatt$$", logger)
+        self.assertEqual(1, len(self.page_requests()))
+        self.assertEqual(b"%PDF blatt 4", self.read("Blatt04.pdf"))
+
+    def test_requests_per_host_are_limited(self):
+        session = CountingSession(self.session.pages)
+        fetcher = ExternalFetcher(session, workers=4, max_per_host=2)
+        fetcher.download(self.scraper, self.course, [1, 2, 4], False, None, mock.MagicMock())
+        self.assertEqual(2, session.max_running)
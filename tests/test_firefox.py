@@ -0,0 +1,84 @@
+import os
+import tempfile
+
+from kit_dl import cli
+from kit_dl.misc.firefox import LEAN_PREFERENCES, ProfileCache
+from tests.base import BaseUnitTest
+
+
+class TestFirefox(BaseUnitTest):
+    def test_full_profile_keeps_resources(self):
+        preferences = cli.create_profile("downloads").default_preferences
+        self.assertEqual("downloads", preferences["browser.download.dir"])
+        self.assertNotIn("permissions.default.image", preferences)
+
+    def test_lean_profile_blocks_resources(self):
+        preferences = cli.create_profile("downloads", lean=True).default_preferences
+        self.assertEqual("downloads", preferences["browser.download.dir"])
+        for name, value in LEAN_PREFERENCES.items():
+            self.assertEqual(value, preferences[name])
+
+    def test_lean_profile_keeps_download_preferences(self):
+        for name in (
+            "browser.download.folderList",
+            "pdfjs.disabled",
+            "browser.helperApps.neverAsk.saveToDisk",
+        ):
+            self.assertNotIn(name, LEAN_PREFERENCES)
+
+
+class TestProfileCache(BaseUnitTest):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.profiles = ProfileCache(self.temp_dir.name, {"pdfjs.disabled": True, "browser.download.dir": "a"})
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read(self, *path):
+        with open(os.path.join(*path), encoding="utf-8") as file:
+            return file.read()
+
+    def test_copy_contains_preferences(self):
+        profile_dir = self.profiles.checkout()
+        self.assertEqual(
+            'user_pref("browser.download.dir", "a");\nuser_pref("pdfjs.disabled", true);\n',
+            self.read(profile_dir, "user.js"),
+        )
+        self.assertNotEqual(self.profiles.path, profile_dir)
+
+    def test_copy_overrides_preferences(self):
+        profile_dir = self.profiles.checkout({"browser.download.dir": "b"})
+        self.assertIn('user_pref("browser.download.dir", "b");', self.read(profile_dir, "user.js"))
+        self.assertIn('user_pref("browser.download.dir", "a");', self.read(self.profiles.path, "user.js"))
+
+    def test_changed_preferences_replace_profile(self):
+        self.profiles.checkout()
+        profiles = ProfileCache(self.temp_dir.name, {"pdfjs.disabled": True, "browser.download.dir": "c"})
+        profiles.checkout()
+        self.assertNotEqual(self.profiles.path, profiles.path)
+        self.assertFalse(os.path.exists(self.profiles.path))
+        self.assertTrue(os.path.isdir(profiles.path))
+
+    def test_initialized_copy_replaces_profile(self):
+        profile_dir = self.profiles.checkout()
+        for name in ("prefs.js", "times.json", "cookies.sqlite", "lock"):
+            open(os.path.join(profile_dir, name), "w").close()
+        self.profiles.checkin(profile_dir)
+        self.assertTrue(self.profiles.is_initialized())
+        self.assertEqual(["prefs.js", "times.json", "user.js"], sorted(os.listdir(self.profiles.path)))
+        self.assertEqual([os.path.basename(self.profiles.path)], os.listdir(self.temp_dir.name))
+
+    def test_failed_copy_is_not_kept(self):
+        profile_dir = self.profiles.checkout()
+        open(os.path.join(profile_dir, "prefs.js"), "w").close()
+        self.profiles.checkin(profile_dir, keep=False)
+        self.assertFalse(self.profiles.is_initialized())
+        self.assertFalse(os.path.exists(profile_dir))
+
+    def test_preferences_of_cached_and_selenium_profile_match(self):
+        preferences = cli.get_preferences("downloads", lean=True)
+        self.assertEqual(
+            preferences,
+            {name: cli.create_profile("downloads", True).default_preferences[name] for name in preferences},
+        )
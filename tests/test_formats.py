@@ -0,0 +1,49 @@
+from kit_dl.misc.formats import compile_format, detect_format
+from tests.base import BaseUnitTest
+
+
+class TestFormats(BaseUnitTest):
+    def test_format_pads_numbers(self):
+        format = compile_format("Blatt$$")
+        self.assertEqual("Blatt01", format(1))
+        self.assertEqual("Blatt10", format(10))
+        self.assertEqual("Blatt100", format(100))
+
+    def test_format_with_optional_path(self):
+        format = compile_format("Übungsblatt $/assignment$$")
+        self.assertEqual("Übungsblatt 3/assignment03", format(3))
+        self.assertEqual(3, format.parse("Übungsblatt 3/assignment03"))
+        self.assertIsNone(format.parse("Übungsblatt 3/assignment04"))
+
+    def test_format_with_braces(self):
+        self.assertEqual("{Blatt}2", compile_format("{Blatt}$")(2))
+
+    def test_parse_only_matches_formatted_names(self):
+        format = compile_format("Blatt$$")
+        self.assertEqual(10, format.parse("Blatt10"))
+        self.assertEqual(100, format.parse("Blatt100"))
+        self.assertIsNone(format.parse("Blatt1"))
+        self.assertIsNone(format.parse("Blatt010"))
+        self.assertIsNone(format.parse("Blatt10\n"))
+        self.assertEqual(3, compile_format("$$-aufgaben").parse("03-aufgaben"))
+
+    def test_format_without_number(self):
+        format = compile_format("Skript")
+        self.assertIsNone(format.parse("Skript"))
+        self.assertEqual(set(), format.scan(["Skript"]))
+
+    def test_scan_listing(self):
+        names = ["Blatt01", "Blatt10", "Blatt9", "Lösung01", "xBlatt02", "Blatt03x", "Blatt04\nBlatt05"]
+        self.assertEqual({1, 10}, compile_format("Blatt$$").scan(names))
+
+    def test_formats_are_cached(self):
+        self.assertIs(compile_format("Blatt$$"), compile_format("Blatt$$"))
+
+    def test_detect_format_replaces_last_number(self):
+        self.assertEqual("AB-$$", detect_format(["some_fil", "AB-01"]))
+        self.assertEqual("$$-aufgaben", detect_format(["03-aufgaben"]))
+        self.assertIsNone(detect_format(["some_fil", "not_an_assignment"]))
+
+    def test_detect_format_prefers_format_matching_most_names(self):
+        self.assertEqual("Blatt$", detect_format(["Blatt10", "Blatt1", "Blatt2"]))
+        self.assertEqual("Blatt$$", detect_format(["notes1", "Blatt01", "Blatt02"]))
@@ -2,7 +2,7 @@ import unittest.mock as mock
 
 from selenium.common.exceptions import TimeoutException
 
-from kit_dl.misc.logger import ProgressLogger, SilentProgressLogger
+from kit_dl.misc.logger import ConcurrentProgressLogger, ProgressLogger, SilentProgressLogger
 from tests.base import BaseUnitTest
 
 
@@ -26,6 +26,19 @@ class TestLogger(BaseUnitTest):
             logger.update(1)
         self.assert_print_called_done("\rUpdating LA: 1, done.", mock_print)
 
+    @mock.patch("builtins.print")
+    def test_silent_logger_multiple_updates_done(self, mock_print):
+        with SilentProgressLogger("LA") as logger:
+            logger.update(1)
+            logger.update(3)
+        self.assert_print_called_done("\rUpdating LA: 1, 3, done.", mock_print)
+
+    @mock.patch("builtins.print")
+    def test_silent_logger_without_updates_should_print_up_to_date(self, mock_print):
+        with SilentProgressLogger("LA"):
+            pass
+        self.assert_print_called_done("\rUpdating LA: already up to date.", mock_print)
+
     @mock.patch("builtins.print")
     def test_silent_logger_exception_during_second_update_should_be_handled(self, mock_print):
         try:
@@ -45,6 +58,32 @@ class TestLogger(BaseUnitTest):
         except TimeoutException:
             self.assert_print_called_done("\rUpdating LA: already up to date.", mock_print)
 
+    @mock.patch("builtins.print")
+    def test_silent_logger_error_should_not_print_up_to_date(self, mock_print):
+        with self.assertRaises(IOError):
+            with SilentProgressLogger("LA") as logger:
+                logger.update(1)
+                raise IOError("connection refused")
+        self.assertNotIn("already up to date", str(mock_print.call_args_list))
+        self.assertNotIn("done", str(mock_print.call_args_list))
+
+    @mock.patch("builtins.print")
+    def test_silent_logger_error_should_only_print_downloaded_assignments(self, mock_print):
+        with self.assertRaises(IOError):
+            with SilentProgressLogger("LA") as logger:
+                logger.update(1)
+                logger.update(2)
+                raise IOError("connection refused")
+        self.assert_print_called_done("\rUpdating LA: 1.", mock_print)
+
+    @mock.patch("builtins.print")
+    def test_concurrent_logger_error_without_downloads_prints_nothing(self, mock_print):
+        with self.assertRaises(IOError):
+            with ConcurrentProgressLogger("LA") as logger:
+                logger.update(1)
+                raise IOError("connection refused")
+        self.assert_print_not_called(mock_print)
+
     @mock.patch("builtins.print")
     def test_progress_logger_single_update(self, mock_print):
         with ProgressLogger("LA", "Blatt$$") as logger:
@@ -65,3 +104,10 @@ class TestLogger(BaseUnitTest):
             logger.update(1)
             logger.update(2)
         self.assert_print_called_done(", done.", mock_print)
+
+    @mock.patch("builtins.print")
+    def test_concurrent_logger_only_prints_final_state(self, mock_print):
+        with ConcurrentProgressLogger("LA") as logger:
+            logger.update(1)
+            self.assert_print_not_called(mock_print)
+        mock_print.assert_called_once_with("\rUpdating LA: 1, done.", flush=False, end="\n")
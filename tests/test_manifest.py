@@ -0,0 +1,112 @@
+import os
+import tempfile
+
+from kit_dl.core import BaseScraper
+from kit_dl.manifest import Manifest
+from tests.base import BaseUnitTest
+
+
+class TestManifest(BaseUnitTest):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.course_dir = os.path.join(self.temp_dir.name, "course")
+        os.makedirs(self.course_dir)
+        self.manifest = Manifest(os.path.join(self.temp_dir.name, "app", "manifest.sqlite"))
+        self.scans = 0
+
+    def tearDown(self):
+        self.manifest.close()
+        self.temp_dir.cleanup()
+
+    def create_file(self, name, content=b"pdf"):
+        path = os.path.join(self.course_dir, name)
+        with open(path, "wb") as file:
+            file.write(content)
+        return path
+
+    def scan(self):
+        self.scans += 1
+        files = {}
+        for name in os.listdir(self.course_dir):
+            files[int(name[5:7])] = name
+        return "Blatt$$", files
+
+    def local_assignments(self):
+        return self.manifest.local_assignments("la", self.course_dir, self.scan)
+
+    def test_unchanged_directory_should_not_be_scanned_again(self):
+        self.create_file("Blatt01.pdf")
+        self.assertEqual(("Blatt$$", {1}), self.local_assignments())
+        self.assertEqual(("Blatt$$", {1}), self.local_assignments())
+        self.assertEqual(1, self.scans)
+
+    def test_modified_directory_should_be_scanned_again(self):
+        self.create_file("Blatt01.pdf")
+        self.local_assignments()
+        self.create_file("Blatt02.pdf")
+        os.utime(self.course_dir, (0, 0))
+        self.assertEqual(("Blatt$$", {1, 2}), self.local_assignments())
+        self.assertEqual(2, self.scans)
+
+    def test_deleted_assignments_should_be_removed(self):
+        self.create_file("Blatt01.pdf")
+        path = self.create_file("Blatt02.pdf")
+        self.local_assignments()
+        os.remove(path)
+        os.utime(self.course_dir, (0, 0))
+        self.assertEqual(("Blatt$$", {1}), self.local_assignments())
+        self.assertEqual([1], [num for num, *_ in self.manifest.assignments("la")])
+
+    def test_recorded_download_should_not_require_a_scan(self):
+        self.create_file("Blatt01.pdf")
+        self.local_assignments()
+        path = self.create_file("Blatt02.pdf", b"assignment")
+        self.manifest.record("la", 2, "https://ilias.studium.kit.edu/blatt02.pdf", path)
+        self.assertEqual(("Blatt$$", {1, 2}), self.local_assignments())
+        self.assertEqual(1, self.scans)
+        num, url, recorded_path, size, sha256 = self.manifest.assignments("la")[1]
+        self.assertEqual(
+            (2, "https://ilias.studium.kit.edu/blatt02.pdf", path, 10), (num, url, recorded_path, size)
+        )
+        self.assertEqual(64, len(sha256))
+
+    def test_validators_should_be_stored_with_download(self):
+        course = self.dao.config_data["la"]
+        scraper = BaseScraper(self.dao, False, manifest=self.manifest)
+        scraper.get_course_dir = lambda course: self.course_dir
+        scraper.download_dir = self.temp_dir.name
+        with open(os.path.join(self.temp_dir.name, "Blatt01.pdf"), "wb") as file:
+            file.write(b"assignment")
+        scraper.source_url = "https://ilias.studium.kit.edu/blatt01.pdf"
+        scraper.source_validators = ('"v1"', "Mon, 15 Oct 2018 08:00:00 GMT")
+        scraper.store_download("Blatt01", course, 1, True, "Blatt$$")
+        [(num, url, _, _, etag, last_modified)] = self.manifest.downloaded_assignments(course["name"])
+        self.assertEqual((1, scraper.source_url), (num, url))
+        self.assertEqual(scraper.source_validators, (etag, last_modified))
+
+    def test_scraper_should_use_manifest(self):
+        course = self.dao.config_data["la"]
+        scraper = BaseScraper(self.dao, False, manifest=self.manifest)
+        scraper.get_course_dir = lambda course: self.course_dir
+        self.create_file("Blatt_01.pdf")
+        self.create_file("Blatt_03.pdf")
+        self.create_file("notes.txt")
+        self.assertEqual(("Blatt_$$", {1, 3}), scraper.get_local_assignments(course))
+
+    def test_staged_download_should_not_require_a_scan(self):
+        course = self.dao.config_data["la"]
+        scraper = BaseScraper(self.dao, False, manifest=self.manifest)
+        scraper.get_course_dir = lambda course: self.course_dir
+        scan_course_directory = scraper.scan_course_directory
+        scraper.scan_course_directory = lambda course: (self.scan(), scan_course_directory(course))[1]
+        self.create_file("Blatt01.pdf")
+        scraper.get_local_assignments(course)
+        with scraper.staging(course):
+            with open(os.path.join(scraper.get_download_dir(), "Blatt02.pdf"), "wb") as file:
+                file.write(b"assignment")
+            scraper.store_download("Blatt02", course, 2, True, "Blatt$$")
+        with scraper.staging(course):
+            # An update which does not find any new assignment.
+            pass
+        self.assertEqual(("Blatt$$", {1, 2}), scraper.get_local_assignments(course))
+        self.assertEqual(1, self.scans)
@@ -0,0 +1,77 @@
+import tempfile
+import threading
+import time
+
+from kit_dl.core import BaseScraper
+from kit_dl.parallel import ConcurrentUpdater
+from tests.base import BaseUnitTest
+
+
+class RecordingScraper(BaseScraper):
+    """Records which courses have been updated and how many of them were updated at the same time."""
+
+    def __init__(self, dao):
+        super().__init__(dao, False)
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.updated = []
+        self.folders_by_course = {}
+        self.logins = 0
+
+    def on_ilias_page(self):
+        return self.logins > 0
+
+    def login(self):
+        self.logins += 1
+        return True
+
+    def update_directory(self, course, course_name):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        self.folders[(course_name, None)] = course
+        time.sleep(0.05)
+        with self.lock:
+            self.running -= 1
+            self.updated.append((course_name, self.concurrent))
+            self.folders_by_course[course_name] = dict(self.folders)
+
+
+class TestParallel(BaseUnitTest):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dao.user_data["destination"]["root_path"] = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def ilias_courses(self, count):
+        return [("course{}".format(i), {"name": "Course {}".format(i)}) for i in range(count)]
+
+    def test_all_courses_updated_concurrently(self):
+        scraper = RecordingScraper(self.dao)
+        courses = self.ilias_courses(3) + [("hm", self.dao.config_data["hm"])]
+        ConcurrentUpdater(scraper, 4).update(courses)
+        self.assertEqual(sorted(name for name, _ in courses), sorted(name for name, _ in scraper.updated))
+        self.assertTrue(all(concurrent for _, concurrent in scraper.updated))
+        self.assertEqual(1, scraper.logins)
+
+    def test_courses_on_same_host_should_be_limited(self):
+        scraper = RecordingScraper(self.dao)
+        ConcurrentUpdater(scraper, 8, max_per_host=2).update(self.ilias_courses(6))
+        self.assertEqual(6, len(scraper.updated))
+        self.assertLessEqual(scraper.max_running, 2)
+
+    def test_external_courses_should_not_log_in(self):
+        scraper = RecordingScraper(self.dao)
+        ConcurrentUpdater(scraper, 2).update([("hm", self.dao.config_data["hm"])])
+        self.assertEqual(0, scraper.logins)
+
+    def test_courses_should_not_share_folder_pages(self):
+        scraper = RecordingScraper(self.dao)
+        courses = self.ilias_courses(3)
+        ConcurrentUpdater(scraper, 3).update(courses)
+        for name, course in courses:
+            self.assertEqual({(name, None): course}, scraper.folders_by_course[name])
+        self.assertEqual({}, scraper.folders)
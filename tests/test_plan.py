@@ -0,0 +1,65 @@
+import os
+import tempfile
+
+from kit_dl.core import BaseScraper
+from kit_dl.plan import EXTERNAL, ILIAS, NOTHING, Planner
+from tests.base import BaseUnitTest
+
+
+class TestPlan(BaseUnitTest):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root_path = self.dao.user_data["destination"]["root_path"]
+        self.dao.user_data["destination"]["root_path"] = self.temp_dir.name
+        for path in ("LA", "HM"):
+            os.makedirs(os.path.join(self.temp_dir.name, path))
+        self.la = dict(self.dao.config_data["la"], path="LA")
+        self.hm = dict(self.dao.config_data["hm"], path="HM")
+        self.planner = Planner(BaseScraper(self.dao, False))
+
+    def tearDown(self):
+        self.dao.user_data["destination"]["root_path"] = self.root_path
+        self.temp_dir.cleanup()
+
+    def add_file(self, path, name):
+        open(os.path.join(self.temp_dir.name, path, name), "w").close()
+
+    def test_courses_are_grouped_by_backend(self):
+        plan = self.planner.plan_get([("la", self.la), ("hm", self.hm)], range(1, 3), True)
+        self.assertEqual([ILIAS, EXTERNAL], [course.backend for course in plan.courses])
+        self.assertEqual({ILIAS, EXTERNAL}, plan.backends)
+        self.assertEqual({"la": [1, 2], "hm": [1, 2]}, plan.assignments())
+
+    def test_present_assignments_are_skipped(self):
+        self.add_file("LA", "Blatt01.pdf")
+        self.add_file("HM", "Blatt01.pdf")
+        self.add_file("HM", "Blatt02.pdf")
+        plan = self.planner.plan_get([("la", self.la), ("hm", self.hm)], ["1", "2"], True)
+        self.assertEqual({"la": [2]}, plan.assignments())
+        self.assertEqual({ILIAS}, plan.backends)
+        self.assertEqual(["HM: nothing to do, already downloaded."], [c.describe() for c in plan.skipped()])
+
+    def test_forced_or_kept_assignments_are_not_skipped(self):
+        self.add_file("LA", "Blatt01.pdf")
+        self.assertEqual(
+            {"la": [1]}, self.planner.plan_get([("la", self.la)], [1], True, force=True).assignments()
+        )
+        self.assertEqual({"la": [1]}, self.planner.plan_get([("la", self.la)], [1], False).assignments())
+
+    def test_courses_without_directory_are_skipped(self):
+        gbi = dict(self.dao.config_data["gbi"], path=None)
+        prg = dict(self.dao.config_data["prg"], path="PRG")
+        plan = self.planner.plan_update([("gbi", gbi), ("prg", prg), ("hm", self.hm)])
+        self.assertEqual([NOTHING, NOTHING, EXTERNAL], [course.backend for course in plan.courses])
+        self.assertEqual("GBI: nothing to do, no directory has been set up.", plan.courses[0].describe())
+        self.assertFalse(plan.needs_ilias())
+        self.assertEqual([("hm", self.hm)], plan.active())
+
+    def test_describe_plan(self):
+        plan = self.planner.plan_get([("la", self.la), ("hm", self.hm)], [3], True)
+        self.assertEqual(
+            "LA: assignments 3 from ilias\n"
+            "HM: assignments 3 from http://www.math.kit.edu/iana2/edu/hm1info2018w/de\n"
+            "Backends: external, ilias",
+            plan.describe(),
+        )
@@ -0,0 +1,122 @@
+import os
+import tempfile
+import unittest.mock as mock
+
+from kit_dl.core import NotFoundException
+from kit_dl.misc.utils import NullContext
+from kit_dl.pool import DriverPool
+from tests.base import BaseUnitTest
+
+
+class FakeScraper:
+    """Pretends to download all assignments up to the given number and to crash once if requested."""
+
+    def __init__(self, available, crash):
+        self.available = available
+        self.crash = crash
+        self.alive = True
+        self.closed = False
+        self.staged = []
+
+    def download_default(self, course, assignment_num, move, rename_format=None):
+        if self.crash:
+            self.crash.pop()
+            self.alive = False
+            raise ConnectionRefusedError("geckodriver is gone")
+        if assignment_num > self.available:
+            raise NotFoundException()
+        return True
+
+    def list_assignments(self, course):
+        return set(range(1, self.available + 1))
+
+    def staging(self, course):
+        self.staged.append(course["path"])
+        return NullContext()
+
+    def is_alive(self):
+        return self.alive
+
+    def close(self):
+        self.closed = True
+
+
+class TestPool(BaseUnitTest):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dao.user_data["destination"]["root_path"] = self.temp_dir.name
+        os.makedirs(os.path.join(self.temp_dir.name, "LA"))
+        self.course = dict(self.dao.config_data["la"], path="LA")
+        self.scrapers = []
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def create_pool(self, size, available=3, crash=None):
+        crash = crash if crash is not None else []
+
+        def create_scraper(download_dir):
+            scraper = FakeScraper(available, crash)
+            self.scrapers.append(scraper)
+            return scraper
+
+        return DriverPool(self.dao, False, create_scraper, size)
+
+    @mock.patch("builtins.print")
+    def test_get_downloads_all_assignments(self, mock_print):
+        pool = self.create_pool(3)
+        pool.get([("la", self.course)], range(1, 4), True)
+        self.assertEqual([1, 2, 3], sorted(pool.reports["la"].downloaded))
+        mock_print.assert_any_call("Updating LA: 1, 2, 3, done.")
+        self.assertTrue(all(scraper.closed for scraper in self.scrapers))
+
+    @mock.patch("builtins.print")
+    def test_download_dirs_are_not_left_in_root_path(self, mock_print):
+        download_dirs = []
+
+        def create_scraper(download_dir):
+            download_dirs.append(download_dir)
+            return FakeScraper(3, [])
+
+        DriverPool(self.dao, False, create_scraper, 2).get([("la", self.course)], [1, 2], True)
+        self.assertEqual(["LA"], os.listdir(self.temp_dir.name))
+        self.assertFalse(any(os.path.exists(download_dir) for download_dir in download_dirs))
+
+    @mock.patch("builtins.print")
+    def test_only_moved_assignments_are_staged(self, mock_print):
+        pool = self.create_pool(1)
+        pool.get([("la", self.course)], [1, 2], True)
+        pool.get([("la", self.course)], [3], False)
+        self.assertEqual(["LA", "LA"], self.scrapers[0].staged + self.scrapers[1].staged)
+
+    @mock.patch("builtins.print")
+    def test_update_downloads_missing_assignments(self, mock_print):
+        pool = self.create_pool(2, available=4)
+        for name in ["Blatt01.pdf", "Blatt03.pdf"]:
+            with open(os.path.join(self.temp_dir.name, "LA", name), "w"):
+                pass
+        pool.update([("la", self.course)])
+        self.assertEqual([2, 4], sorted(pool.reports["la"].downloaded))
+
+    @mock.patch("builtins.print")
+    def test_update_already_up_to_date(self, mock_print):
+        pool = self.create_pool(2, available=0)
+        pool.update([("la", self.course)])
+        mock_print.assert_any_call("Updating LA: already up to date.")
+
+    @mock.patch("builtins.print")
+    def test_crashed_worker_should_be_recycled(self, mock_print):
+        pool = self.create_pool(1, crash=[True])
+        pool.get([("la", self.course)], [1, 2], True)
+        self.assertEqual([1, 2], sorted(pool.reports["la"].downloaded))
+        self.assertEqual(2, len(self.scrapers))
+        self.assertFalse(pool.reports["la"].errors)
+
+    @mock.patch("builtins.print")
+    def test_failing_browser_start_should_not_block(self, mock_print):
+        def create_scraper(download_dir):
+            raise OSError("geckodriver not found")
+
+        pool = DriverPool(self.dao, False, create_scraper, 2)
+        pool.get([("la", self.course)], [1], True)
+        self.assertEqual(1, len(pool.reports["la"].errors))
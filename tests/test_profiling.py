@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from kit_dl.misc import profiling
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.profiler = profiling.start()
+
+    def tearDown(self):
+        profiling.stop()
+
+    def spans(self):
+        return {span.name: span for span in self.profiler.spans}
+
+    def test_self_time_excludes_nested_spans(self):
+        with profiling.span("update", "course"):
+            with profiling.span("sleep", "sleep"):
+                time.sleep(0.02)
+        spans = self.spans()
+        self.assertGreaterEqual(spans["update"].duration, 0.02)
+        self.assertLess(spans["update"].self_time, 0.02)
+        self.assertAlmostEqual(spans["update"].duration, sum(self.profiler.phase_times().values()))
+
+    def test_nested_spans_belong_to_course(self):
+        @profiling.timed("move")
+        def move():
+            pass
+
+        with profiling.span("la", "course", course="la"):
+            move()
+        with profiling.span("login", "login"):
+            pass
+        self.assertEqual(
+            {"course": "la"},
+            self.spans()["TestProfiling.test_nested_spans_belong_to_course.<locals>.move"].args,
+        )
+        self.assertEqual({"course", "move"}, set(self.profiler.phase_times("la")))
+        self.assertIn("LA", self.profiler.summary())
+
+    def test_trace_uses_chrome_trace_event_format(self):
+        with profiling.span("download", "download", course="la"):
+            pass
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "trace.json")
+            self.profiler.write_trace(path)
+            with open(path, encoding="utf-8") as file:
+                event = json.load(file)["traceEvents"][0]
+        self.assertEqual(
+            ("download", "download", "X", {"course": "la"}),
+            (event["name"], event["cat"], event["ph"], event["args"]),
+        )
+        self.assertGreaterEqual(event["ts"], 0)
+
+    def test_disabled_profiler_records_nothing(self):
+        profiling.stop()
+        with profiling.span("download", "download"):
+            pass
+        self.assertEqual([], self.profiler.spans)
@@ -0,0 +1,70 @@
+import os
+import tempfile
+
+from kit_dl.client import HttpScraper
+from kit_dl.core import NotFoundException
+from kit_dl.manifest import Manifest
+from kit_dl.refresh import Refresher
+from tests.base import BaseUnitTest, MockResponse, MockSession
+
+URL = "https://ilias.studium.kit.edu/goto.php?target=file_1_download"
+
+
+class TestRefresh(BaseUnitTest):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.course = self.dao.config_data["la"]
+        self.path = os.path.join(self.temp_dir.name, "Blatt01.pdf")
+        with open(self.path, "wb") as file:
+            file.write(b"version 1")
+        self.manifest = Manifest(os.path.join(self.temp_dir.name, "manifest.sqlite"))
+        self.manifest.record(self.course["name"], 1, URL, self.path)
+
+    def tearDown(self):
+        self.manifest.close()
+        self.temp_dir.cleanup()
+
+    def refresh(self, response):
+        session = MockSession({URL: response})
+        refresher = Refresher(HttpScraper(session, self.dao, False), self.manifest)
+        return (
+            refresher.refresh_assignment(
+                self.course, *self.manifest.downloaded_assignments(self.course["name"])[0]
+            ),
+            session,
+        )
+
+    def read(self, path):
+        with open(path, "rb") as file:
+            return file.read()
+
+    def test_not_modified_assignment_should_be_kept(self):
+        changed, _ = self.refresh(MockResponse(URL, status_code=304))
+        self.assertFalse(changed)
+        self.assertEqual(b"version 1", self.read(self.path))
+
+    def test_unchanged_content_without_validators_should_be_kept(self):
+        changed, _ = self.refresh(MockResponse(URL, content=b"version 1"))
+        self.assertFalse(changed)
+        self.assertEqual(["Blatt01.pdf", "manifest.sqlite"], sorted(os.listdir(self.temp_dir.name)))
+
+    def test_changed_assignment_should_replace_previous_version(self):
+        changed, _ = self.refresh(MockResponse(URL, content=b"version 2", headers={"ETag": '"v2"'}))
+        self.assertTrue(changed)
+        self.assertEqual(b"version 2", self.read(self.path))
+        previous_dir = os.path.join(self.temp_dir.name, "previous")
+        previous_versions = os.listdir(previous_dir)
+        self.assertEqual(1, len(previous_versions))
+        self.assertEqual(b"version 1", self.read(os.path.join(previous_dir, previous_versions[0])))
+
+    def test_stored_validators_should_be_sent(self):
+        self.refresh(MockResponse(URL, content=b"version 1", headers={"ETag": '"v1"', "Last-Modified": "Mon"}))
+        _, session = self.refresh(MockResponse(URL, status_code=304))
+        headers = session.requests[0][2]["headers"]
+        self.assertEqual({"If-None-Match": '"v1"', "If-Modified-Since": "Mon"}, headers)
+
+    def test_login_page_should_not_replace_assignment(self):
+        response = MockResponse(URL, text="<html>Login</html>", headers={"Content-Type": "text/html"})
+        with self.assertRaises(NotFoundException):
+            self.refresh(response)
+        self.assertEqual(b"version 1", self.read(self.path))
@@ -0,0 +1,62 @@
+import re
+import subprocess
+import sys
+import unittest
+
+import click
+
+from kit_dl import cli
+from tests.base import BaseUnitTest
+
+# Modules which must only be imported by the commands using them.
+HEAVY_MODULES = ["selenium", "requests", "tkinter", "ruamel.yaml", "colorama", "kit_dl.core", "sqlite3"]
+# Maximum time to import kit_dl.cli in seconds, less than a third of loading all dependencies.
+IMPORT_BUDGET = 0.15
+
+
+def run_python(code, *options):
+    return subprocess.run(
+        [sys.executable] + list(options) + ["-c", code],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+
+
+class TestStartup(BaseUnitTest):
+    def test_help_does_not_import_heavy_modules(self):
+        result = run_python(
+            "import sys\n"
+            "from kit_dl import cli\n"
+            "try:\n"
+            "    cli.cli(['--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print([name for name in {} if name in sys.modules])".format(HEAVY_MODULES)
+        )
+        self.assertEqual("[]", result.stdout.strip().splitlines()[-1])
+
+    def test_planner_does_not_import_webdriver(self):
+        result = run_python(
+            "import sys\n" "import kit_dl.core, kit_dl.plan\n" "print('selenium.webdriver' in sys.modules)"
+        )
+        self.assertEqual("False", result.stdout.strip().splitlines()[-1])
+
+    @unittest.skipIf(sys.version_info < (3, 7), "-X importtime requires python 3.7")
+    def test_import_time_within_budget(self):
+        result = run_python("import kit_dl.cli", "-X", "importtime")
+        cumulative = re.search(r"\|\s*(\d+) \|\s*kit_dl\.cli$", result.stderr, re.MULTILINE)
+        self.assertLess(int(cumulative.group(1)) / 1e6, IMPORT_BUDGET)
+
+    def test_course_names_are_validated_against_config(self):
+        self.dao.load_data()
+        original, cli.dao = cli.dao, self.dao
+        try:
+            self.assertEqual("la", cli.CourseName().convert("la", None, None))
+            with self.assertRaises(click.BadParameter):
+                cli.CourseName().convert("xyz", None, None)
+            completions = cli.CourseName().shell_complete(None, None, "g")
+            self.assertEqual(["gbi"], [item.value for item in completions])
+        finally:
+            cli.dao = original
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+
+import requests
+
+from kit_dl.core import NotFoundException
+from kit_dl.misc.streaming import ResumableDownload
+from tests.base import MockResponse, MockSession
+
+URL = "https://ilias.studium.kit.edu/goto.php?target=file_1_download"
+CONTENT = b"0123456789" * 10
+
+
+class InterruptedResponse(MockResponse):
+    """Breaks the connection after the given number of bytes."""
+
+    def __init__(self, url, content, interrupt_after, **kwargs):
+        super().__init__(url, content=content, **kwargs)
+        self.interrupt_after = interrupt_after
+
+    def iter_content(self, chunk_size=1):
+        yield self.content[: self.interrupt_after]
+        raise requests.ConnectionError("Connection reset")
+
+
+class RangeSession(MockSession):
+    """Serves CONTENT, supports range requests and interrupts the first response."""
+
+    def __init__(self, interrupt_after=None, headers=None):
+        super().__init__({})
+        self.interrupt_after = interrupt_after
+        self.headers = headers if headers is not None else {"ETag": '"v1"'}
+
+    def get(self, url, **kwargs):
+        self.requests.append(("get", url, kwargs))
+        headers = kwargs.get("headers", {})
+        if "Range" in headers and headers.get("If-Range") == self.headers.get("ETag"):
+            offset = int(headers["Range"][6:-1])
+            return MockResponse(url, content=CONTENT[offset:], status_code=206, headers=self.headers)
+        if self.interrupt_after is not None:
+            interrupt_after, self.interrupt_after = self.interrupt_after, None
+            return InterruptedResponse(url, CONTENT, interrupt_after, headers=self.headers)
+        return MockResponse(url, content=CONTENT, headers=self.headers)
+
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dst = os.path.join(self.temp_dir.name, "Blatt01.pdf")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_dst(self):
+        with open(self.dst, "rb") as file:
+            return file.read()
+
+    def test_download_should_be_renamed_when_complete(self):
+        ResumableDownload(RangeSession(), URL, self.dst).run()
+        self.assertEqual(CONTENT, self.read_dst())
+        self.assertEqual(["Blatt01.pdf"], os.listdir(self.temp_dir.name))
+
+    def test_validators_of_response_should_be_kept(self):
+        session = RangeSession(headers={"ETag": '"v1"', "Last-Modified": "Mon, 15 Oct 2018 08:00:00 GMT"})
+        download = ResumableDownload(session, URL, self.dst)
+        download.run()
+        self.assertEqual(('"v1"', "Mon, 15 Oct 2018 08:00:00 GMT"), (download.etag, download.last_modified))
+
+    def test_interrupted_download_should_be_resumed(self):
+        session = RangeSession(interrupt_after=30)
+        download = ResumableDownload(session, URL, self.dst)
+        download.run()
+        self.assertEqual(CONTENT, self.read_dst())
+        self.assertEqual({"Range": "bytes=30-", "If-Range": '"v1"'}, session.requests[1][2]["headers"])
+        self.assertEqual(len(CONTENT), download.transferred)
+
+    def test_failed_download_should_be_resumed_by_next_run(self):
+        with self.assertRaises(requests.ConnectionError):
+            ResumableDownload(RangeSession(interrupt_after=40), URL, self.dst, max_retries=0).run()
+        self.assertFalse(os.path.exists(self.dst))
+        session = RangeSession()
+        download = ResumableDownload(session, URL, self.dst)
+        download.run()
+        self.assertEqual(CONTENT, self.read_dst())
+        self.assertEqual(60, download.transferred)
+
+    def test_download_without_validator_should_start_over(self):
+        session = RangeSession(interrupt_after=30, headers={})
+        ResumableDownload(session, URL, self.dst).run()
+        self.assertEqual(CONTENT, self.read_dst())
+        self.assertEqual({}, session.requests[1][2]["headers"])
+
+    def test_missing_file_should_raise_not_found(self):
+        with self.assertRaises(NotFoundException):
+            ResumableDownload(MockSession({}), URL, self.dst).run()
+        self.assertEqual([], os.listdir(self.temp_dir.name))
+
+    def test_login_page_should_not_be_saved(self):
+        session = MockSession({URL: MockResponse(URL, text="<html>", headers={"Content-Type": "text/html"})})
+        with self.assertRaises(NotFoundException):
+            ResumableDownload(session, URL, self.dst).run()
+        self.assertEqual([], os.listdir(self.temp_dir.name))
+
+    def test_unmodified_file_should_not_be_downloaded(self):
+        session = MockSession({URL: MockResponse(URL, status_code=304)})
+        download = ResumableDownload(session, URL, self.dst, etag='"v1"', last_modified="Mon")
+        download.run()
+        self.assertFalse(download.modified)
+        self.assertEqual(
+            {"If-None-Match": '"v1"', "If-Modified-Since": "Mon"}, session.requests[0][2]["headers"]
+        )
+        self.assertEqual([], os.listdir(self.temp_dir.name))
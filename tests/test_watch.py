@@ -0,0 +1,126 @@
+from unittest import mock
+
+from kit_dl.core import NotFoundException
+from kit_dl.watch import listing_hash, Watcher
+from tests.base import BaseUnitTest
+
+MINUTE = 60
+
+
+class MockScraper:
+    def __init__(self, folders):
+        self.folders = folders
+        self.updates = []
+        self.local = {}
+        self.failing = set()
+        self.closed = False
+
+    def list_links(self, course):
+        names = self.folders[course["name"]]
+        if isinstance(names, Exception):
+            raise names
+        return names
+
+    def list_assignments(self, course, names=None):
+        return {int(name[-2:]) for name in names}
+
+    def update_directory(self, course, course_name, available_assignments=None):
+        self.updates.append((course_name, available_assignments))
+        self.local.setdefault(course["name"], set()).update(available_assignments - self.failing)
+
+    def get_local_assignments(self, course):
+        return "Blatt$$", self.local.get(course["name"], set())
+
+    def close(self):
+        self.closed = True
+
+
+class TestWatch(BaseUnitTest):
+    def setUp(self):
+        self.now = 0.0
+        patcher = mock.patch("kit_dl.watch.time.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.folders = {"Lineare Algebra 1": ["Blatt01"], "Programmieren": ["Blatt01", "Blatt02"]}
+        self.scrapers = []
+        self.courses = [(name, self.dao.config_data[name]) for name in ("la", "prg")]
+        self.watcher = Watcher(self.create_scraper, self.courses, 5 * MINUTE, 60 * MINUTE)
+
+    def create_scraper(self):
+        scraper = MockScraper(self.folders)
+        self.scrapers.append(scraper)
+        return scraper
+
+    def updates(self):
+        return [update for scraper in self.scrapers for update in scraper.updates]
+
+    def test_listing_hash_ignores_order(self):
+        self.assertEqual(listing_hash(["Blatt01", "Blatt02"]), listing_hash(["Blatt02", "Blatt01"]))
+        self.assertNotEqual(listing_hash(["Blatt01"]), listing_hash(["Blatt01", "Blatt02"]))
+
+    def test_first_poll_updates_all_courses(self):
+        self.watcher.poll_due()
+        self.assertEqual([("la", {1}), ("prg", {1, 2})], self.updates())
+        self.assertEqual(5 * MINUTE, self.watcher.next_poll())
+
+    def test_unchanged_folder_is_not_updated(self):
+        self.watcher.poll_due()
+        self.now = 5 * MINUTE
+        self.watcher.poll_due()
+        self.assertEqual(2, len(self.updates()))
+
+    def test_changed_folder_is_updated(self):
+        self.watcher.poll_due()
+        self.folders["Lineare Algebra 1"] = ["Blatt01", "Blatt02"]
+        self.now = 5 * MINUTE
+        self.watcher.poll_due()
+        self.assertEqual(("la", {1, 2}), self.updates()[-1])
+        self.assertEqual(3, len(self.updates()))
+
+    def test_failed_download_is_retried(self):
+        self.watcher.poll_due()
+        self.folders["Lineare Algebra 1"] = ["Blatt01", "Blatt02"]
+        self.scrapers[0].failing.add(2)
+        self.now = 5 * MINUTE
+        self.watcher.poll_due()
+        self.scrapers[0].failing.clear()
+        self.now = 10 * MINUTE
+        self.watcher.poll_due()
+        la_updates = [update for update in self.updates() if update[0] == "la"]
+        self.assertEqual([("la", {1}), ("la", {1, 2}), ("la", {1, 2})], la_updates)
+        self.assertEqual({1, 2}, self.scrapers[0].local["Lineare Algebra 1"])
+
+    def test_interval_backs_off_and_resets_on_change(self):
+        state = self.watcher.states["la"]
+        self.watcher.poll_due()
+        for interval in (10, 20, 40, 60, 60):
+            self.now = state.next_poll
+            self.watcher.poll_due()
+            self.assertEqual(interval * MINUTE, state.interval)
+        self.folders["Lineare Algebra 1"] = ["Blatt01", "Blatt02"]
+        self.now = state.next_poll
+        self.watcher.poll_due()
+        self.assertEqual(5 * MINUTE, state.interval)
+
+    def test_only_due_courses_are_polled(self):
+        self.watcher.poll_due()
+        self.now = 5 * MINUTE
+        self.watcher.poll_due()
+        self.folders["Programmieren"] = ["Blatt01", "Blatt02", "Blatt03"]
+        self.folders["Lineare Algebra 1"] = ["Blatt01", "Blatt02"]
+        # la is polled again after 10 minutes, prg has not changed either and is due at the same time.
+        self.now = 10 * MINUTE
+        self.watcher.poll_due()
+        self.assertEqual(2, len(self.updates()))
+        self.now = 15 * MINUTE
+        self.watcher.poll_due()
+        self.assertEqual(4, len(self.updates()))
+
+    def test_scraper_is_replaced_after_failed_poll(self):
+        self.folders["Lineare Algebra 1"] = NotFoundException("Link not found")
+        with mock.patch("builtins.print"):
+            self.watcher.poll_due()
+        self.assertTrue(self.scrapers[0].closed)
+        self.assertEqual(2, len(self.scrapers))
+        self.assertEqual([("prg", {1, 2})], self.updates())
+        self.assertEqual(10 * MINUTE, self.watcher.states["la"].interval)